@@ -11,11 +11,14 @@ Date: 2026-02-01
 
 import os
 import sys
+import glob
 import json
+import hashlib
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Callable
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 import requests
@@ -24,7 +27,17 @@ import time
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from schema import SCHEMA_CONSTRAINTS
-from lib.wikidata_search import search_wikidata_for_work, validate_qid
+from lib.wikidata_search import (
+    search_wikidata_for_works, validate_qids, request_counts,
+    add_offline_index_arguments, configure_offline_index_from_args
+)
+from lib.wikidata_cache import get_cache, add_cache_arguments, configure_from_args
+from lib.rate_limiter import get_limiter
+from lib.partitioned_writer import PartitionedWriter
+from lib.import_journal import ImportJournal, ImportJournalError
+from lib.import_metrics import PhaseMetrics, InstrumentedDriver
+from lib.staging_loader import StagingLoader
+from lib.adaptive_batch import AdaptiveBatchSizer
 
 # Import similarity detection (will use Levenshtein + phonetic)
 try:
@@ -34,6 +47,61 @@ except ImportError:
     THEFUZZ_AVAILABLE = False
     print("⚠️  Warning: thefuzz not available. Similarity detection will be basic.")
 
+# Incremental JSON parsing for --stream mode
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Top-level arrays in a batch file, in import order
+STREAM_SECTIONS = ["figures", "works", "events", "sources", "relationships"]
+NODE_SECTIONS = STREAM_SECTIONS[:-1]
+
+
+def connect(uri: str, user: str, pwd: str):
+    """Open a Neo4j driver, handling Aura's certificate scheme."""
+    # SSL certificate handling for Neo4j Aura
+    if uri.startswith("neo4j+s://"):
+        uri = uri.replace("neo4j+s://", "neo4j+ssc://")
+    return GraphDatabase.driver(uri, auth=(user, pwd))
+
+
+def iter_batch_section(input_path: Path, section: str) -> Iterator[Dict]:
+    """Yield the records of one top-level array without loading the whole file."""
+    with open(input_path, "rb") as f:
+        yield from ijson.items(f, f"{section}.item", use_float=True)
+
+
+def read_batch_metadata(input_path: Path) -> Optional[Dict]:
+    """Read the top-level metadata object of a batch file incrementally."""
+    with open(input_path, "rb") as f:
+        for metadata in ijson.items(f, "metadata", use_float=True):
+            return metadata
+    return None
+
+
+# Properties the importer adds or the database maintains; never part of a content hash
+HASH_EXCLUDED_FIELDS = {
+    "ingestion_batch", "ingestion_source", "created_by",
+    "created_at", "updated_at", "content_hash"
+}
+
+# Node IDs per content-hash lookup query
+HASH_LOOKUP_CHUNK = 5000
+
+
+def content_hash(record: Dict) -> str:
+    """
+    Stable SHA-256 of an input record's content.
+
+    Keys are sorted and importer-added fields are ignored, so the same record
+    hashes identically across runs and batch files.
+    """
+    content = {k: v for k, v in record.items() if k not in HASH_EXCLUDED_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 
 class BatchImportError(Exception):
     """Raised when batch import encounters an error."""
@@ -62,7 +130,16 @@ class BatchImporter:
         pwd: str,
         dry_run: bool = True,
         batch_size: int = 50,
-        agent_name: str = "batch-importer"
+        agent_name: str = "batch-importer",
+        bulk_duplicate_check: bool = True,
+        workers: int = 1,
+        batch_id: Optional[str] = None,
+        journal_path: Optional[Path] = None,
+        skip_unchanged: bool = True,
+        staging: bool = False,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
+        driver=None,
+        qid_cache: Optional[Dict] = None
     ):
         """
         Initialize batch importer.
@@ -74,33 +151,76 @@ class BatchImporter:
             dry_run: If True, preview imports without committing
             batch_size: Number of records per transaction
             agent_name: Name of agent creating the data (for CREATED_BY)
+            bulk_duplicate_check: If True, detect duplicates with one set-based
+                query per phase instead of one query per record
+            workers: Number of concurrent writer partitions (1 = single session)
+            batch_id: Reuse an existing batch_id (e.g. to resume a run)
+            journal_path: SQLite run journal for resumable imports (None disables it)
+            skip_unchanged: If True, skip records whose content_hash matches the
+                existing node instead of rewriting them
+            staging: If True (live runs only), load nodes under :Staging and
+                promote them server-side with finish_staging()
+            batch_sizer: Adaptive per-entity chunk sizes; None uses batch_size
+                for every write
+            driver: Existing Neo4j driver to share (e.g. across files in
+                directory mode); it is not closed by close()
+            qid_cache: Dict shared across importers that memoises Q-ID
+                validation and search results
         """
-        # SSL certificate handling for Neo4j Aura
-        if uri.startswith("neo4j+s://"):
-            uri = uri.replace("neo4j+s://", "neo4j+ssc://")
-
-        self.driver = GraphDatabase.driver(uri, auth=(user, pwd))
+        # Per-phase timing and counters; the driver wrapper counts Bolt round trips
+        self.metrics = PhaseMetrics(probes={"http_calls": lambda: request_counts["http_calls"]})
+        self._owns_driver = driver is None
+        if driver is None:
+            driver = connect(uri, user, pwd)
+        self.driver = InstrumentedDriver(driver, self.metrics)
+        self.qid_cache = qid_cache
         self.dry_run = dry_run
         self.batch_size = batch_size
+        self.batch_sizer = batch_sizer
         self.agent_name = agent_name
+        self.bulk_duplicate_check = bulk_duplicate_check
+        self.skip_unchanged = skip_unchanged
+
+        # Concurrent partitioned writes (--workers); None means single-session writes
+        self.writer: Optional[PartitionedWriter] = None
+        if workers > 1 and not dry_run:
+            self.writer = PartitionedWriter(self.driver, workers, on_error=self._record_error)
+        self._pending_writes: List[Tuple[Optional[str], Any]] = []
 
         # Import tracking
-        self.batch_id = f"batch_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.batch_id = batch_id or f"batch_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.source_name = "batch_import_v1"
 
+        # Staging-label bulk load (--staging); live runs only
+        self.staging: Optional[StagingLoader] = None
+        if staging and not dry_run:
+            self.staging = StagingLoader(self.driver, self.batch_id)
+
+        # Run journal (--resume); kept for live runs only
+        self.journal: Optional[ImportJournal] = None
+        if journal_path and not dry_run:
+            self.journal = ImportJournal(journal_path, self.batch_id)
+
         # Statistics
         self.stats = {
             "figures_created": 0,
             "figures_skipped_duplicate": 0,
+            "figures_unchanged": 0,
             "figures_updated": 0,
             "works_created": 0,
             "works_skipped_duplicate": 0,
+            "works_unchanged": 0,
             "works_updated": 0,
             "events_created": 0,
             "events_skipped_duplicate": 0,
+            "events_unchanged": 0,
             "sources_created": 0,
             "sources_skipped_duplicate": 0,
+            "sources_unchanged": 0,
             "relationships_created": 0,
+            "relationships_unchanged": 0,
+            "staged": 0,
+            "skipped_already_committed": 0,
             "errors": [],
             "warnings": []
         }
@@ -112,9 +232,19 @@ class BatchImporter:
         self.duplicate_sources: List[Dict] = []
         self.invalid_qids: List[Dict] = []
 
+        # Input indices of flagged duplicates, per entity type
+        self.duplicate_indices: Dict[str, set] = {
+            "figure": set(), "work": set(), "event": set(), "source": set()
+        }
+
     def close(self):
         """Close database connection."""
-        self.driver.close()
+        if self.writer:
+            self.writer.close()
+        if self.journal:
+            self.journal.close()
+        if self._owns_driver:
+            self.driver.close()
 
     def setup_schema(self):
         """Apply schema constraints from schema.py"""
@@ -130,6 +260,8 @@ class BatchImporter:
                     except Exception as e:
                         # Constraint may already exist, that's OK
                         pass
+        if self.staging:
+            self.staging.setup_indexes()
         print("✅ Schema constraints verified.")
 
     def validate_json_schema(self, data: Dict) -> Tuple[bool, List[str]]:
@@ -150,14 +282,7 @@ class BatchImporter:
             return False, errors
 
         # Validate metadata section
-        if "metadata" not in data:
-            errors.append("Missing required 'metadata' section")
-        else:
-            metadata = data["metadata"]
-            required_meta_fields = ["source", "curator", "date"]
-            for field in required_meta_fields:
-                if field not in metadata:
-                    errors.append(f"metadata.{field} is required")
+        errors.extend(self._validate_metadata_schema(data.get("metadata")))
 
         # Validate figures array (if present)
         if "figures" in data:
@@ -210,6 +335,18 @@ class BatchImporter:
 
         return len(errors) == 0, errors
 
+    def _validate_metadata_schema(self, metadata: Optional[Dict]) -> List[str]:
+        """Validate the top-level metadata object."""
+        if metadata is None:
+            return ["Missing required 'metadata' section"]
+
+        errors = []
+        required_meta_fields = ["source", "curator", "date"]
+        for field in required_meta_fields:
+            if field not in metadata:
+                errors.append(f"metadata.{field} is required")
+        return errors
+
     def _validate_figure_schema(self, figure: Dict, idx: int) -> List[str]:
         """Validate a single historical figure object."""
         errors = []
@@ -354,7 +491,7 @@ class BatchImporter:
 
         return errors
 
-    def detect_duplicate_figures(self, figures: List[Dict]):
+    def detect_duplicate_figures(self, figures: List[Dict], indices: Optional[List[int]] = None):
         """
         Check for duplicate figures in database using enhanced name similarity.
 
@@ -362,11 +499,37 @@ class BatchImporter:
         - Wikidata Q-ID check (exact match)
         - Canonical ID check (exact match)
         - Enhanced name similarity (70% lexical + 30% phonetic)
+
+        Args:
+            figures: Input figure records
+            indices: Position of each record in the input file (defaults to
+                0..n-1); duplicates are tracked by this index
         """
         print("\n🔍 Checking for duplicate figures...")
 
+        if indices is None:
+            indices = list(range(len(figures)))
+
+        phase = f"duplicates:figures:{indices[0] if indices else 0}"
+        if self._restore_duplicates("figure", phase):
+            return
+        start = len(self.duplicate_figures)
+
+        if self.bulk_duplicate_check:
+            self._detect_duplicate_figures_bulk(figures, indices)
+        else:
+            self._detect_duplicate_figures_per_record(figures, indices)
+        self._journal_duplicates("figure", phase, start)
+
+        if self.duplicate_figures:
+            print(f"⚠️  Found {len(self.duplicate_figures)} potential duplicate figures")
+        else:
+            print("✅ No duplicate figures detected")
+
+    def _detect_duplicate_figures_per_record(self, figures: List[Dict], indices: List[int]):
+        """Run the Q-ID, canonical_id and name checks with one query per record."""
         with self.driver.session() as session:
-            for figure in figures:
+            for idx, figure in zip(indices, figures):
                 name = figure["name"]
                 canonical_id = figure.get("canonical_id")
                 wikidata_id = figure.get("wikidata_id")
@@ -383,7 +546,7 @@ class BatchImporter:
                     result = session.run(query, qid=wikidata_id)
                     record = result.single()
                     if record:
-                        self.duplicate_figures.append({
+                        self._add_duplicate("figure", idx, {
                             "input_figure": figure,
                             "existing_figure": dict(record),
                             "match_type": "exact_qid",
@@ -403,7 +566,7 @@ class BatchImporter:
                     result = session.run(query, canonical_id=canonical_id)
                     record = result.single()
                     if record:
-                        self.duplicate_figures.append({
+                        self._add_duplicate("figure", idx, {
                             "input_figure": figure,
                             "existing_figure": dict(record),
                             "match_type": "exact_canonical_id",
@@ -427,37 +590,170 @@ class BatchImporter:
                 name_part = name.split()[0] if name else ""
                 result = session.run(query, name_part=name_part)
 
-                for record in result:
-                    db_name = record["name"]
-                    similarity = self._calculate_enhanced_similarity(name, db_name)
-
-                    # High confidence threshold: 0.9
-                    if similarity >= 0.9:
-                        # Additional check: birth/death years if available
-                        year_match = self._check_year_match(
-                            figure.get("birth_year"),
-                            figure.get("death_year"),
-                            record["birth_year"],
-                            record["death_year"]
-                        )
+                match = self._match_figure_candidates(
+                    figure, [dict(record) for record in result]
+                )
+                if match:
+                    self._add_duplicate("figure", idx, match)
 
-                        if year_match or (
-                            figure.get("birth_year") is None and
-                            figure.get("death_year") is None
-                        ):
-                            self.duplicate_figures.append({
-                                "input_figure": figure,
-                                "existing_figure": dict(record),
-                                "match_type": "name_similarity",
-                                "confidence": "high" if similarity >= 0.95 else "medium",
-                                "similarity_score": similarity
-                            })
-                            break
+    def _detect_duplicate_figures_bulk(self, figures: List[Dict], indices: List[int]):
+        """
+        Run the duplicate checks for a whole batch of figures in two round-trips.
 
-        if self.duplicate_figures:
-            print(f"⚠️  Found {len(self.duplicate_figures)} potential duplicate figures")
-        else:
-            print("✅ No duplicate figures detected")
+        1. One UNWIND query resolves every Q-ID and canonical_id exact match.
+        2. One bounded query fetches name-similarity candidates for every
+           distinct search token among the unresolved figures; candidates are
+           then scored client-side with the same thresholds as the per-record path.
+        """
+        if not figures:
+            return
+
+        rows = []
+        for idx, figure in enumerate(figures):
+            wikidata_id = figure.get("wikidata_id")
+            rows.append({
+                "idx": idx,
+                "wikidata_id": wikidata_id if wikidata_id and wikidata_id.startswith("Q") else None,
+                "canonical_id": figure.get("canonical_id") or None
+            })
+
+        exact_query = """
+        UNWIND $rows AS row
+        OPTIONAL MATCH (q:HistoricalFigure {wikidata_id: row.wikidata_id})
+        WITH row, head(collect(q {.canonical_id, .name, .wikidata_id})) AS qid_match
+        OPTIONAL MATCH (c:HistoricalFigure {canonical_id: row.canonical_id})
+        WITH row, qid_match,
+             head(collect(c {.canonical_id, .name, .wikidata_id})) AS canonical_match
+        RETURN row.idx AS idx, qid_match, canonical_match
+        """
+
+        candidate_query = """
+        UNWIND $tokens AS token
+        CALL {
+            WITH token
+            MATCH (f:HistoricalFigure)
+            WHERE toLower(f.name) CONTAINS token
+               OR token CONTAINS toLower(f.name)
+            RETURN f
+            LIMIT 20
+        }
+        RETURN token,
+               collect(f {.canonical_id, .name, .wikidata_id, .birth_year, .death_year}) AS candidates
+        """
+
+        with self.driver.session() as session:
+            unresolved = []
+            for record in session.run(exact_query, rows=rows):
+                figure = figures[record["idx"]]
+                idx = indices[record["idx"]]
+                if record["qid_match"]:
+                    self._add_duplicate("figure", idx, {
+                        "input_figure": figure,
+                        "existing_figure": record["qid_match"],
+                        "match_type": "exact_qid",
+                        "confidence": "high"
+                    })
+                elif record["canonical_match"]:
+                    self._add_duplicate("figure", idx, {
+                        "input_figure": figure,
+                        "existing_figure": record["canonical_match"],
+                        "match_type": "exact_canonical_id",
+                        "confidence": "high"
+                    })
+                else:
+                    unresolved.append(record["idx"])
+
+            if not unresolved:
+                return
+
+            tokens_by_pos = {
+                pos: self._search_token(figures[pos]["name"]) for pos in sorted(unresolved)
+            }
+            result = session.run(candidate_query, tokens=sorted(set(tokens_by_pos.values())))
+            candidates_by_token = {record["token"]: record["candidates"] for record in result}
+
+        for pos, token in tokens_by_pos.items():
+            match = self._match_figure_candidates(figures[pos], candidates_by_token.get(token, []))
+            if match:
+                self._add_duplicate("figure", indices[pos], match)
+
+    # Input fields kept on a duplicate decision (full input records are not retained)
+    DUPLICATE_SUMMARY_FIELDS = {
+        "figure": ("name", "canonical_id", "wikidata_id"),
+        "work": ("title", "wikidata_id", "release_year", "media_type"),
+        "event": ("name", "event_id", "wikidata_id"),
+        "source": ("title", "source_id"),
+    }
+
+    def _add_duplicate(self, entity: str, index: int, match: Dict):
+        """
+        Record a duplicate decision for the input record at `index`.
+
+        Only a small summary of the input record is kept, so memory grows with
+        the number of duplicates rather than with their full property maps.
+        """
+        record = match[f"input_{entity}"]
+        match[f"input_{entity}"] = {
+            field: record.get(field) for field in self.DUPLICATE_SUMMARY_FIELDS[entity]
+        }
+        match["input_index"] = index
+        getattr(self, f"duplicate_{entity}s").append(match)
+        self.duplicate_indices[entity].add(index)
+
+    def _restore_duplicates(self, entity: str, phase: str) -> bool:
+        """Reload duplicate decisions for `phase` from the journal; True if found."""
+        if not self.journal:
+            return False
+        payload = self.journal.load_phase(phase)
+        if payload is None:
+            return False
+
+        for match in payload:
+            getattr(self, f"duplicate_{entity}s").append(match)
+            self.duplicate_indices[entity].add(match["input_index"])
+        print(f"⏩ Restored {len(payload)} duplicate {entity} decisions from journal")
+        return True
+
+    def _journal_duplicates(self, entity: str, phase: str, start: int):
+        """Record the duplicate decisions made since position `start`."""
+        if self.journal:
+            self.journal.record_phase(phase, getattr(self, f"duplicate_{entity}s")[start:])
+
+    @staticmethod
+    def _search_token(text: str) -> str:
+        """Lowercased first word of a name or title, used for candidate lookup."""
+        return text.split()[0].lower() if text and text.split() else ""
+
+    def _match_figure_candidates(self, figure: Dict, candidates: List[Dict]) -> Optional[Dict]:
+        """Score name-similarity candidates for a figure and return the first duplicate match."""
+        name = figure["name"]
+
+        for candidate in candidates:
+            similarity = self._calculate_enhanced_similarity(name, candidate["name"])
+
+            # High confidence threshold: 0.9
+            if similarity >= 0.9:
+                # Additional check: birth/death years if available
+                year_match = self._check_year_match(
+                    figure.get("birth_year"),
+                    figure.get("death_year"),
+                    candidate["birth_year"],
+                    candidate["death_year"]
+                )
+
+                if year_match or (
+                    figure.get("birth_year") is None and
+                    figure.get("death_year") is None
+                ):
+                    return {
+                        "input_figure": figure,
+                        "existing_figure": candidate,
+                        "match_type": "name_similarity",
+                        "confidence": "high" if similarity >= 0.95 else "medium",
+                        "similarity_score": similarity
+                    }
+
+        return None
 
     def _calculate_enhanced_similarity(self, name1: str, name2: str) -> float:
         """
@@ -503,18 +799,43 @@ class BatchImporter:
 
         return False
 
-    def detect_duplicate_works(self, works: List[Dict]):
+    def detect_duplicate_works(self, works: List[Dict], indices: Optional[List[int]] = None):
         """
         Check for duplicate media works in database.
 
         Uses:
         - Wikidata Q-ID check (exact match)
         - Title similarity + year matching
+
+        Args:
+            works: Input work records
+            indices: Position of each record in the input file (defaults to 0..n-1)
         """
         print("\n🔍 Checking for duplicate media works...")
 
+        if indices is None:
+            indices = list(range(len(works)))
+
+        phase = f"duplicates:works:{indices[0] if indices else 0}"
+        if self._restore_duplicates("work", phase):
+            return
+        start = len(self.duplicate_works)
+
+        if self.bulk_duplicate_check:
+            self._detect_duplicate_works_bulk(works, indices)
+        else:
+            self._detect_duplicate_works_per_record(works, indices)
+        self._journal_duplicates("work", phase, start)
+
+        if self.duplicate_works:
+            print(f"⚠️  Found {len(self.duplicate_works)} potential duplicate works")
+        else:
+            print("✅ No duplicate works detected")
+
+    def _detect_duplicate_works_per_record(self, works: List[Dict], indices: List[int]):
+        """Run the title/year/type, Q-ID and title checks with one query per record."""
         with self.driver.session() as session:
-            for work in works:
+            for idx, work in zip(indices, works):
                 title = work["title"]
                 wikidata_id = work.get("wikidata_id")
                 release_year = work.get("release_year")
@@ -535,7 +856,7 @@ class BatchImporter:
                     result = session.run(query_compound, title=title, year=release_year, media_type=media_type)
                     record = result.single()
                     if record:
-                        self.duplicate_works.append({
+                        self._add_duplicate("work", idx, {
                             "input_work": work,
                             "existing_work": dict(record),
                             "match_type": "title_year_type_exact",
@@ -556,7 +877,7 @@ class BatchImporter:
                     result = session.run(query, qid=wikidata_id)
                     record = result.single()
                     if record:
-                        self.duplicate_works.append({
+                        self._add_duplicate("work", idx, {
                             "input_work": work,
                             "existing_work": dict(record),
                             "match_type": "exact_qid",
@@ -577,116 +898,276 @@ class BatchImporter:
                 title_part = title.split()[0] if title else ""
                 result = session.run(query, title_part=title_part)
 
-                for record in result:
-                    db_title = record["title"]
-                    similarity = self._calculate_enhanced_similarity(title, db_title)
-
-                    # Title similarity threshold: 0.85
-                    if similarity >= 0.85:
-                        # Check year if available
-                        db_year = record["release_year"]
-                        if release_year and db_year:
-                            year_diff = abs(release_year - db_year)
-                            if year_diff <= 2:  # ±2 years tolerance
-                                self.duplicate_works.append({
-                                    "input_work": work,
-                                    "existing_work": dict(record),
-                                    "match_type": "title_and_year",
-                                    "confidence": "high",
-                                    "similarity_score": similarity
-                                })
-                                break
-                        else:
-                            # No year data, rely on title alone
-                            self.duplicate_works.append({
-                                "input_work": work,
-                                "existing_work": dict(record),
-                                "match_type": "title_similarity",
-                                "confidence": "medium",
-                                "similarity_score": similarity
-                            })
-                            break
+                match = self._match_work_candidates(
+                    work, [dict(record) for record in result]
+                )
+                if match:
+                    self._add_duplicate("work", idx, match)
 
-        if self.duplicate_works:
-            print(f"⚠️  Found {len(self.duplicate_works)} potential duplicate works")
-        else:
-            print("✅ No duplicate works detected")
+    def _detect_duplicate_works_bulk(self, works: List[Dict], indices: List[int]):
+        """
+        Run the duplicate checks for a whole batch of works in two round-trips.
+
+        1. One UNWIND query resolves every title+year+type and Q-ID exact match.
+        2. One bounded query fetches title-similarity candidates for every
+           distinct search token among the unresolved works, scored client-side.
+        """
+        if not works:
+            return
 
-    def validate_wikidata_qids(self, data: Dict):
+        rows = []
+        for idx, work in enumerate(works):
+            wikidata_id = work.get("wikidata_id")
+            has_compound_key = bool(work.get("release_year") and work.get("media_type"))
+            rows.append({
+                "idx": idx,
+                "title": work["title"] if has_compound_key else None,
+                "release_year": work.get("release_year") if has_compound_key else None,
+                "media_type": work.get("media_type") if has_compound_key else None,
+                "wikidata_id": wikidata_id if wikidata_id and wikidata_id.startswith("Q") else None
+            })
+
+        exact_query = """
+        UNWIND $rows AS row
+        OPTIONAL MATCH (t:MediaWork)
+        WHERE row.title IS NOT NULL
+          AND t.release_year = row.release_year
+          AND t.media_type = row.media_type
+          AND toLower(trim(t.title)) = toLower(trim(row.title))
+        WITH row, head(collect(t {.media_id, .title, .wikidata_id, .release_year})) AS title_match
+        OPTIONAL MATCH (q:MediaWork {wikidata_id: row.wikidata_id})
+        WITH row, title_match,
+             head(collect(q {.media_id, .title, .wikidata_id, .release_year})) AS qid_match
+        RETURN row.idx AS idx, title_match, qid_match
+        """
+
+        candidate_query = """
+        UNWIND $tokens AS token
+        CALL {
+            WITH token
+            MATCH (m:MediaWork)
+            WHERE toLower(m.title) CONTAINS token
+               OR token CONTAINS toLower(m.title)
+            RETURN m
+            LIMIT 10
+        }
+        RETURN token,
+               collect(m {.media_id, .title, .wikidata_id, .release_year}) AS candidates
+        """
+
+        with self.driver.session() as session:
+            unresolved = []
+            for record in session.run(exact_query, rows=rows):
+                work = works[record["idx"]]
+                idx = indices[record["idx"]]
+                if record["title_match"]:
+                    self._add_duplicate("work", idx, {
+                        "input_work": work,
+                        "existing_work": record["title_match"],
+                        "match_type": "title_year_type_exact",
+                        "confidence": "high"
+                    })
+                elif record["qid_match"]:
+                    self._add_duplicate("work", idx, {
+                        "input_work": work,
+                        "existing_work": record["qid_match"],
+                        "match_type": "exact_qid",
+                        "confidence": "high"
+                    })
+                else:
+                    unresolved.append(record["idx"])
+
+            if not unresolved:
+                return
+
+            tokens_by_pos = {
+                pos: self._search_token(works[pos]["title"]) for pos in sorted(unresolved)
+            }
+            result = session.run(candidate_query, tokens=sorted(set(tokens_by_pos.values())))
+            candidates_by_token = {record["token"]: record["candidates"] for record in result}
+
+        for pos, token in tokens_by_pos.items():
+            match = self._match_work_candidates(works[pos], candidates_by_token.get(token, []))
+            if match:
+                self._add_duplicate("work", indices[pos], match)
+
+    def _match_work_candidates(self, work: Dict, candidates: List[Dict]) -> Optional[Dict]:
+        """Score title-similarity candidates for a work and return the first duplicate match."""
+        title = work["title"]
+        release_year = work.get("release_year")
+
+        for candidate in candidates:
+            similarity = self._calculate_enhanced_similarity(title, candidate["title"])
+
+            # Title similarity threshold: 0.85
+            if similarity >= 0.85:
+                # Check year if available
+                db_year = candidate["release_year"]
+                if release_year and db_year:
+                    year_diff = abs(release_year - db_year)
+                    if year_diff <= 2:  # ±2 years tolerance
+                        return {
+                            "input_work": work,
+                            "existing_work": candidate,
+                            "match_type": "title_and_year",
+                            "confidence": "high",
+                            "similarity_score": similarity
+                        }
+                else:
+                    # No year data, rely on title alone
+                    return {
+                        "input_work": work,
+                        "existing_work": candidate,
+                        "match_type": "title_similarity",
+                        "confidence": "medium",
+                        "similarity_score": similarity
+                    }
+
+        return None
+
+    def validate_wikidata_qids(self, data: Dict, phase: str = "wikidata_validation"):
         """
         Validate all Wikidata Q-IDs by querying Wikidata API.
 
         For MediaWork nodes, this is MANDATORY per entity resolution protocol.
+
+        Args:
+            data: Batch data (or one streamed chunk of it)
+            phase: Journal key for this validation; a resumed run reuses the
+                recorded result instead of calling Wikidata again
         """
         print("\n🔍 Validating Wikidata Q-IDs...")
 
-        # Validate figure Q-IDs
-        if "figures" in data:
-            for figure in data["figures"]:
-                if "wikidata_id" in figure and figure["wikidata_id"]:
-                    qid = figure["wikidata_id"]
-                    if qid.startswith("Q"):
-                        try:
-                            validation = validate_qid(qid, figure["name"])
-                            if not validation["valid"]:
-                                self.invalid_qids.append({
-                                    "type": "HistoricalFigure",
-                                    "name": figure["name"],
-                                    "qid": qid,
-                                    "error": validation.get("error", "Invalid Q-ID")
-                                })
-                        except Exception as e:
-                            self.stats["warnings"].append(
-                                f"Could not validate Q-ID {qid} for {figure['name']}: {e}"
-                            )
-
-        # Validate work Q-IDs (MANDATORY)
-        if "works" in data:
-            for work in data["works"]:
-                if "wikidata_id" in work and work["wikidata_id"]:
-                    qid = work["wikidata_id"]
-                    if qid.startswith("Q"):
-                        try:
-                            validation = validate_qid(qid, work["title"])
-                            if not validation["valid"]:
-                                self.invalid_qids.append({
-                                    "type": "MediaWork",
-                                    "name": work["title"],
-                                    "qid": qid,
-                                    "error": validation.get("error", "Invalid Q-ID")
-                                })
-                        except Exception as e:
-                            self.stats["warnings"].append(
-                                f"Could not validate Q-ID {qid} for {work['title']}: {e}"
-                            )
+        if self.journal:
+            payload = self.journal.load_phase(phase)
+            if payload is not None:
+                self._restore_wikidata_validation(data, payload)
+                return
+        invalid_start = len(self.invalid_qids)
+        warnings_start = len(self.stats["warnings"])
+        resolved = {}
+
+        # Collect every figure and work Q-ID, then validate them in bulk
+        checks = []
+        for label, section, name_field in (
+            ("HistoricalFigure", "figures", "name"),
+            ("MediaWork", "works", "title"),  # MANDATORY for works
+        ):
+            for record in data.get(section, []):
+                qid = record.get("wikidata_id")
+                if qid and qid.startswith("Q"):
+                    checks.append((label, record[name_field], qid))
+
+        try:
+            validations = self._validate_qids([(qid, name) for _, name, qid in checks])
+        except Exception as e:
+            validations = []
+            for _, name, qid in checks:
+                self.stats["warnings"].append(f"Could not validate Q-ID {qid} for {name}: {e}")
+
+        for (label, name, qid), validation in zip(checks, validations):
+            if not validation["valid"]:
+                self.invalid_qids.append({
+                    "type": label,
+                    "name": name,
+                    "qid": qid,
+                    "error": validation.get("error", "Invalid Q-ID")
+                })
+
+        # Works without a Q-ID: search Wikidata for all of them at once
+        missing = [
+            (position, work) for position, work in enumerate(data.get("works", []))
+            if not work.get("wikidata_id")
+        ]
+        if missing:
+            print(f"   🔎 Searching Wikidata for {len(missing)} works without Q-IDs")
+            specs = [{
+                "title": work["title"],
+                "creator": work.get("creator"),
+                "year": work.get("release_year"),
+                "media_type": work.get("media_type")
+            } for _, work in missing]
+            try:
+                results = self._search_works(specs)
+            except Exception as e:
+                results = [e] * len(missing)
+
+            for (position, work), result in zip(missing, results):
+                if isinstance(result, Exception):
+                    self.stats["warnings"].append(
+                        f"Wikidata search failed for {work['title']}: {result}"
+                    )
+                elif result and result["confidence"] in ["high", "medium"]:
+                    print(f"      ✅ {work['title']}: {result['qid']} (confidence: {result['confidence']})")
+                    work["wikidata_id"] = result["qid"]
+                    resolved[position] = result["qid"]
                 else:
-                    # No Q-ID provided - try to search Wikidata
-                    print(f"   🔎 Searching Wikidata for: {work['title']}")
-                    try:
-                        result = search_wikidata_for_work(
-                            title=work["title"],
-                            creator=work.get("creator"),
-                            year=work.get("release_year"),
-                            media_type=work.get("media_type")
-                        )
-                        if result and result["confidence"] in ["high", "medium"]:
-                            print(f"      ✅ Found Q-ID: {result['qid']} (confidence: {result['confidence']})")
-                            work["wikidata_id"] = result["qid"]
-                        else:
-                            self.stats["warnings"].append(
-                                f"Could not find Wikidata Q-ID for: {work['title']}"
-                            )
-                    except Exception as e:
-                        self.stats["warnings"].append(
-                            f"Wikidata search failed for {work['title']}: {e}"
-                        )
+                    self.stats["warnings"].append(
+                        f"Could not find Wikidata Q-ID for: {work['title']}"
+                    )
+
+        if self.journal:
+            self.journal.record_phase(phase, {
+                "invalid_qids": self.invalid_qids[invalid_start:],
+                "warnings": self.stats["warnings"][warnings_start:],
+                "resolved_work_qids": resolved
+            })
 
         if self.invalid_qids:
             print(f"❌ Found {len(self.invalid_qids)} invalid Q-IDs")
         else:
             print("✅ All Q-IDs validated")
 
-    def import_figures(self, figures: List[Dict], metadata: Dict):
+    def _validate_qids(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """validate_qids, memoised in the shared qid_cache (network failures are not cached)."""
+        results: Dict[Tuple[str, str], Dict] = {}
+        missing = []
+        for qid, name in dict.fromkeys(pairs):
+            key = ("validate", qid, name)
+            if self.qid_cache is not None and key in self.qid_cache:
+                results[(qid, name)] = self.qid_cache[key]
+            else:
+                missing.append((qid, name))
+
+        if missing:
+            print(f"   🔎 Validating {len(missing)} Q-IDs against Wikidata")
+        for pair, validation in zip(missing, validate_qids(missing)):
+            results[pair] = validation
+            if self.qid_cache is not None and not validation.get("error", "").startswith("Failed to fetch"):
+                self.qid_cache[("validate",) + pair] = validation
+
+        return [results[pair] for pair in pairs]
+
+    def _search_works(self, specs: List[Dict]) -> List[Any]:
+        """search_wikidata_for_works, memoised in the shared qid_cache (failed searches are not cached)."""
+        keys = [("search",) + tuple(sorted(spec.items())) for spec in specs]
+        pending = [
+            (key, spec) for key, spec in dict(zip(keys, specs)).items()
+            if self.qid_cache is None or key not in self.qid_cache
+        ]
+
+        found = dict(zip(
+            [key for key, _ in pending],
+            search_wikidata_for_works([spec for _, spec in pending]) if pending else []
+        ))
+        if self.qid_cache is not None:
+            self.qid_cache.update(
+                (key, result) for key, result in found.items() if not isinstance(result, Exception)
+            )
+            return [found[key] if key in found else self.qid_cache[key] for key in keys]
+        return [found[key] for key in keys]
+
+    def _restore_wikidata_validation(self, data: Dict, payload: Dict):
+        """Apply a journaled validation result, including Q-IDs found by search."""
+        self.invalid_qids.extend(payload["invalid_qids"])
+        self.stats["warnings"].extend(payload["warnings"])
+        for position, qid in payload["resolved_work_qids"].items():
+            data["works"][int(position)]["wikidata_id"] = qid
+        print(f"⏩ Restored Wikidata validation from journal "
+              f"({len(payload['invalid_qids'])} invalid, "
+              f"{len(payload['resolved_work_qids'])} resolved by search)")
+
+    def import_figures(self, figures: List[Dict], metadata: Dict, indices: Optional[List[int]] = None):
         """
         Import historical figures into database.
 
@@ -698,21 +1179,25 @@ class BatchImporter:
         if not figures:
             return
 
+        if indices is None:
+            indices = list(range(len(figures)))
+
         print(f"\n📥 Importing {len(figures)} historical figures...")
 
-        # Filter out duplicates
+        # Filter out duplicates and records committed before a --resume
+        committed = self.journal.committed_indices("figures") if self.journal else set()
         figures_to_import = []
-        for figure in figures:
-            # Check if this figure was flagged as duplicate
-            is_duplicate = any(
-                dup["input_figure"] == figure
-                for dup in self.duplicate_figures
-            )
-            if is_duplicate:
+        figure_indices = []
+        for idx, figure in zip(indices, figures):
+            # Duplicates are tracked by input index, not by comparing records
+            if idx in self.duplicate_indices["figure"]:
                 self.stats["figures_skipped_duplicate"] += 1
                 print(f"   ⏭️  Skipping duplicate: {figure['name']}")
+            elif idx in committed:
+                self.stats["skipped_already_committed"] += 1
             else:
                 figures_to_import.append(figure)
+                figure_indices.append(idx)
 
         if not figures_to_import:
             print("   No new figures to import")
@@ -720,6 +1205,9 @@ class BatchImporter:
 
         # Add metadata to each figure
         for figure in figures_to_import:
+            # Hash the record as supplied, before metadata and generated IDs
+            figure["content_hash"] = content_hash(figure)
+
             if "ingestion_batch" not in figure:
                 figure["ingestion_batch"] = self.batch_id
             if "ingestion_source" not in figure:
@@ -738,46 +1226,22 @@ class BatchImporter:
                     timestamp = int(time.time() * 1000)
                     figure["canonical_id"] = f"PROV:{slug}-{timestamp}"
 
+        figures_to_import, figure_indices = self._filter_unchanged(
+            "HistoricalFigure", "figures", figures_to_import, figure_indices
+        )
+
         if self.dry_run:
             print(f"   [DRY RUN] Would import {len(figures_to_import)} figures")
             for fig in figures_to_import[:5]:  # Show first 5
                 print(f"      - {fig['name']} ({fig['canonical_id']})")
             if len(figures_to_import) > 5:
                 print(f"      ... and {len(figures_to_import) - 5} more")
-            self.stats["figures_created"] = len(figures_to_import)
+            self.stats["figures_created"] += len(figures_to_import)
             return
 
-        # Import in batches
-        with self.driver.session() as session:
-            for i in range(0, len(figures_to_import), self.batch_size):
-                batch = figures_to_import[i:i + self.batch_size]
-
-                query = """
-                UNWIND $figures AS figure_data
-                MERGE (f:HistoricalFigure {canonical_id: figure_data.canonical_id})
-                ON CREATE SET
-                    f += figure_data,
-                    f.created_at = datetime()
-                ON MATCH SET
-                    f += figure_data,
-                    f.updated_at = datetime()
-                RETURN COUNT(*) AS count
-                """
-
-                try:
-                    result = session.run(query, figures=batch)
-                    count = result.single()["count"]
-                    self.stats["figures_created"] += count
-                    print(f"   ✅ Imported batch {i // self.batch_size + 1}: {count} figures")
-                except Exception as e:
-                    error_msg = f"Failed to import figure batch {i // self.batch_size + 1}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
-
-            # Create CREATED_BY relationships to Agent node (inside session context)
-            self._create_agent_relationships(session, "HistoricalFigure", figures_to_import)
+        self._write_nodes("HistoricalFigure", "figures", figures_to_import, figure_indices)
 
-    def import_works(self, works: List[Dict], metadata: Dict):
+    def import_works(self, works: List[Dict], metadata: Dict, indices: Optional[List[int]] = None):
         """
         Import media works into database.
 
@@ -786,20 +1250,25 @@ class BatchImporter:
         if not works:
             return
 
+        if indices is None:
+            indices = list(range(len(works)))
+
         print(f"\n📥 Importing {len(works)} media works...")
 
-        # Filter out duplicates
+        # Filter out duplicates and records committed before a --resume
+        committed = self.journal.committed_indices("works") if self.journal else set()
         works_to_import = []
-        for work in works:
-            is_duplicate = any(
-                dup["input_work"] == work
-                for dup in self.duplicate_works
-            )
-            if is_duplicate:
+        work_indices = []
+        for idx, work in zip(indices, works):
+            # Duplicates are tracked by input index, not by comparing records
+            if idx in self.duplicate_indices["work"]:
                 self.stats["works_skipped_duplicate"] += 1
                 print(f"   ⏭️  Skipping duplicate: {work['title']}")
+            elif idx in committed:
+                self.stats["skipped_already_committed"] += 1
             else:
                 works_to_import.append(work)
+                work_indices.append(idx)
 
         if not works_to_import:
             print("   No new works to import")
@@ -807,6 +1276,9 @@ class BatchImporter:
 
         # Add metadata and generate media_id
         for work in works_to_import:
+            # Hash the record as supplied, before metadata and generated IDs
+            work["content_hash"] = content_hash(work)
+
             if "ingestion_batch" not in work:
                 work["ingestion_batch"] = self.batch_id
             if "ingestion_source" not in work:
@@ -822,14 +1294,18 @@ class BatchImporter:
 
         # Filter out works missing wikidata_id (required per entity resolution protocol)
         filtered = []
-        for work in works_to_import:
+        filtered_indices = []
+        for idx, work in zip(work_indices, works_to_import):
             if "wikidata_id" not in work or not work["wikidata_id"]:
                 error_msg = f"MediaWork '{work['title']}' has no wikidata_id - REQUIRED per entity resolution protocol"
                 self.stats["errors"].append(error_msg)
                 print(f"   ❌ {error_msg}")
             else:
                 filtered.append(work)
-        works_to_import = filtered
+                filtered_indices.append(idx)
+        works_to_import, work_indices = self._filter_unchanged(
+            "MediaWork", "works", filtered, filtered_indices
+        )
 
         if self.dry_run:
             print(f"   [DRY RUN] Would import {len(works_to_import)} works")
@@ -837,45 +1313,25 @@ class BatchImporter:
                 print(f"      - {work['title']} ({work['wikidata_id']})")
             if len(works_to_import) > 5:
                 print(f"      ... and {len(works_to_import) - 5} more")
-            self.stats["works_created"] = len(works_to_import)
+            self.stats["works_created"] += len(works_to_import)
             return
 
-        # Import in batches (using wikidata_id as merge key)
-        with self.driver.session() as session:
-            for i in range(0, len(works_to_import), self.batch_size):
-                batch = works_to_import[i:i + self.batch_size]
-
-                query = """
-                UNWIND $works AS work_data
-                MERGE (m:MediaWork {wikidata_id: work_data.wikidata_id})
-                ON CREATE SET
-                    m += work_data,
-                    m.created_at = datetime()
-                ON MATCH SET
-                    m += work_data,
-                    m.updated_at = datetime()
-                RETURN COUNT(*) AS count
-                """
-
-                try:
-                    result = session.run(query, works=batch)
-                    count = result.single()["count"]
-                    self.stats["works_created"] += count
-                    print(f"   ✅ Imported batch {i // self.batch_size + 1}: {count} works")
-                except Exception as e:
-                    error_msg = f"Failed to import work batch {i // self.batch_size + 1}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
-
-            # Create CREATED_BY relationships (inside session context)
-            self._create_agent_relationships(session, "MediaWork", works_to_import)
+        self._write_nodes("MediaWork", "works", works_to_import, work_indices)
 
-    def detect_duplicate_events(self, events: List[Dict]):
+    def detect_duplicate_events(self, events: List[Dict], indices: Optional[List[int]] = None):
         """Check for duplicate events in database using Q-ID and name similarity."""
         print("\n🔍 Checking for duplicate events...")
 
+        if indices is None:
+            indices = list(range(len(events)))
+
+        phase = f"duplicates:events:{indices[0] if indices else 0}"
+        if self._restore_duplicates("event", phase):
+            return
+        start = len(self.duplicate_events)
+
         with self.driver.session() as session:
-            for event in events:
+            for idx, event in zip(indices, events):
                 name = event["name"]
                 event_id = event.get("event_id")
                 wikidata_id = event.get("wikidata_id")
@@ -892,7 +1348,7 @@ class BatchImporter:
                     result = session.run(query, event_id=event_id)
                     record = result.single()
                     if record:
-                        self.duplicate_events.append({
+                        self._add_duplicate("event", idx, {
                             "input_event": event,
                             "existing_event": dict(record),
                             "match_type": "exact_event_id",
@@ -912,7 +1368,7 @@ class BatchImporter:
                     result = session.run(query, qid=wikidata_id)
                     record = result.single()
                     if record:
-                        self.duplicate_events.append({
+                        self._add_duplicate("event", idx, {
                             "input_event": event,
                             "existing_event": dict(record),
                             "match_type": "exact_qid",
@@ -933,29 +1389,45 @@ class BatchImporter:
                 """
                 result = session.run(query, name_part=name_part)
 
-                for record in result:
-                    similarity = self._calculate_enhanced_similarity(name, record["name"])
-                    if similarity >= 0.9:
-                        self.duplicate_events.append({
-                            "input_event": event,
-                            "existing_event": dict(record),
-                            "match_type": "name_similarity",
-                            "confidence": "high" if similarity >= 0.95 else "medium",
-                            "similarity_score": similarity
-                        })
-                        break
+                match = self._match_event_candidates(event, [dict(record) for record in result])
+                if match:
+                    self._add_duplicate("event", idx, match)
+
+        self._journal_duplicates("event", phase, start)
 
         if self.duplicate_events:
             print(f"⚠️  Found {len(self.duplicate_events)} potential duplicate events")
         else:
             print("✅ No duplicate events detected")
 
-    def detect_duplicate_sources(self, sources: List[Dict]):
+    def _match_event_candidates(self, event: Dict, candidates: List[Dict]) -> Optional[Dict]:
+        """Score name-similarity candidates for an event and return the first duplicate match."""
+        for candidate in candidates:
+            similarity = self._calculate_enhanced_similarity(event["name"], candidate["name"])
+            if similarity >= 0.9:
+                return {
+                    "input_event": event,
+                    "existing_event": candidate,
+                    "match_type": "name_similarity",
+                    "confidence": "high" if similarity >= 0.95 else "medium",
+                    "similarity_score": similarity
+                }
+        return None
+
+    def detect_duplicate_sources(self, sources: List[Dict], indices: Optional[List[int]] = None):
         """Check for duplicate sources in database."""
         print("\n🔍 Checking for duplicate sources...")
 
+        if indices is None:
+            indices = list(range(len(sources)))
+
+        phase = f"duplicates:sources:{indices[0] if indices else 0}"
+        if self._restore_duplicates("source", phase):
+            return
+        start = len(self.duplicate_sources)
+
         with self.driver.session() as session:
-            for source in sources:
+            for idx, source in zip(indices, sources):
                 source_id = source.get("source_id")
 
                 if source_id:
@@ -968,37 +1440,44 @@ class BatchImporter:
                     result = session.run(query, source_id=source_id)
                     record = result.single()
                     if record:
-                        self.duplicate_sources.append({
+                        self._add_duplicate("source", idx, {
                             "input_source": source,
                             "existing_source": dict(record),
                             "match_type": "exact_source_id",
                             "confidence": "high"
                         })
 
+        self._journal_duplicates("source", phase, start)
+
         if self.duplicate_sources:
             print(f"⚠️  Found {len(self.duplicate_sources)} potential duplicate sources")
         else:
             print("✅ No duplicate sources detected")
 
-    def import_events(self, events: List[Dict], metadata: Dict):
+    def import_events(self, events: List[Dict], metadata: Dict, indices: Optional[List[int]] = None):
         """Import historical events into database."""
         if not events:
             return
 
+        if indices is None:
+            indices = list(range(len(events)))
+
         print(f"\n📥 Importing {len(events)} historical events...")
 
-        # Filter out duplicates
+        # Filter out duplicates and records committed before a --resume
+        committed = self.journal.committed_indices("events") if self.journal else set()
         events_to_import = []
-        for event in events:
-            is_duplicate = any(
-                dup["input_event"] == event
-                for dup in self.duplicate_events
-            )
-            if is_duplicate:
+        event_indices = []
+        for idx, event in zip(indices, events):
+            # Duplicates are tracked by input index, not by comparing records
+            if idx in self.duplicate_indices["event"]:
                 self.stats["events_skipped_duplicate"] += 1
                 print(f"   ⏭️  Skipping duplicate: {event['name']}")
+            elif idx in committed:
+                self.stats["skipped_already_committed"] += 1
             else:
                 events_to_import.append(event)
+                event_indices.append(idx)
 
         if not events_to_import:
             print("   No new events to import")
@@ -1006,6 +1485,9 @@ class BatchImporter:
 
         # Add metadata to each event
         for event in events_to_import:
+            # Hash the record as supplied, before metadata and generated IDs
+            event["content_hash"] = content_hash(event)
+
             if "ingestion_batch" not in event:
                 event["ingestion_batch"] = self.batch_id
             if "ingestion_source" not in event:
@@ -1022,63 +1504,45 @@ class BatchImporter:
                     timestamp = int(time.time() * 1000)
                     event["event_id"] = f"event-{slug}-{timestamp}"
 
+        events_to_import, event_indices = self._filter_unchanged(
+            "HistoricalEvent", "events", events_to_import, event_indices
+        )
+
         if self.dry_run:
             print(f"   [DRY RUN] Would import {len(events_to_import)} events")
             for ev in events_to_import[:5]:
                 print(f"      - {ev['name']} ({ev['event_id']})")
             if len(events_to_import) > 5:
                 print(f"      ... and {len(events_to_import) - 5} more")
-            self.stats["events_created"] = len(events_to_import)
+            self.stats["events_created"] += len(events_to_import)
             return
 
-        with self.driver.session() as session:
-            for i in range(0, len(events_to_import), self.batch_size):
-                batch = events_to_import[i:i + self.batch_size]
+        self._write_nodes("HistoricalEvent", "events", events_to_import, event_indices)
 
-                query = """
-                UNWIND $events AS event_data
-                MERGE (ev:HistoricalEvent {event_id: event_data.event_id})
-                ON CREATE SET
-                    ev += event_data,
-                    ev.created_at = datetime()
-                ON MATCH SET
-                    ev += event_data,
-                    ev.updated_at = datetime()
-                RETURN COUNT(*) AS count
-                """
-
-                try:
-                    result = session.run(query, events=batch)
-                    count = result.single()["count"]
-                    self.stats["events_created"] += count
-                    print(f"   ✅ Imported batch {i // self.batch_size + 1}: {count} events")
-                except Exception as e:
-                    error_msg = f"Failed to import event batch {i // self.batch_size + 1}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
-
-            # Create CREATED_BY relationships (inside session context)
-            self._create_agent_relationships(session, "HistoricalEvent", events_to_import)
-
-    def import_sources(self, sources: List[Dict], metadata: Dict):
+    def import_sources(self, sources: List[Dict], metadata: Dict, indices: Optional[List[int]] = None):
         """Import source documents into database."""
         if not sources:
             return
 
+        if indices is None:
+            indices = list(range(len(sources)))
+
         print(f"\n📥 Importing {len(sources)} sources...")
 
-        # Filter out duplicates
+        # Filter out duplicates and records committed before a --resume
+        committed = self.journal.committed_indices("sources") if self.journal else set()
         sources_to_import = []
-        for source in sources:
-            is_duplicate = any(
-                dup["input_source"] == source
-                for dup in self.duplicate_sources
-            )
-            if is_duplicate:
+        source_indices = []
+        for idx, source in zip(indices, sources):
+            # Duplicates are tracked by input index, not by comparing records
+            if idx in self.duplicate_indices["source"]:
                 self.stats["sources_skipped_duplicate"] += 1
                 print(f"   ⏭️  Skipping duplicate: {source['title']}")
+            elif idx in committed:
+                self.stats["skipped_already_committed"] += 1
             else:
                 sources_to_import.append(source)
+                source_indices.append(idx)
 
         if not sources_to_import:
             print("   No new sources to import")
@@ -1086,6 +1550,9 @@ class BatchImporter:
 
         # Add metadata to each source
         for source in sources_to_import:
+            # Hash the record as supplied, before metadata and generated IDs
+            source["content_hash"] = content_hash(source)
+
             if "ingestion_batch" not in source:
                 source["ingestion_batch"] = self.batch_id
             if "created_by" not in source:
@@ -1097,49 +1564,320 @@ class BatchImporter:
                 timestamp = int(time.time() * 1000)
                 source["source_id"] = f"src-{slug}-{timestamp}"
 
+        sources_to_import, source_indices = self._filter_unchanged(
+            "Source", "sources", sources_to_import, source_indices
+        )
+
         if self.dry_run:
             print(f"   [DRY RUN] Would import {len(sources_to_import)} sources")
             for src in sources_to_import[:5]:
                 print(f"      - {src['title']} ({src['source_id']})")
             if len(sources_to_import) > 5:
                 print(f"      ... and {len(sources_to_import) - 5} more")
-            self.stats["sources_created"] = len(sources_to_import)
+            self.stats["sources_created"] += len(sources_to_import)
             return
 
+        self._write_nodes("Source", "sources", sources_to_import, source_indices)
+
+    def _filter_unchanged(
+        self,
+        label: str,
+        entity: str,
+        rows: List[Dict],
+        indices: List[int]
+    ) -> Tuple[List[Dict], List[int]]:
+        """
+        Drop rows whose content_hash matches the node already in the database.
+
+        Stored hashes are fetched in bulk (HASH_LOOKUP_CHUNK IDs per query), so
+        re-importing an unchanged file costs a few reads and no writes. Nodes
+        written before content hashing existed have no hash and are rewritten.
+        """
+        if not self.skip_unchanged or not rows or self.staging:
+            # Staged records are compared server-side during promotion
+            return rows, indices
+
+        id_prop = self._get_id_property(label)
+        query = f"""
+        UNWIND $keys AS key
+        MATCH (n:{label} {{{id_prop}: key}})
+        RETURN key, n.content_hash AS content_hash
+        """
+
+        stored = {}
         with self.driver.session() as session:
-            for i in range(0, len(sources_to_import), self.batch_size):
-                batch = sources_to_import[i:i + self.batch_size]
+            for i in range(0, len(rows), HASH_LOOKUP_CHUNK):
+                keys = [row[id_prop] for row in rows[i:i + HASH_LOOKUP_CHUNK]]
+                for record in session.run(query, keys=keys):
+                    stored[record["key"]] = record["content_hash"]
+
+        changed, changed_indices = [], []
+        for row, idx in zip(rows, indices):
+            existing = stored.get(row[id_prop])
+            if existing is not None and existing == row["content_hash"]:
+                self.stats[f"{entity}_unchanged"] += 1
+            else:
+                changed.append(row)
+                changed_indices.append(idx)
 
-                query = """
-                UNWIND $sources AS source_data
-                MERGE (s:Source {source_id: source_data.source_id})
-                ON CREATE SET
-                    s += source_data,
-                    s.created_at = datetime()
-                ON MATCH SET
-                    s += source_data,
-                    s.updated_at = datetime()
-                RETURN COUNT(*) AS count
-                """
+        unchanged = len(rows) - len(changed)
+        if unchanged:
+            print(f"   ⏭️  Skipping {unchanged} unchanged {entity} (content_hash match)")
+        return changed, changed_indices
+
+    def _node_merge_query(self, label: str) -> str:
+        """
+        Build the UNWIND MERGE statement for one node label, keyed on its ID property.
+
+        The CREATED_BY link to the Agent is merged in the same statement, so a
+        committed chunk is always attributed (a resumed run never revisits it).
+        """
+        id_prop = self._get_id_property(label)
+
+        return f"""
+        UNWIND $rows AS row
+        MERGE (n:{label} {{{id_prop}: row.{id_prop}}})
+        ON CREATE SET
+            n += row,
+            n.created_at = datetime()
+        ON MATCH SET
+            n += row,
+            n.updated_at = datetime()
+        WITH n
+        MATCH (a:Agent {{name: $agent_name}})
+        MERGE (n)-[r:CREATED_BY]->(a)
+        ON CREATE SET r.timestamp = datetime(), r.batch_id = $batch_id
+        RETURN COUNT(*) AS count
+        """
+
+    def _write_nodes(self, label: str, entity: str, rows: List[Dict], indices: List[int]):
+        """
+        Write prepared node rows in batch_size chunks, attributed to the Agent.
+
+        Each committed chunk is recorded in the run journal by input index.
+        With workers > 1 the rows are handed to the PartitionedWriter and this
+        returns immediately; results are collected by flush_writes().
+        """
+        if not rows:
+            return
+
+        if self.staging:
+            count = self.staging.stage(label, rows, indices)
+            self.stats["staged"] += count
+            self._journal_chunk(entity, indices, count)
+            print(f"   ✅ Staged {count} {entity} under :Staging")
+            return
+
+        query = self._node_merge_query(label)
+        params = {"agent_name": self.agent_name, "batch_id": self.batch_id}
+        stat_key = f"{entity}_created"
+
+        with self.driver.session() as session:
+            self._ensure_agent(session)
+
+            if self.writer:
+                index_of = {id(row): idx for row, idx in zip(rows, indices)}
+
+                def on_commit(chunk: List[Dict], count: int):
+                    self._journal_chunk(entity, [index_of[id(row)] for row in chunk], count)
+
+                futures = self.writer.submit_nodes(
+                    label, self._get_id_property(label), query, rows, self._chunk_size(entity),
+                    params=params, on_commit=on_commit
+                )
+                self._pending_writes.extend((stat_key, future) for future in futures)
+                return
+
+            i = 0
+            batch_no = 0
+            while i < len(rows):
+                batch = rows[i:i + self._chunk_size(entity)]
+                batch_no += 1
 
                 try:
-                    result = session.run(query, sources=batch)
-                    count = result.single()["count"]
-                    self.stats["sources_created"] += count
-                    print(f"   ✅ Imported batch {i // self.batch_size + 1}: {count} sources")
+                    count, latency = self._timed_write(
+                        entity, len(batch),
+                        lambda: session.run(query, rows=batch, **params).single()["count"]
+                    )
+                    self.stats[stat_key] += count
+                    self._journal_chunk(entity, indices[i:i + len(batch)], count)
+                    print(f"   ✅ Imported batch {batch_no}: {count} {entity}"
+                          + (f" (size {len(batch)}, {latency:.2f}s)" if self.batch_sizer else ""))
                 except Exception as e:
-                    error_msg = f"Failed to import source batch {i // self.batch_size + 1}: {e}"
+                    if self.batch_sizer and self.batch_sizer.record_failure(entity, len(batch), e):
+                        # Timeout or memory limit: retry the same rows in a smaller chunk
+                        self.metrics.count("retries")
+                        print(f"   ↘️  {entity} batch of {len(batch)} hit a resource limit; "
+                              f"retrying at size {self.batch_sizer.size(entity)}")
+                        batch_no -= 1
+                        continue
+                    error_msg = f"Failed to import {entity[:-1]} batch {batch_no}: {e}"
                     self.stats["errors"].append(error_msg)
                     print(f"   ❌ {error_msg}")
+                i += len(batch)
+
+    def _chunk_size(self, entity: str) -> int:
+        """Rows per write chunk for `entity` (adaptive when --adaptive-batch is on)."""
+        return self.batch_sizer.size(entity) if self.batch_sizer else self.batch_size
 
-            # Create CREATED_BY relationships (inside session context)
-            self._create_agent_relationships(session, "Source", sources_to_import)
+    def _timed_write(self, entity: str, rows: int, write: Callable[[], int]) -> Tuple[int, float]:
+        """
+        Run one chunk write and report its commit latency to the batch sizer.
+
+        Returns:
+            (count returned by `write`, latency in seconds)
+        """
+        start = time.perf_counter()
+        count = write()
+        latency = time.perf_counter() - start
+        if self.batch_sizer:
+            self.batch_sizer.record_success(entity, rows, latency)
+        return count, latency
+
+    # Live label -> entity name used for duplicate tracking
+    STAGED_ENTITIES = {
+        "HistoricalFigure": "figure",
+        "MediaWork": "work",
+        "HistoricalEvent": "event",
+        "Source": "source",
+    }
+
+    def finish_staging(self, check_duplicates: bool = True):
+        """
+        Resolve duplicates among staged nodes, promote the rest, drop the batch's staging nodes.
+
+        Must run before relationships are written, since they MATCH live nodes.
+        """
+        if not self.staging:
+            return
+
+        if check_duplicates:
+            with self.metrics.phase("staged_duplicate_detection"):
+                self.detect_staged_duplicates()
+
+        print("\n🚚 Promoting staged nodes...")
+        labels = self.staging.staged_labels()
+        with self.metrics.phase("promotion", records=self.stats["staged"]):
+            results = self.staging.promote(
+                labels,
+                {label: self._get_id_property(label) for label in labels},
+                self.agent_name,
+                skip_unchanged=self.skip_unchanged
+            )
+        for label, counts in results.items():
+            entity = self.STAGED_ENTITIES[label] + "s"
+            self.stats[f"{entity}_created"] += counts["promoted"]
+            self.stats[f"{entity}_unchanged"] += counts["unchanged"]
+            print(f"   ✅ {label}: {counts['promoted']} promoted, {counts['unchanged']} unchanged")
+
+        deleted = self.staging.cleanup()
+        print(f"   🧹 Removed {deleted} staging nodes")
+
+    def detect_staged_duplicates(self):
+        """
+        Duplicate detection for --staging, as joins between staged and live nodes.
+
+        Exact-key checks run entirely on the server and mark the staged nodes.
+        Name-similarity candidates are fetched per search token and scored with
+        the same matchers as the whole-file path; matches are marked in one
+        UNWIND statement. Marked nodes are never promoted.
+        """
+        print("\n🔍 Checking staged nodes for duplicates...")
+        matchers = {
+            "HistoricalFigure": self._match_figure_candidates,
+            "MediaWork": self._match_work_candidates,
+            "HistoricalEvent": self._match_event_candidates,
+        }
 
-    def import_relationships(self, relationships: List[Dict]):
-        """Import relationships between entities."""
+        for label in self.staging.staged_labels():
+            entity = self.STAGED_ENTITIES[label]
+            found = 0
+
+            for match in self.staging.mark_exact_duplicates(label):
+                self._add_duplicate(entity, match["index"], {
+                    f"input_{entity}": match["input"],
+                    f"existing_{entity}": match["existing"],
+                    "match_type": match["match_type"],
+                    "confidence": "high"
+                })
+                found += 1
+
+            marks = []
+            if label in matchers:
+                for staged, candidates in self.staging.similarity_candidates(label):
+                    for record in staged:
+                        match = matchers[label](record, candidates)
+                        if match:
+                            marks.append({"key": record["_staging_key"], "match_type": match["match_type"]})
+                            self._add_duplicate(entity, record["_staging_index"], match)
+            self.staging.mark_duplicates(marks)
+            found += len(marks)
+
+            self.stats[f"{entity}s_skipped_duplicate"] += found
+            print(f"   {label}: {found} duplicates")
+
+    def _ensure_agent(self, session):
+        """Make sure the Agent node used for CREATED_BY exists."""
+        session.run("""
+        MERGE (a:Agent {name: $agent_name})
+        ON CREATE SET a.created_at = datetime()
+        """, agent_name=self.agent_name)
+
+    def _journal_chunk(self, entity: str, indices: List[int], count: int):
+        """Record a committed chunk in the run journal (no-op without a journal)."""
+        if self.journal:
+            self.journal.record_chunk(entity, indices, count)
+
+    def flush_writes(self):
+        """Wait for concurrent writes (--workers) and fold their counts into stats."""
+        if not self.writer:
+            return
+
+        with self.metrics.phase("write_wait"):
+            self.writer.wait()
+        for stat_key, future in self._pending_writes:
+            try:
+                count = future.result()
+            except Exception as e:
+                self._record_error(f"Concurrent write failed: {e}")
+                continue
+            if stat_key:
+                self.stats[stat_key] += count
+        self._pending_writes = []
+
+    def _record_error(self, error_msg: str):
+        """Append an error to stats and echo it (safe to call from writer threads)."""
+        self.stats["errors"].append(error_msg)
+        print(f"   ❌ {error_msg}")
+
+    def import_relationships(self, relationships: List[Dict], indices: Optional[List[int]] = None):
+        """
+        Import relationships between entities.
+
+        Relationships are grouped by (from_type, to_type, rel_type) and written
+        with one UNWIND statement per group and batch_size chunk. Like nodes,
+        relationships whose content_hash matches the stored one are skipped.
+
+        Args:
+            relationships: Input relationship records
+            indices: Position of each record in the input file (defaults to 0..n-1)
+        """
         if not relationships:
             return
 
+        if indices is None:
+            indices = list(range(len(relationships)))
+
+        committed = self.journal.committed_indices("relationships") if self.journal else set()
+        if committed:
+            pending = [(idx, rel) for idx, rel in zip(indices, relationships) if idx not in committed]
+            self.stats["skipped_already_committed"] += len(relationships) - len(pending)
+            indices = [idx for idx, _ in pending]
+            relationships = [rel for _, rel in pending]
+            if not relationships:
+                print("\n⏩ All relationships already committed")
+                return
+
         print(f"\n📥 Importing {len(relationships)} relationships...")
 
         if self.dry_run:
@@ -1148,50 +1886,165 @@ class BatchImporter:
                 print(f"      - {rel['from_id']} -{rel['rel_type']}-> {rel['to_id']}")
             if len(relationships) > 5:
                 print(f"      ... and {len(relationships) - 5} more")
-            self.stats["relationships_created"] = len(relationships)
+            self.stats["relationships_created"] += len(relationships)
             return
 
-        with self.driver.session() as session:
-            for rel in relationships:
-                try:
-                    from_type = rel["from_type"]
-                    to_type = rel["to_type"]
-                    rel_type = rel["rel_type"]
-                    properties = rel.get("properties", {})
-
-                    # Add metadata
-                    properties["ingestion_batch"] = self.batch_id
-                    properties["created_at"] = int(time.time())
-
-                    # Determine ID properties
-                    from_id_prop = self._get_id_property(from_type)
-                    to_id_prop = self._get_id_property(to_type)
-
-                    query = f"""
-                    MATCH (from:{from_type} {{{from_id_prop}: $from_id}})
-                    MATCH (to:{to_type} {{{to_id_prop}: $to_id}})
-                    MERGE (from)-[r:{rel_type}]->(to)
-                    ON CREATE SET r += $properties
-                    ON MATCH SET r += $properties
-                    RETURN COUNT(*) AS count
-                    """
+        # Group by (from_type, to_type, rel_type) so each group shares one
+        # parameterised UNWIND statement
+        groups: Dict[Tuple[str, str, str], List[Dict]] = {}
+        for idx, rel in zip(indices, relationships):
+            properties = dict(rel.get("properties", {}))
+            properties["content_hash"] = content_hash(properties)
+
+            key = (rel["from_type"], rel["to_type"], rel["rel_type"])
+            groups.setdefault(key, []).append({
+                "from_id": rel["from_id"],
+                "to_id": rel["to_id"],
+                "properties": properties,
+                # Set on creation only, so an unchanged re-import writes nothing
+                "metadata": {"ingestion_batch": self.batch_id, "created_at": int(time.time())},
+                "source": rel,
+                "index": idx
+            })
+        groups = {
+            key: rows for key, rows in
+            ((key, self._filter_unchanged_relationships(*key, rows)) for key, rows in groups.items())
+            if rows
+        }
 
-                    result = session.run(
-                        query,
-                        from_id=rel["from_id"],
-                        to_id=rel["to_id"],
-                        properties=properties
+        if self.writer:
+            for (from_type, to_type, rel_type), rows in groups.items():
+                query = self._relationship_query(from_type, to_type, rel_type)
+                print(f"   {from_type} -{rel_type}-> {to_type}: {len(rows)} relationships (scheduled)")
+
+                def write(session, chunk, query=query):
+                    return self._write_relationship_chunk(
+                        lambda part: self._timed_write(
+                            "relationships", len(part),
+                            lambda: self.writer.write_chunk(session, query, part)
+                        )[0],
+                        chunk
                     )
 
-                    self.stats["relationships_created"] += result.single()["count"]
+                futures = self.writer.submit_relationships(
+                    from_type, to_type, rows, self._chunk_size("relationships"), write
+                )
+                self._pending_writes.extend(("relationships_created", f) for f in futures)
+            return
 
-                except Exception as e:
-                    error_msg = f"Failed to create relationship {rel}: {e}"
-                    self.stats["errors"].append(error_msg)
-                    print(f"   ❌ {error_msg}")
+        with self.driver.session() as session:
+            for (from_type, to_type, rel_type), rows in groups.items():
+                query = self._relationship_query(from_type, to_type, rel_type)
+                print(f"   {from_type} -{rel_type}-> {to_type}: {len(rows)} relationships")
+
+                def write(part, query=query):
+                    return self._timed_write(
+                        "relationships", len(part),
+                        lambda: session.run(query, rows=part).single()["count"]
+                    )[0]
+
+                i = 0
+                while i < len(rows):
+                    chunk = rows[i:i + self._chunk_size("relationships")]
+                    self.stats["relationships_created"] += self._write_relationship_chunk(write, chunk)
+                    i += len(chunk)
 
         print(f"   ✅ Imported {self.stats['relationships_created']} relationships")
 
+    def _relationship_query(self, from_type: str, to_type: str, rel_type: str) -> str:
+        """
+        Build the UNWIND MERGE statement for one relationship group.
+
+        Labels and relationship types are interpolated because Cypher cannot
+        parameterise them; they are restricted to the whitelists enforced in
+        _validate_relationship_schema.
+        """
+        from_id_prop = self._get_id_property(from_type)
+        to_id_prop = self._get_id_property(to_type)
+
+        return f"""
+        UNWIND $rows AS row
+        MATCH (from:{from_type} {{{from_id_prop}: row.from_id}})
+        MATCH (to:{to_type} {{{to_id_prop}: row.to_id}})
+        MERGE (from)-[r:{rel_type}]->(to)
+        ON CREATE SET r += row.properties, r += row.metadata
+        ON MATCH SET r += row.properties
+        RETURN COUNT(*) AS count
+        """
+
+    def _filter_unchanged_relationships(
+        self,
+        from_type: str,
+        to_type: str,
+        rel_type: str,
+        rows: List[Dict]
+    ) -> List[Dict]:
+        """
+        Drop relationship rows whose content_hash matches the stored relationship.
+
+        The relationship counterpart of _filter_unchanged: stored hashes are
+        fetched in bulk (HASH_LOOKUP_CHUNK pairs per query). Relationships
+        written before content hashing existed have no hash and are rewritten.
+        """
+        if not self.skip_unchanged or not rows:
+            return rows
+
+        from_id_prop = self._get_id_property(from_type)
+        to_id_prop = self._get_id_property(to_type)
+        query = f"""
+        UNWIND $keys AS key
+        MATCH (from:{from_type} {{{from_id_prop}: key[0]}})-[r:{rel_type}]->(to:{to_type} {{{to_id_prop}: key[1]}})
+        RETURN key[0] AS from_id, key[1] AS to_id, r.content_hash AS content_hash
+        """
+
+        stored = {}
+        with self.driver.session() as session:
+            for i in range(0, len(rows), HASH_LOOKUP_CHUNK):
+                keys = [[row["from_id"], row["to_id"]] for row in rows[i:i + HASH_LOOKUP_CHUNK]]
+                for record in session.run(query, keys=keys):
+                    stored[(record["from_id"], record["to_id"])] = record["content_hash"]
+
+        changed = [
+            row for row in rows
+            if stored.get((row["from_id"], row["to_id"])) != row["properties"]["content_hash"]
+        ]
+        unchanged = len(rows) - len(changed)
+        if unchanged:
+            self.stats["relationships_unchanged"] += unchanged
+            print(f"   ⏭️  Skipping {unchanged} unchanged {from_type} -{rel_type}-> {to_type} "
+                  f"relationships (content_hash match)")
+        return changed
+
+    def _write_relationship_chunk(self, write: Callable[[List[Dict]], int], rows: List[Dict]) -> int:
+        """
+        Write one chunk of relationships with `write`, bisecting on failure.
+
+        A failed chunk is split in half and each half retried, so a single bad
+        row only costs O(log n) extra statements and is reported on its own in
+        stats["errors"] while the rest of the chunk is still written.
+
+        Returns:
+            Number of relationships created or matched
+        """
+        try:
+            count = write([{k: row[k] for k in ("from_id", "to_id", "properties", "metadata")} for row in rows])
+            self._journal_chunk("relationships", [row["index"] for row in rows], count)
+            return count
+        except Exception as e:
+            if self.batch_sizer:
+                # Shrinks later chunks on timeouts/memory errors; the halves below are the retry
+                self.batch_sizer.record_failure("relationships", len(rows), e)
+            if len(rows) == 1:
+                self._record_error(f"Failed to create relationship {rows[0]['source']}: {e}")
+                return 0
+
+            self.metrics.count("retries", 2)
+            mid = len(rows) // 2
+            return (
+                self._write_relationship_chunk(write, rows[:mid]) +
+                self._write_relationship_chunk(write, rows[mid:])
+            )
+
     def _get_id_property(self, node_type: str) -> str:
         """Get the canonical ID property for a node type."""
         id_map = {
@@ -1203,31 +2056,133 @@ class BatchImporter:
         }
         return id_map.get(node_type, "id")
 
-    def _create_agent_relationships(self, session, node_label: str, nodes: List[Dict]):
-        """Create CREATED_BY relationships from nodes to Agent."""
-        if self.dry_run:
-            return
-
-        # Ensure Agent node exists
-        query_agent = """
-        MERGE (a:Agent {name: $agent_name})
-        ON CREATE SET a.created_at = datetime()
+    def import_stream(
+        self,
+        input_path: Path,
+        sections: List[str],
+        chunk_size: int = 1000,
+        check_duplicates: bool = True,
+        validate_wikidata: bool = True
+    ) -> bool:
         """
-        session.run(query_agent, agent_name=self.agent_name)
+        Import a batch file section by section with bounded memory.
 
-        # Create relationships
-        id_prop = self._get_id_property(node_label)
+        Each section is parsed incrementally and processed in chunks of
+        `chunk_size` records: schema validation -> duplicate detection ->
+        Wikidata validation -> write. Only duplicate summaries and counters
+        outlive a chunk, so memory stays flat regardless of file size.
 
-        query = f"""
-        UNWIND $node_ids AS node_id
-        MATCH (n:{node_label} {{{id_prop}: node_id}})
-        MATCH (a:Agent {{name: $agent_name}})
-        MERGE (n)-[r:CREATED_BY]->(a)
-        ON CREATE SET r.timestamp = datetime(), r.batch_id = $batch_id
+        Unlike whole-file mode, records that fail schema validation are
+        reported in stats["errors"] and skipped instead of aborting the run,
+        and invalid Q-IDs are reported without an interactive prompt.
+
+        With --staging, chunks are only staged; duplicates are resolved and
+        nodes promoted once, before the relationships section.
+
+        Args:
+            input_path: Path to batch JSON file
+            sections: Top-level arrays to import (subset of STREAM_SECTIONS)
+            chunk_size: Records per validate/dedupe/write cycle
+            check_duplicates: Run duplicate detection on each chunk
+            validate_wikidata: Validate Q-IDs of figures and works on each chunk
+
+        Returns:
+            False if the metadata section is invalid, True otherwise
         """
+        if not IJSON_AVAILABLE:
+            raise BatchImportError("Streaming mode requires ijson (pip install ijson)")
+
+        metadata = read_batch_metadata(input_path)
+        metadata_errors = self._validate_metadata_schema(metadata)
+        if metadata_errors:
+            print("❌ JSON schema validation failed:")
+            for error in metadata_errors:
+                print(f"   - {error}")
+            return False
+
+        handlers = {
+            "figures": (self.detect_duplicate_figures, self.import_figures),
+            "works": (self.detect_duplicate_works, self.import_works),
+            "events": (self.detect_duplicate_events, self.import_events),
+            "sources": (self.detect_duplicate_sources, self.import_sources),
+        }
+
+        for section in sections:
+            if section == "relationships":
+                # Relationships MATCH live nodes, so staged nodes must be promoted first
+                self.finish_staging(check_duplicates)
+
+            print(f"\n📋 Streaming '{section}' in chunks of {chunk_size}...")
+
+            chunks = self._iter_stream_chunks(input_path, section, chunk_size)
+            while True:
+                # Parsing and schema validation happen while pulling the next chunk
+                with self.metrics.phase("parse_and_schema_validation") as entry:
+                    item = next(chunks, None)
+                    if item is not None:
+                        entry["records"] += len(item[1])
+                if item is None:
+                    break
+
+                indices, chunk = item
+                if section == "relationships":
+                    with self.metrics.phase("relationship_writes", records=len(chunk)):
+                        self.import_relationships(chunk, indices)
+                    continue
+
+                detect, write = handlers[section]
+                if check_duplicates and not self.staging:
+                    with self.metrics.phase("duplicate_detection", records=len(chunk)):
+                        detect(chunk, indices)
+                if validate_wikidata and section in ("figures", "works"):
+                    with self.metrics.phase("wikidata_validation", records=len(chunk)):
+                        self.validate_wikidata_qids(
+                            {section: chunk}, phase=f"wikidata_validation:{section}:{indices[0]}"
+                        )
+                with self.metrics.phase("node_writes", records=len(chunk)):
+                    write(chunk, metadata, indices)
+
+        if "relationships" not in sections:
+            self.finish_staging(check_duplicates)
+
+        return True
 
-        node_ids = [node[id_prop] for node in nodes]
-        session.run(query, node_ids=node_ids, agent_name=self.agent_name, batch_id=self.batch_id)
+    def _iter_stream_chunks(
+        self,
+        input_path: Path,
+        section: str,
+        chunk_size: int
+    ) -> Iterator[Tuple[List[int], List[Dict]]]:
+        """Yield (input_indices, records) chunks of schema-valid records for one section."""
+        validators = {
+            "figures": self._validate_figure_schema,
+            "works": self._validate_work_schema,
+            "events": self._validate_event_schema,
+            "sources": self._validate_source_schema,
+            "relationships": self._validate_relationship_schema,
+        }
+        validate = validators[section]
+
+        indices: List[int] = []
+        chunk: List[Dict] = []
+        for idx, record in enumerate(iter_batch_section(input_path, section)):
+            if not isinstance(record, dict):
+                self.stats["errors"].append(f"{section}[{idx}] must be an object")
+                continue
+
+            record_errors = validate(record, idx)
+            if record_errors:
+                self.stats["errors"].extend(record_errors)
+                continue
+
+            indices.append(idx)
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield indices, chunk
+                indices, chunk = [], []
+
+        if chunk:
+            yield indices, chunk
 
     def generate_report(self, output_path: str):
         """Generate detailed import report."""
@@ -1243,16 +2198,47 @@ class BatchImporter:
             f.write("## Summary\n\n")
             f.write(f"- **Figures Created:** {self.stats['figures_created']}\n")
             f.write(f"- **Figures Skipped (Duplicate):** {self.stats['figures_skipped_duplicate']}\n")
+            f.write(f"- **Figures Skipped (Unchanged):** {self.stats['figures_unchanged']}\n")
             f.write(f"- **Works Created:** {self.stats['works_created']}\n")
             f.write(f"- **Works Skipped (Duplicate):** {self.stats['works_skipped_duplicate']}\n")
+            f.write(f"- **Works Skipped (Unchanged):** {self.stats['works_unchanged']}\n")
             f.write(f"- **Events Created:** {self.stats['events_created']}\n")
             f.write(f"- **Events Skipped (Duplicate):** {self.stats['events_skipped_duplicate']}\n")
+            f.write(f"- **Events Skipped (Unchanged):** {self.stats['events_unchanged']}\n")
             f.write(f"- **Sources Created:** {self.stats['sources_created']}\n")
             f.write(f"- **Sources Skipped (Duplicate):** {self.stats['sources_skipped_duplicate']}\n")
+            f.write(f"- **Sources Skipped (Unchanged):** {self.stats['sources_unchanged']}\n")
             f.write(f"- **Relationships Created:** {self.stats['relationships_created']}\n")
+            f.write(f"- **Relationships Skipped (Unchanged):** {self.stats['relationships_unchanged']}\n")
+            if self.stats['staged']:
+                f.write(f"- **Staged Nodes:** {self.stats['staged']}\n")
+            if self.stats['skipped_already_committed']:
+                f.write(f"- **Skipped (Committed Before Resume):** {self.stats['skipped_already_committed']}\n")
             f.write(f"- **Errors:** {len(self.stats['errors'])}\n")
             f.write(f"- **Warnings:** {len(self.stats['warnings'])}\n\n")
 
+            # Phase metrics
+            metrics_path = self.write_metrics(output_path)
+            f.write("## Phase Metrics\n\n")
+            rows = self.metrics.table_rows()
+            f.write("| " + " | ".join(rows[0]) + " |\n")
+            f.write("|" + "---|" * len(rows[0]) + "\n")
+            for row in rows[1:]:
+                f.write("| " + " | ".join(row) + " |\n")
+            f.write(f"\nMachine-readable metrics: `{metrics_path}`\n\n")
+
+            # Adaptive batch sizes
+            if self.batch_sizer:
+                f.write("## Adaptive Batch Sizes\n\n")
+                f.write("| Entity | Final Size | Size History | Chunks | Mean Latency (s) | Rows/s | Resource Errors |\n")
+                f.write("|---|---|---|---|---|---|---|\n")
+                for entity, sizing in self.batch_sizer.summary().items():
+                    history = " → ".join(str(size) for size in sizing["size_history"])
+                    f.write(f"| {entity} | {sizing['final_size']} | {history} | {sizing['chunks']} | "
+                            f"{sizing['mean_latency_s']:.3f} | {sizing['rows_per_second']:.1f} | "
+                            f"{sizing['resource_errors']} |\n")
+                f.write("\n")
+
             # Duplicate figures
             if self.duplicate_figures:
                 f.write("## Duplicate Figures Detected\n\n")
@@ -1302,6 +2288,30 @@ class BatchImporter:
 
         print(f"✅ Report saved to: {output_path}")
 
+    def write_metrics(self, report_path: str) -> str:
+        """
+        Write phase metrics as JSON next to the report (<report>.metrics.json).
+
+        Returns:
+            Path of the JSON file
+        """
+        metrics_path = str(Path(report_path).with_suffix(".metrics.json"))
+        self.metrics.write_json(metrics_path, extra={
+            "batch_id": self.batch_id,
+            "generated_at": datetime.now().isoformat(),
+            "mode": "dry_run" if self.dry_run else "execute",
+            "batch_size": self.batch_size,
+            "workers": self.writer.workers if self.writer else 1,
+            "batch_sizes": self.batch_sizer.summary() if self.batch_sizer else None,
+            "wikidata_cache": get_cache().stats(),
+            "wikidata_rate_limit": get_limiter().stats(),
+            "counts": {
+                key: len(value) if isinstance(value, list) else value
+                for key, value in self.stats.items()
+            }
+        })
+        return metrics_path
+
     def print_summary(self):
         """Print import summary to console."""
         print("\n" + "=" * 80)
@@ -1311,13 +2321,22 @@ class BatchImporter:
         print(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE EXECUTION'}")
         print(f"\nFigures Created: {self.stats['figures_created']}")
         print(f"Figures Skipped (Duplicate): {self.stats['figures_skipped_duplicate']}")
+        print(f"Figures Skipped (Unchanged): {self.stats['figures_unchanged']}")
         print(f"Works Created: {self.stats['works_created']}")
         print(f"Works Skipped (Duplicate): {self.stats['works_skipped_duplicate']}")
+        print(f"Works Skipped (Unchanged): {self.stats['works_unchanged']}")
         print(f"Events Created: {self.stats['events_created']}")
         print(f"Events Skipped (Duplicate): {self.stats['events_skipped_duplicate']}")
+        print(f"Events Skipped (Unchanged): {self.stats['events_unchanged']}")
         print(f"Sources Created: {self.stats['sources_created']}")
         print(f"Sources Skipped (Duplicate): {self.stats['sources_skipped_duplicate']}")
+        print(f"Sources Skipped (Unchanged): {self.stats['sources_unchanged']}")
         print(f"Relationships Created: {self.stats['relationships_created']}")
+        print(f"Relationships Skipped (Unchanged): {self.stats['relationships_unchanged']}")
+        if self.stats['staged']:
+            print(f"Staged Nodes: {self.stats['staged']}")
+        if self.stats['skipped_already_committed']:
+            print(f"Skipped (Committed Before Resume): {self.stats['skipped_already_committed']}")
 
         if self.stats['errors']:
             print(f"\n❌ Errors: {len(self.stats['errors'])}")
@@ -1333,9 +2352,273 @@ class BatchImporter:
             if len(self.stats['warnings']) > 5:
                 print(f"   ... and {len(self.stats['warnings']) - 5} more")
 
+        if self.metrics.phases:
+            print("\n⏱️  Phase Metrics:")
+            rows = self.metrics.table_rows()
+            widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+            for row in rows:
+                print("   " + "  ".join(
+                    cell.ljust(width) if i == 0 else cell.rjust(width)
+                    for i, (cell, width) in enumerate(zip(row, widths))
+                ))
+            totals = self.metrics.summary()["totals"]
+            print(f"   Total: {totals['wall_time_s']:.2f}s, {totals['bolt_round_trips']} Bolt round trips, "
+                  f"{totals['http_calls']} HTTP calls, {totals['retries']} retries")
+            print(f"   {get_cache().summary_line()}")
+            print(f"   {get_limiter().summary_line()}")
+
+        if self.batch_sizer:
+            print("\n📏 Adaptive Batch Sizes:")
+            for entity, sizing in self.batch_sizer.summary().items():
+                print(f"   {entity}: final {sizing['final_size']} "
+                      f"(history {sizing['size_history']}), {sizing['chunks']} chunks, "
+                      f"mean {sizing['mean_latency_s']:.3f}s, {sizing['rows_per_second']:.1f} rows/s, "
+                      f"{sizing['resource_errors']} resource errors")
+
         print("=" * 80)
 
 
+def detect_batch_duplicates(importer: BatchImporter, data: Dict, args: argparse.Namespace):
+    """Run duplicate detection for every section the CLI flags select."""
+    if args.skip_duplicate_check or importer.staging:
+        return
+
+    with importer.metrics.phase("duplicate_detection") as entry:
+        if "figures" in data and not args.works_only:
+            importer.detect_duplicate_figures(data["figures"])
+            entry["records"] += len(data["figures"])
+        if "works" in data and not args.figures_only:
+            importer.detect_duplicate_works(data["works"])
+            entry["records"] += len(data["works"])
+        if "events" in data:
+            importer.detect_duplicate_events(data["events"])
+            entry["records"] += len(data["events"])
+        if "sources" in data:
+            importer.detect_duplicate_sources(data["sources"])
+            entry["records"] += len(data["sources"])
+
+
+def validate_batch_wikidata(importer: BatchImporter, data: Dict):
+    """Validate the Q-IDs of a loaded batch, timed as the wikidata_validation phase."""
+    qid_records = len(data.get("figures", [])) + len(data.get("works", []))
+    with importer.metrics.phase("wikidata_validation", records=qid_records):
+        importer.validate_wikidata_qids(data)
+
+
+def write_batch_data(importer: BatchImporter, data: Dict, args: argparse.Namespace):
+    """Write nodes, promote staging, write relationships and wait for concurrent writes."""
+    metadata = data.get("metadata", {})
+
+    with importer.metrics.phase("node_writes") as entry:
+        if "figures" in data and not args.works_only:
+            importer.import_figures(data["figures"], metadata)
+            entry["records"] += len(data["figures"])
+
+        if "works" in data and not args.figures_only:
+            importer.import_works(data["works"], metadata)
+            entry["records"] += len(data["works"])
+
+        if "events" in data:
+            importer.import_events(data["events"], metadata)
+            entry["records"] += len(data["events"])
+
+        if "sources" in data:
+            importer.import_sources(data["sources"], metadata)
+            entry["records"] += len(data["sources"])
+
+    # Relationships MATCH live nodes, so staged nodes are promoted first
+    importer.finish_staging(check_duplicates=not args.skip_duplicate_check)
+
+    if "relationships" in data and not args.figures_only and not args.works_only:
+        with importer.metrics.phase("relationship_writes", records=len(data["relationships"])):
+            importer.import_relationships(data["relationships"])
+
+    # Wait for concurrent partition writes (--workers)
+    importer.flush_writes()
+    if importer.journal:
+        importer.journal.set_status("completed")
+
+
+def resolve_input_files(pattern: str) -> List[Path]:
+    """
+    Expand a batch file, a directory (its *.json files) or a glob pattern.
+
+    Metrics files written next to import reports (*.metrics.json) are ignored.
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        matches = path.glob("*.json")
+    elif any(char in pattern for char in "*?["):
+        matches = (Path(match) for match in glob.glob(pattern))
+    else:
+        return [path]
+    return sorted(match for match in matches if not match.name.endswith(".metrics.json"))
+
+
+def batch_file_has_nodes(path: Path) -> bool:
+    """True if the file has at least one figure, work, event or source record."""
+    try:
+        if IJSON_AVAILABLE:
+            item_prefixes = {f"{section}.item" for section in NODE_SECTIONS}
+            with open(path, "rb") as f:
+                # Stops at the first node record; only relationship-only files are read to the end
+                return any(prefix in item_prefixes for prefix, _, _ in ijson.parse(f))
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return isinstance(data, dict) and any(data.get(section) for section in NODE_SECTIONS)
+    except Exception:
+        # Unreadable files are ordered with node files and reported when loaded
+        return True
+
+
+def order_batch_files(files: List[Path]) -> List[Path]:
+    """Node files first (in name order), then relationship-only files, which MATCH those nodes."""
+    node_files = [path for path in files if batch_file_has_nodes(path)]
+    relationship_files = [path for path in files if path not in node_files]
+    return node_files + relationship_files
+
+
+def load_and_validate_batch_file(
+    importer: BatchImporter,
+    path: Path,
+    validate_wikidata: bool
+) -> Optional[Dict]:
+    """
+    Load a batch file and run the checks that do not touch the database.
+
+    In directory mode this runs in the prefetch thread for the next file while
+    the current one is writing: JSON parsing, schema validation and Q-ID
+    validation. Returns None (with stats["errors"] filled) if the file is unusable.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        importer.stats["errors"].append(f"Could not read {path}: {e}")
+        return None
+
+    total_records = sum(len(data.get(section) or []) for section in STREAM_SECTIONS) if isinstance(data, dict) else 0
+    with importer.metrics.phase("schema_validation", records=total_records):
+        is_valid, errors = importer.validate_json_schema(data)
+    if not is_valid:
+        importer.stats["errors"].extend(errors)
+        return None
+
+    if validate_wikidata:
+        validate_batch_wikidata(importer, data)
+    return data
+
+
+def run_directory(args: argparse.Namespace, files: List[Path], uri: str, user: str, pwd: str, dry_run: bool):
+    """
+    Import many batch files with one driver, pipelining validation and writes.
+
+    Files are ordered so relationship-only files come last. While file N is
+    deduplicated and written on the main thread, file N+1 is parsed and
+    validated (schema + Wikidata) on a prefetch thread. All files share the
+    Neo4j driver, the Q-ID validation cache and the adaptive batch sizer, and
+    schema constraints are applied once. Each file gets its own batch_id and
+    report; a file that fails validation is skipped, not fatal.
+
+    HTTP calls made by the prefetch thread also show up in the phase metrics
+    of the file being written at the time, since the HTTP counter is global.
+    """
+    driver = connect(uri, user, pwd)
+    qid_cache: Dict = {}
+    batch_sizer = AdaptiveBatchSizer(
+        args.batch_size, max_size=args.max_batch_size, target_latency=args.target_latency
+    ) if args.adaptive_batch else None
+    journal_path = Path(args.journal) if args.journal else Path(args.report).parent / "batch_import_journal.sqlite"
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report_base = Path(args.report)
+
+    def prepare(path: Path) -> Tuple[BatchImporter, Optional[Dict]]:
+        importer = BatchImporter(
+            uri=uri,
+            user=user,
+            pwd=pwd,
+            dry_run=dry_run,
+            batch_size=args.batch_size,
+            agent_name=args.agent,
+            bulk_duplicate_check=not args.per_record_duplicate_check,
+            workers=args.workers,
+            skip_unchanged=not args.rewrite_unchanged,
+            staging=args.staging,
+            batch_sizer=batch_sizer,
+            driver=driver,
+            qid_cache=qid_cache,
+            batch_id=f"batch_import_{run_stamp}_{path.stem}",
+            journal_path=journal_path
+        )
+        print(f"\n🔎 Validating {path.name} (prefetch)...")
+        return importer, load_and_validate_batch_file(importer, path, not args.skip_wikidata_validation)
+
+    results = []
+    schema_ready = False
+    prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-prefetch")
+    try:
+        upcoming = prefetch.submit(prepare, files[0])
+        for position, path in enumerate(files):
+            importer, data = upcoming.result()
+            if position + 1 < len(files):
+                upcoming = prefetch.submit(prepare, files[position + 1])
+
+            print("\n" + "=" * 80)
+            print(f"📁 [{position + 1}/{len(files)}] {path}")
+            print("=" * 80)
+
+            status = "imported"
+            try:
+                if data is None:
+                    status = "skipped (invalid file)"
+                    for error in importer.stats["errors"][:5]:
+                        print(f"   - {error}")
+                    continue
+
+                if importer.invalid_qids and not dry_run:
+                    # Directory mode is non-interactive: files with invalid Q-IDs are not written
+                    status = "skipped (invalid Q-IDs)"
+                    print(f"⚠️  Skipping {path.name}: {len(importer.invalid_qids)} invalid Q-IDs")
+                    continue
+
+                if importer.journal:
+                    importer.journal.start_run(path)
+
+                if not schema_ready:
+                    with importer.metrics.phase("schema_setup"):
+                        importer.setup_schema()
+                    schema_ready = True
+
+                detect_batch_duplicates(importer, data, args)
+                write_batch_data(importer, data, args)
+
+                importer.generate_report(str(report_base.with_name(f"{report_base.stem}_{path.stem}.md")))
+                importer.print_summary()
+            except Exception as e:
+                status = f"failed ({e})"
+                print(f"\n❌ Error importing {path}: {e}")
+                if importer.journal:
+                    importer.journal.set_status("failed")
+            finally:
+                results.append((path, status, importer.stats))
+                importer.close()
+    finally:
+        prefetch.shutdown(wait=True)
+        driver.close()
+
+    print("\n" + "=" * 80)
+    print(f"DIRECTORY IMPORT SUMMARY ({len(files)} files, {len(qid_cache)} cached Wikidata lookups)")
+    print("=" * 80)
+    for path, status, stats in results:
+        print(f"{path.name}: {status} — figures {stats['figures_created']}, works {stats['works_created']}, "
+              f"events {stats['events_created']}, sources {stats['sources_created']}, "
+              f"relationships {stats['relationships_created']}, errors {len(stats['errors'])}")
+
+    if any(status.startswith("failed") for _, status, _ in results):
+        sys.exit(1)
+
+
 def main():
     """Main entry point for batch import CLI."""
     parser = argparse.ArgumentParser(
@@ -1354,12 +2637,26 @@ Examples:
 
   # Custom batch size and agent name
   python batch_import.py data/batch.json --execute --batch-size 100 --agent batch-import-v2
+
+  # Every batch file in a directory (relationship-only files run last)
+  python batch_import.py data/batches/ --execute
+  python batch_import.py "data/batches/*.json" --execute
+
+  # Bulk-load under :Staging, then promote server-side
+  python batch_import.py data/batch.json --execute --staging
+
+  # Remove staging nodes left by an abandoned --staging import
+  python batch_import.py --execute --cleanup-staging batch_import_20260115_093000
+
+  # Resume a failed live import
+  python batch_import.py data/batch.json --execute --resume batch_import_20260115_093000
         """
     )
 
     parser.add_argument(
         "input_file",
-        help="Path to JSON file containing batch data"
+        nargs="?",
+        help="Batch JSON file, or a directory / glob pattern of batch files (directory mode)"
     )
     parser.add_argument(
         "--dry-run",
@@ -1378,6 +2675,23 @@ Examples:
         default=50,
         help="Number of records per transaction (default: 50)"
     )
+    parser.add_argument(
+        "--adaptive-batch",
+        action="store_true",
+        help="Adapt chunk size per entity type: grow under --target-latency, shrink on timeouts/memory errors"
+    )
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        default=2.0,
+        help="Commit latency in seconds that --adaptive-batch aims for (default: 2.0)"
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=5000,
+        help="Upper bound for --adaptive-batch chunk sizes (default: 5000)"
+    )
     parser.add_argument(
         "--agent",
         default="batch-importer",
@@ -1408,18 +2722,68 @@ Examples:
         action="store_true",
         help="Skip duplicate detection (faster but risky)"
     )
+    parser.add_argument(
+        "--per-record-duplicate-check",
+        action="store_true",
+        help="Run duplicate detection with one query per record instead of set-based queries"
+    )
     parser.add_argument(
         "--skip-wikidata-validation",
         action="store_true",
         help="Skip Wikidata Q-ID validation (faster but not recommended)"
     )
+    parser.add_argument(
+        "--rewrite-unchanged",
+        action="store_true",
+        help="Rewrite records even when their content_hash matches the stored node or relationship"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent writer partitions; nodes are hash-partitioned by ID (default: 1)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the file incrementally and import in bounded-memory chunks (requires ijson)"
+    )
+    parser.add_argument(
+        "--stream-chunk-size",
+        type=int,
+        default=1000,
+        help="Records per validate/dedupe/write cycle in --stream mode (default: 1000)"
+    )
+    parser.add_argument(
+        "--staging",
+        action="store_true",
+        help="Bulk-load nodes under :Staging, dedupe with set-based joins, then promote in one transaction"
+    )
+    parser.add_argument(
+        "--cleanup-staging",
+        metavar="BATCH_ID",
+        help="Delete :Staging nodes of an abandoned import ('all' for every batch) and exit"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="BATCH_ID",
+        help="Resume a failed live import, skipping chunks the journal marks as committed"
+    )
+    parser.add_argument(
+        "--journal",
+        help="Run journal file for live imports (default: batch_import_journal.sqlite next to the report)"
+    )
     parser.add_argument(
         "--report",
         default="batch_import_report.md",
         help="Path for import report (default: batch_import_report.md)"
     )
+    add_cache_arguments(parser)
+    add_offline_index_arguments(parser)
 
     args = parser.parse_args()
+    configure_from_args(args)
+    configure_offline_index_from_args(args)
 
     # Load environment
     load_dotenv()
@@ -1432,25 +2796,85 @@ Examples:
         print("❌ Error: NEO4J_URI and NEO4J_PASSWORD must be set in .env")
         sys.exit(1)
 
+    if args.cleanup_staging:
+        if not args.execute:
+            print("❌ Error: --cleanup-staging requires --execute")
+            sys.exit(1)
+        importer = BatchImporter(uri=uri, user=user, pwd=pwd, dry_run=False, staging=True)
+        try:
+            all_batches = args.cleanup_staging == "all"
+            deleted = importer.staging.cleanup(
+                batch_id=None if all_batches else args.cleanup_staging,
+                all_batches=all_batches
+            )
+            print(f"🧹 Removed {deleted} staging nodes")
+        finally:
+            importer.close()
+        return
+
+    if not args.input_file:
+        parser.error("input_file is required")
+
+    # Directory / glob mode
+    files = resolve_input_files(args.input_file)
+    if Path(args.input_file).is_dir() or len(files) != 1 or files[0] != Path(args.input_file):
+        if not files:
+            print(f"❌ Error: No batch files match: {args.input_file}")
+            sys.exit(1)
+        if args.stream or args.resume:
+            print("❌ Error: --stream and --resume take a single input file")
+            sys.exit(1)
+
+        dry_run = not args.execute
+        files = order_batch_files(files)
+        print("=" * 80)
+        print("Fictotum Batch Import Tool (CHR-40) - Directory Mode")
+        print("=" * 80)
+        print(f"Input: {len(files)} files from {args.input_file}")
+        for path in files:
+            print(f"   - {path.name}")
+        print(f"Mode: {'DRY RUN (preview only)' if dry_run else 'LIVE EXECUTION'}")
+        print("=" * 80)
+
+        if not dry_run:
+            print("\n⚠️  WARNING: This will modify the database!")
+            response = input("Type 'CONFIRM' to proceed: ")
+            if response != "CONFIRM":
+                print("❌ Aborted.")
+                sys.exit(0)
+
+        run_directory(args, files, uri, user, pwd, dry_run)
+        return
+
     # Load JSON file
     input_path = Path(args.input_file)
     if not input_path.exists():
         print(f"❌ Error: File not found: {input_path}")
         sys.exit(1)
 
-    try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: Invalid JSON in '{input_path}': {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ Error reading file: {e}")
+    if args.stream and not IJSON_AVAILABLE:
+        print("❌ Error: --stream requires ijson (pip install ijson)")
         sys.exit(1)
 
+    data = None
+    if not args.stream:
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"❌ Error: Invalid JSON in '{input_path}': {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Error reading file: {e}")
+            sys.exit(1)
+
     # Determine mode
     dry_run = not args.execute
 
+    if args.resume and dry_run:
+        print("❌ Error: --resume requires --execute")
+        sys.exit(1)
+
     # Print header
     print("=" * 80)
     print("Fictotum Batch Import Tool (CHR-40)")
@@ -1458,7 +2882,12 @@ Examples:
     print(f"Input file: {input_path}")
     print(f"Mode: {'DRY RUN (preview only)' if dry_run else 'LIVE EXECUTION'}")
     print(f"Agent: {args.agent}")
-    print(f"Batch size: {args.batch_size}")
+    print(f"Batch size: {args.batch_size}" + (" (adaptive)" if args.adaptive_batch else ""))
+    print(f"Workers: {args.workers}")
+    if args.staging:
+        print("Staging: load under :Staging, promote server-side")
+    if args.resume:
+        print(f"Resuming batch: {args.resume}")
     print("=" * 80)
 
     if not dry_run:
@@ -1475,13 +2904,64 @@ Examples:
         pwd=pwd,
         dry_run=dry_run,
         batch_size=args.batch_size,
-        agent_name=args.agent
+        agent_name=args.agent,
+        bulk_duplicate_check=not args.per_record_duplicate_check,
+        workers=args.workers,
+        skip_unchanged=not args.rewrite_unchanged,
+        staging=args.staging,
+        batch_sizer=AdaptiveBatchSizer(
+            args.batch_size,
+            max_size=args.max_batch_size,
+            target_latency=args.target_latency
+        ) if args.adaptive_batch else None,
+        batch_id=args.resume,
+        journal_path=Path(args.journal) if args.journal else Path(args.report).parent / "batch_import_journal.sqlite"
     )
 
     try:
+        if importer.journal:
+            try:
+                if args.resume:
+                    importer.journal.resume_run(input_path)
+                else:
+                    importer.journal.start_run(input_path)
+            except ImportJournalError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+
+        if args.stream:
+            sections = [
+                section for section in STREAM_SECTIONS
+                if not (section == "figures" and args.works_only)
+                and not (section == "works" and args.figures_only)
+                and not (section == "relationships" and (args.figures_only or args.works_only))
+            ]
+
+            print("\n📋 Setting up database schema...")
+            with importer.metrics.phase("schema_setup"):
+                importer.setup_schema()
+
+            if not importer.import_stream(
+                input_path,
+                sections,
+                chunk_size=args.stream_chunk_size,
+                check_duplicates=not args.skip_duplicate_check,
+                validate_wikidata=not args.skip_wikidata_validation
+            ):
+                sys.exit(1)
+
+            importer.flush_writes()
+            if importer.journal:
+                importer.journal.set_status("completed")
+            importer.generate_report(str(Path(args.report)))
+            importer.print_summary()
+            return
+
         # Step 1: Validate JSON schema
         print("\n📋 Step 1: Validating JSON schema...")
-        is_valid, errors = importer.validate_json_schema(data)
+        total_records = sum(len(data.get(section) or []) for section in STREAM_SECTIONS)
+        with importer.metrics.phase("schema_validation", records=total_records):
+            is_valid, errors = importer.validate_json_schema(data)
         if not is_valid:
             print("❌ JSON schema validation failed:")
             for error in errors:
@@ -1491,23 +2971,16 @@ Examples:
 
         # Step 2: Setup schema
         print("\n📋 Step 2: Setting up database schema...")
-        importer.setup_schema()
-
-        # Step 3: Duplicate detection
-        if not args.skip_duplicate_check:
-            if "figures" in data and not args.works_only:
-                importer.detect_duplicate_figures(data["figures"])
-            if "works" in data and not args.figures_only:
-                importer.detect_duplicate_works(data["works"])
-            if "events" in data:
-                importer.detect_duplicate_events(data["events"])
-            if "sources" in data:
-                importer.detect_duplicate_sources(data["sources"])
+        with importer.metrics.phase("schema_setup"):
+            importer.setup_schema()
+
+        # Step 3: Duplicate detection (--staging resolves duplicates after loading)
+        detect_batch_duplicates(importer, data, args)
 
         # Step 4: Wikidata validation
         if not args.skip_wikidata_validation:
             print("\n📋 Step 4: Validating Wikidata Q-IDs...")
-            importer.validate_wikidata_qids(data)
+            validate_batch_wikidata(importer, data)
 
             if importer.invalid_qids:
                 print("\n⚠️  WARNING: Found invalid Q-IDs. Continue anyway?")
@@ -1519,23 +2992,7 @@ Examples:
 
         # Step 5: Import data
         print("\n📋 Step 5: Importing data...")
-
-        metadata = data.get("metadata", {})
-
-        if "figures" in data and not args.works_only:
-            importer.import_figures(data["figures"], metadata)
-
-        if "works" in data and not args.figures_only:
-            importer.import_works(data["works"], metadata)
-
-        if "events" in data:
-            importer.import_events(data["events"], metadata)
-
-        if "sources" in data:
-            importer.import_sources(data["sources"], metadata)
-
-        if "relationships" in data and not args.figures_only and not args.works_only:
-            importer.import_relationships(data["relationships"])
+        write_batch_data(importer, data, args)
 
         # Step 6: Generate report
         print("\n📋 Step 6: Generating report...")
@@ -1549,11 +3006,16 @@ Examples:
             print("\n💡 TIP: Run with --execute to perform actual import")
         else:
             print("\n✅ Import completed successfully!")
+            if importer.stats["errors"]:
+                print(f"💡 Retry failed chunks with: --execute --resume {importer.batch_id}")
 
     except Exception as e:
         print(f"\n❌ Error during import: {e}")
         import traceback
         traceback.print_exc()
+        if importer.journal:
+            importer.journal.set_status("failed")
+            print(f"\n💡 Resume with: --execute --resume {importer.batch_id}")
         sys.exit(1)
 
     finally:
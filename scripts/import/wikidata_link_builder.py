@@ -12,22 +12,28 @@ Cross-references against Neo4j and creates relationships for matches.
 Usage:
     python3 scripts/import/wikidata_link_builder.py --dry-run
     python3 scripts/import/wikidata_link_builder.py --execute
+    python3 scripts/import/wikidata_link_builder.py --dry-run --refresh   # re-fetch cached SPARQL
 """
 
 import os
 import sys
 import json
 import argparse
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-import requests
 
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lib.wikidata_cache import add_cache_arguments, configure_from_args
+from lib.rate_limiter import get_limiter
+from lib.sparql_executor import SparqlExecutor
+
 # Blacklist: Q-IDs that exist as HistoricalFigure nodes but produce wrong matches.
 # Actors misclassified as historical figures, fictional characters, or figures
 # whose Wikidata cast data is unreliable.
@@ -51,14 +57,9 @@ EXCLUDE_PAIRS = {
     ("Q207", "Q26824229"),    # George VI → 13th (marginal archival footage)
 }
 
-SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
-SPARQL_HEADERS = {
-    "Accept": "application/sparql-results+json",
-    "User-Agent": "FictotumLinkBuilder/1.0 (https://github.com/fictotum; contact@bigheavy.fun)"
-}
-# Wikidata rate limit: be polite
-SPARQL_DELAY = 1.5  # seconds between requests
-BATCH_SIZE = 80  # Q-IDs per SPARQL VALUES clause
+SPARQL_USER_AGENT = "FictotumLinkBuilder/1.0 (https://github.com/fictotum; contact@bigheavy.fun)"
+# Q-IDs go to Wikidata in adaptively sized VALUES chunks (lib/sparql_executor.py),
+# paced by the shared "sparql" rate-limit bucket (lib/rate_limiter.py)
 
 
 def get_neo4j_driver():
@@ -68,33 +69,6 @@ def get_neo4j_driver():
     return GraphDatabase.driver(uri, auth=(user, password))
 
 
-def sparql_query(query: str, retries: int = 3) -> list:
-    """Execute a SPARQL query against Wikidata with retry logic."""
-    for attempt in range(retries):
-        try:
-            resp = requests.get(
-                SPARQL_ENDPOINT,
-                params={"query": query},
-                headers=SPARQL_HEADERS,
-                timeout=60
-            )
-            if resp.status_code == 429:
-                wait = int(resp.headers.get("Retry-After", 30))
-                print(f"  Rate limited, waiting {wait}s...")
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            return resp.json()["results"]["bindings"]
-        except requests.exceptions.RequestException as e:
-            if attempt < retries - 1:
-                print(f"  SPARQL error (attempt {attempt+1}): {e}")
-                time.sleep(5 * (attempt + 1))
-            else:
-                print(f"  SPARQL failed after {retries} attempts: {e}")
-                return []
-    return []
-
-
 def qid(uri: str) -> str:
     """Extract Q-ID from Wikidata URI."""
     return uri.split("/")[-1]
@@ -167,36 +141,36 @@ def load_all_figure_qids(driver) -> Dict[str, str]:
 # Phase 2: SPARQL queries — Work → People
 # ---------------------------------------------------------------------------
 
-def query_work_cast_and_crew(work_qids: List[str]) -> List[dict]:
-    """Query Wikidata for cast/crew of given works.
-    Returns list of {work_qid, person_qid, person_name, role, actor_name}."""
-    values = " ".join(f"wd:{q}" for q in work_qids)
-    query = f"""
-    SELECT ?work ?person ?personLabel ?role ?actorLabel WHERE {{
-      VALUES ?work {{ {values} }}
-      {{
+WORK_CAST_AND_CREW_QUERY = """
+    SELECT ?work ?person ?personLabel ?role ?actorLabel WHERE {
+      VALUES ?work { {values} }
+      {
         ?work wdt:P161 ?person .
         BIND("cast" AS ?role)
-        OPTIONAL {{ ?work p:P161 ?stmt . ?stmt ps:P161 ?person . ?stmt pq:P453 ?actor . }}
-      }} UNION {{
+        OPTIONAL { ?work p:P161 ?stmt . ?stmt ps:P161 ?person . ?stmt pq:P453 ?actor . }
+      } UNION {
         ?work wdt:P57 ?person .
         BIND("director" AS ?role)
-      }} UNION {{
+      } UNION {
         ?work wdt:P58 ?person .
         BIND("screenwriter" AS ?role)
-      }} UNION {{
+      } UNION {
         ?work wdt:P170 ?person .
         BIND("creator" AS ?role)
-      }} UNION {{
+      } UNION {
         ?work wdt:P86 ?person .
         BIND("composer" AS ?role)
-      }}
-      SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
-    }}
+      }
+      SERVICE wikibase:label { bd:serviceParam wikibase:language "en". }
+    }
     """
-    results = sparql_query(query)
+
+
+def query_work_cast_and_crew(executor: SparqlExecutor, work_qids: List[str]) -> List[dict]:
+    """Query Wikidata for cast/crew of given works.
+    Returns list of {work_qid, person_qid, person_name, role, actor_name}."""
     out = []
-    for r in results:
+    for r in executor.run(WORK_CAST_AND_CREW_QUERY, work_qids):
         out.append({
             "work_qid": qid(r["work"]["value"]),
             "person_qid": qid(r["person"]["value"]),
@@ -211,35 +185,35 @@ def query_work_cast_and_crew(work_qids: List[str]) -> List[dict]:
 # Phase 3: SPARQL queries — Person → Works
 # ---------------------------------------------------------------------------
 
-def query_figure_works(figure_qids: List[str]) -> List[dict]:
-    """Query Wikidata for works a figure appears in or created.
-    Returns list of {person_qid, work_qid, work_name, role}."""
-    values = " ".join(f"wd:{q}" for q in figure_qids)
-    query = f"""
-    SELECT ?person ?work ?workLabel ?role WHERE {{
-      VALUES ?person {{ {values} }}
-      {{
+FIGURE_WORKS_QUERY = """
+    SELECT ?person ?work ?workLabel ?role WHERE {
+      VALUES ?person { {values} }
+      {
         ?person wdt:P1441 ?work .
         BIND("appears_in" AS ?role)
-      }} UNION {{
+      } UNION {
         ?person wdt:P800 ?work .
         BIND("notable_work" AS ?role)
-      }} UNION {{
+      } UNION {
         ?work wdt:P57 ?person .
         BIND("director" AS ?role)
-      }} UNION {{
+      } UNION {
         ?work wdt:P58 ?person .
         BIND("screenwriter" AS ?role)
-      }} UNION {{
+      } UNION {
         ?work wdt:P170 ?person .
         BIND("creator" AS ?role)
-      }}
-      SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
-    }}
+      }
+      SERVICE wikibase:label { bd:serviceParam wikibase:language "en". }
+    }
     """
-    results = sparql_query(query)
+
+
+def query_figure_works(executor: SparqlExecutor, figure_qids: List[str]) -> List[dict]:
+    """Query Wikidata for works a figure appears in or created.
+    Returns list of {person_qid, work_qid, work_name, role}."""
     out = []
-    for r in results:
+    for r in executor.run(FIGURE_WORKS_QUERY, figure_qids):
         out.append({
             "person_qid": qid(r["person"]["value"]),
             "work_qid": qid(r["work"]["value"]),
@@ -391,7 +365,9 @@ def main():
                         help="Limit number of works to query (0=all)")
     parser.add_argument("--report", type=str, default="wikidata_link_report.md",
                         help="Output report filename")
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    cache = configure_from_args(args)
 
     dry_run = not args.execute
 
@@ -421,29 +397,19 @@ def main():
     if args.limit_works:
         work_list = work_list[:args.limit_works]
 
-    work_results = []
-    for i in range(0, len(work_list), BATCH_SIZE):
-        batch = work_list[i:i + BATCH_SIZE]
-        print(f"  Batch {i // BATCH_SIZE + 1}: querying {len(batch)} works...")
-        results = query_work_cast_and_crew(batch)
-        work_results.extend(results)
-        if i + BATCH_SIZE < len(work_list):
-            time.sleep(SPARQL_DELAY)
+    executor = SparqlExecutor(user_agent=SPARQL_USER_AGENT)
+    work_results = query_work_cast_and_crew(executor, work_list)
     print(f"  Total cast/crew records from Wikidata: {len(work_results)}")
     print()
 
     # Step 3: Query Wikidata — Person → Works
     figure_list = list(orphan_qids.keys()) if args.orphans_only else list(all_figure_qids.keys())
     print(f"Step 3: Querying Wikidata for {len(figure_list)} figures' works...")
-    figure_results = []
-    for i in range(0, len(figure_list), BATCH_SIZE):
-        batch = figure_list[i:i + BATCH_SIZE]
-        print(f"  Batch {i // BATCH_SIZE + 1}: querying {len(batch)} figures...")
-        results = query_figure_works(batch)
-        figure_results.extend(results)
-        if i + BATCH_SIZE < len(figure_list):
-            time.sleep(SPARQL_DELAY)
+    figure_results = query_figure_works(executor, figure_list)
     print(f"  Total figure→work records from Wikidata: {len(figure_results)}")
+    print(f"  {executor.summary_line()}")
+    print(f"  {cache.summary_line()}")
+    print(f"  {get_limiter().summary_line()}")
     print()
 
     # Step 4: Cross-reference
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Adaptive Batch Sizing for Import Transactions
+
+Chooses the chunk size of each import write per entity type. A size grows
+while commits stay under a target latency and shrinks when a commit is slow,
+times out or hits a memory limit, so large figure property maps and tiny
+relationship rows each settle at their own effective size.
+
+Used by BatchImporter --adaptive-batch.
+"""
+
+import threading
+from typing import Dict, List
+
+# Substrings of Neo4j error codes/messages that mean "this transaction was too big"
+RESOURCE_ERROR_MARKERS = [
+    "MemoryPoolOutOfMemoryError",
+    "TransactionMemoryLimit",
+    "OutOfMemory",
+    "memory limit",
+    "TransactionTimedOut",
+    "TransactionTimedOutClientConfiguration",
+    "timed out",
+    "timeout",
+]
+
+
+def is_resource_error(error: Exception) -> bool:
+    """True if `error` looks like a timeout or memory-limit failure, which a smaller chunk can fix."""
+    text = f"{type(error).__name__} {getattr(error, 'code', '') or ''} {error}".lower()
+    return any(marker.lower() in text for marker in RESOURCE_ERROR_MARKERS)
+
+
+class AdaptiveBatchSizer:
+    """
+    Per-entity chunk size controller (multiplicative increase/decrease).
+
+    Thread-safe, so concurrent writers can report into the same sizer.
+    """
+
+    def __init__(
+        self,
+        initial_size: int,
+        min_size: int = 1,
+        max_size: int = 5000,
+        target_latency: float = 2.0,
+        growth: float = 1.5,
+        shrink: float = 0.5
+    ):
+        """
+        Args:
+            initial_size: Starting chunk size for every entity type
+            min_size: Smallest chunk size; a resource error at this size is not retried
+            max_size: Largest chunk size
+            target_latency: Commit latency (seconds) under which the size grows
+            growth: Factor applied after a fast commit
+            shrink: Factor applied after a slow commit or resource error
+        """
+        self.initial_size = max(min_size, min(initial_size, max_size))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.growth = growth
+        self.shrink = shrink
+
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        # Largest size known to be safe after a resource error; growth stops there
+        self._ceilings: Dict[str, int] = {}
+        self._stats: Dict[str, Dict] = {}
+
+    def size(self, entity: str) -> int:
+        """Current chunk size for `entity`."""
+        with self._lock:
+            return self._sizes.get(entity, self.initial_size)
+
+    def record_success(self, entity: str, rows: int, latency: float):
+        """Report a committed chunk; grows the size if it was fast, shrinks it if slow."""
+        with self._lock:
+            stats = self._entity_stats(entity)
+            stats["chunks"] += 1
+            stats["rows"] += rows
+            stats["seconds"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+            current = self._sizes.get(entity, self.initial_size)
+            if latency > self.target_latency:
+                new_size = max(self.min_size, int(current * self.shrink))
+            elif rows >= current:
+                # Only grow on full chunks; a short tail chunk says nothing about capacity
+                ceiling = self._ceilings.get(entity, self.max_size)
+                new_size = min(ceiling, max(current + 1, int(current * self.growth)))
+            else:
+                new_size = current
+            self._set_size(entity, new_size, stats)
+
+    def record_failure(self, entity: str, rows: int, error: Exception) -> bool:
+        """
+        Report a failed chunk.
+
+        Returns:
+            True if the error is a timeout/memory failure and the chunk should be
+            retried at the (now smaller) size; False if it should be reported
+        """
+        if not is_resource_error(error):
+            return False
+
+        with self._lock:
+            stats = self._entity_stats(entity)
+            stats["resource_errors"] += 1
+            if rows <= self.min_size:
+                return False
+            self._ceilings[entity] = min(self._ceilings.get(entity, self.max_size), rows - 1)
+            new_size = max(self.min_size, min(rows - 1, int(rows * self.shrink)))
+            self._set_size(entity, new_size, stats)
+            return True
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-entity final size, size history, latency and throughput."""
+        with self._lock:
+            result = {}
+            for entity, stats in self._stats.items():
+                result[entity] = {
+                    "final_size": self._sizes.get(entity, self.initial_size),
+                    "size_history": list(stats["size_history"]),
+                    "chunks": stats["chunks"],
+                    "rows": stats["rows"],
+                    "mean_latency_s": round(stats["seconds"] / stats["chunks"], 3) if stats["chunks"] else 0.0,
+                    "max_latency_s": round(stats["max_latency"], 3),
+                    "rows_per_second": round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0,
+                    "resource_errors": stats["resource_errors"],
+                }
+            return result
+
+    def _entity_stats(self, entity: str) -> Dict:
+        if entity not in self._stats:
+            self._stats[entity] = {
+                "chunks": 0, "rows": 0, "seconds": 0.0, "max_latency": 0.0,
+                "resource_errors": 0, "size_history": [self.initial_size]
+            }
+        return self._stats[entity]
+
+    def _set_size(self, entity: str, new_size: int, stats: Dict):
+        if new_size != self._sizes.get(entity, self.initial_size):
+            history: List[int] = stats["size_history"]
+            history.append(new_size)
+        self._sizes[entity] = new_size
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+In-Memory Graph Snapshot for Pathfinding
+
+Loads the subgraph the pathfinder walks (INTERACTED_WITH and APPEARS_IN
+relationships and the nodes they touch) from Neo4j once, into compressed
+sparse row (CSR) adjacency arrays:
+
+- offsets[i]..offsets[i + 1] is node i's slice of `targets`
+- targets holds neighbour indices (int32), edges holds the relationship
+  index of each entry (every relationship appears once per direction)
+- element_ids / node_ids / labels map indices back to Neo4j nodes
+
+Shortest paths are then answered locally with a bidirectional BFS that
+expands whole frontiers with NumPy, typically well under a millisecond,
+instead of a shortestPath query per request. FictotumPathfinder uses a
+snapshot when one is loaded (see FictotumPathfinder.load_snapshot).
+
+Snapshots can be saved to and loaded from a .npz file:
+
+    python3 scripts/lib/graph_snapshot.py --output .cache/graph_snapshot.npz
+
+Requires numpy.
+"""
+
+import argparse
+import heapq
+import os
+import time
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Relationship types paths may use (as in FictotumPathfinder's Cypher)
+PATH_REL_TYPES = ("INTERACTED_WITH", "APPEARS_IN")
+
+# Longest path searched, matching shortestPath((start)-[*..10]-(end))
+MAX_PATH_DEPTH = 10
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).parent.parent.parent / ".cache" / "graph_snapshot.npz"
+
+NODES_QUERY = """
+    MATCH (n)
+    WHERE EXISTS { (n)-[:INTERACTED_WITH|APPEARS_IN]-() }
+    RETURN elementId(n) AS element_id,
+           labels(n)[0] AS label,
+           coalesce(n.canonical_id, n.media_id, n.char_id) AS node_id
+"""
+
+# Fingerprint of ingested data: newest ingestion_batch, number of batches and
+# of batch-tagged nodes. Changes whenever an import or the web UI adds nodes.
+VERSION_QUERY = """
+    MATCH (n)
+    WHERE n.ingestion_batch IS NOT NULL
+    WITH n.ingestion_batch AS batch, count(n) AS nodes, max(toString(n.created_at)) AS created
+    RETURN batch, nodes
+    ORDER BY coalesce(created, '') DESC, batch DESC
+"""
+
+EDGES_QUERY = """
+    MATCH (a)-[r:INTERACTED_WITH|APPEARS_IN]->(b)
+    RETURN elementId(a) AS source, elementId(b) AS target, type(r) AS rel_type,
+           coalesce(r.context, r.sentiment) AS context
+"""
+
+
+def graph_version(driver) -> str:
+    """
+    Current data version of the graph, as "<latest ingestion_batch>:<batches>:<nodes>".
+
+    Snapshots, landmark indexes and cached paths record the version they
+    were built at and are stale once it changes.
+    """
+    with driver.session() as session:
+        rows = session.run(VERSION_QUERY).data()
+    if not rows:
+        return "none:0:0"
+    return f"{rows[0]['batch']}:{len(rows)}:{sum(row['nodes'] for row in rows)}"
+
+
+class GraphSnapshot:
+    """CSR adjacency of the pathfinding subgraph, with local shortest-path search."""
+
+    def __init__(
+        self,
+        element_ids: List[str],
+        node_ids: List[Optional[str]],
+        labels: List[str],
+        edge_sources,
+        edge_targets,
+        edge_types: List[str],
+        edge_contexts: List[Optional[str]],
+        version: Optional[str] = None
+    ):
+        """
+        Build the CSR arrays from node and relationship lists.
+
+        Args:
+            element_ids: Neo4j elementId per node index
+            node_ids: canonical_id / media_id / char_id per node index
+            labels: First label per node index
+            edge_sources, edge_targets: Node indices of each relationship
+            edge_types: Relationship type per relationship
+            edge_contexts: Relationship context (context or sentiment), or None
+            version: graph_version() when the data was read
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("GraphSnapshot requires numpy (pip install numpy)")
+
+        self.element_ids = list(element_ids)
+        self.node_ids = list(node_ids)
+        self.labels = list(labels)
+        self.edge_types = list(edge_types)
+        self.edge_contexts = list(edge_contexts)
+        self.version = version
+        self.loaded_at = time.time()
+        self._node_costs: Dict[float, List[float]] = {}
+
+        self.edge_sources = sources = np.asarray(edge_sources, dtype=np.int32)
+        self.edge_targets = targets = np.asarray(edge_targets, dtype=np.int32)
+        edge_index = np.arange(len(sources), dtype=np.int32)
+
+        # Undirected: each relationship is an entry in both endpoints' rows
+        rows = np.concatenate([sources, targets])
+        cols = np.concatenate([targets, sources])
+        edges = np.concatenate([edge_index, edge_index])
+        order = np.argsort(rows, kind="stable")
+
+        self.node_count = len(self.element_ids)
+        self.offsets = np.zeros(self.node_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=self.node_count), out=self.offsets[1:])
+        self.targets = cols[order]
+        self.edges = edges[order]
+
+        # Start and end of a path are HistoricalFigures, looked up by canonical_id
+        self.figure_index: Dict[str, int] = {
+            node_id: i for i, (node_id, label) in enumerate(zip(self.node_ids, self.labels))
+            if node_id and label == "HistoricalFigure"
+        }
+
+    @classmethod
+    def load(cls, driver) -> "GraphSnapshot":
+        """Read the pathfinding subgraph from Neo4j."""
+        version = graph_version(driver)
+        with driver.session() as session:
+            nodes = session.run(NODES_QUERY).data()
+            edges = session.run(EDGES_QUERY).data()
+
+        index = {node["element_id"]: i for i, node in enumerate(nodes)}
+        edges = [edge for edge in edges if edge["source"] in index and edge["target"] in index]
+        return cls(
+            element_ids=[node["element_id"] for node in nodes],
+            node_ids=[node["node_id"] for node in nodes],
+            labels=[node["label"] or "Unknown" for node in nodes],
+            edge_sources=[index[edge["source"]] for edge in edges],
+            edge_targets=[index[edge["target"]] for edge in edges],
+            edge_types=[edge["rel_type"] for edge in edges],
+            edge_contexts=[str(edge["context"]) if edge["context"] else None for edge in edges],
+            version=version,
+        )
+
+    def save(self, path: Path = DEFAULT_SNAPSHOT_PATH):
+        """Write the snapshot to a .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            element_ids=np.array(self.element_ids, dtype=object),
+            node_ids=np.array(self.node_ids, dtype=object),
+            labels=np.array(self.labels, dtype=object),
+            edge_sources=self.edge_sources,
+            edge_targets=self.edge_targets,
+            edge_types=np.array(self.edge_types, dtype=object),
+            edge_contexts=np.array(self.edge_contexts, dtype=object),
+            version=np.array(self.version, dtype=object),
+        )
+
+    @classmethod
+    def load_file(cls, path: Path = DEFAULT_SNAPSHOT_PATH) -> "GraphSnapshot":
+        """Read a snapshot written by save()."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("GraphSnapshot requires numpy (pip install numpy)")
+        with np.load(path, allow_pickle=True) as data:
+            snapshot = cls(
+                element_ids=data["element_ids"].tolist(),
+                node_ids=data["node_ids"].tolist(),
+                labels=data["labels"].tolist(),
+                edge_sources=data["edge_sources"],
+                edge_targets=data["edge_targets"],
+                edge_types=data["edge_types"].tolist(),
+                edge_contexts=data["edge_contexts"].tolist(),
+                version=data["version"].item() if "version" in data else None,
+            )
+        snapshot.loaded_at = os.path.getmtime(path)
+        return snapshot
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_types)
+
+    def degree(self, node: int) -> int:
+        return int(self.offsets[node + 1] - self.offsets[node])
+
+    def degrees(self) -> "np.ndarray":
+        return np.diff(self.offsets)
+
+    def distances_from(self, source: int, max_depth: int = 254) -> "np.ndarray":
+        """Hop distance from `source` to every node (BFS), -1 where unreachable."""
+        dist = np.full(self.node_count, -1, dtype=np.int32)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int32)
+        depth = 0
+        while len(frontier) and depth < max_depth:
+            _, neighbours, _ = self.expand(frontier)
+            frontier = np.unique(neighbours[dist[neighbours] == -1])
+            depth += 1
+            dist[frontier] = depth
+        return dist
+
+    def expand(self, frontier: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        All adjacency entries of the frontier nodes, vectorised.
+
+        Returns:
+            (sources, neighbours, edges) arrays, one entry per adjacency
+        """
+        starts = self.offsets[frontier]
+        counts = self.offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty, empty
+        row_starts = np.cumsum(counts) - counts
+        positions = np.arange(total, dtype=np.int64) - np.repeat(row_starts - starts, counts)
+        return np.repeat(frontier, counts), self.targets[positions], self.edges[positions]
+
+    def shortest_path(
+        self,
+        start: int,
+        end: int,
+        max_depth: int = MAX_PATH_DEPTH,
+        excluded_nodes: Collection[int] = (),
+        excluded_edges: Collection[int] = ()
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Bidirectional BFS between two node indices.
+
+        Each step expands the smaller frontier by one whole level; the first
+        level at which the searches meet yields a shortest path.
+
+        Args:
+            start, end: Node indices
+            max_depth: Longest path considered
+            excluded_nodes: Node indices the path may not pass through
+            excluded_edges: Relationship indices the path may not use
+
+        Returns:
+            (node indices, relationship indices) along the path, or None if
+            the nodes are more than `max_depth` hops apart
+        """
+        if start == end:
+            return [start], []
+
+        n = self.node_count
+        dist = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        parent = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        parent_edge = [np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32)]
+        frontier = [np.array([start], dtype=np.int32), np.array([end], dtype=np.int32)]
+        depth = [0, 0]
+        if len(excluded_nodes):
+            banned = np.asarray(list(excluded_nodes), dtype=np.int32)
+            dist[0][banned] = -2
+            dist[1][banned] = -2
+        banned_edges = np.fromiter(excluded_edges, dtype=np.int32) if len(excluded_edges) else None
+        dist[0][start] = 0
+        dist[1][end] = 0
+
+        while len(frontier[0]) and len(frontier[1]) and depth[0] + depth[1] < max_depth:
+            side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+            other = 1 - side
+
+            sources, neighbours, edges = self.expand(frontier[side])
+            fresh = dist[side][neighbours] == -1
+            if banned_edges is not None:
+                fresh &= ~np.isin(edges, banned_edges)
+            sources, neighbours, edges = sources[fresh], neighbours[fresh], edges[fresh]
+            neighbours, first = np.unique(neighbours, return_index=True)
+            sources, edges = sources[first], edges[first]
+
+            depth[side] += 1
+            dist[side][neighbours] = depth[side]
+            parent[side][neighbours] = sources
+            parent_edge[side][neighbours] = edges
+            frontier[side] = neighbours
+
+            met = neighbours[dist[other][neighbours] >= 0]
+            if len(met):
+                meet = int(met[np.argmin(dist[other][met])])
+                return self._join(meet, parent, parent_edge)
+
+        return None
+
+    def paths_from(
+        self,
+        source: int,
+        targets: Collection[int],
+        max_depth: int = MAX_PATH_DEPTH
+    ) -> Dict[int, Optional[Tuple[List[int], List[int]]]]:
+        """
+        Shortest paths from one node to many, with a single BFS.
+
+        The search stops as soon as every target has been reached (or at
+        `max_depth`), so one call replaces len(targets) shortest_path calls.
+
+        Returns:
+            {target: (node indices, relationship indices) or None}
+        """
+        wanted = np.unique(np.fromiter(targets, dtype=np.int32))
+        dist = np.full(self.node_count, -1, dtype=np.int32)
+        parent = np.full(self.node_count, -1, dtype=np.int32)
+        parent_edge = np.full(self.node_count, -1, dtype=np.int32)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int32)
+        depth = 0
+
+        while len(frontier) and depth < max_depth and (dist[wanted] == -1).any():
+            sources, neighbours, edges = self.expand(frontier)
+            fresh = dist[neighbours] == -1
+            neighbours, first = np.unique(neighbours[fresh], return_index=True)
+            depth += 1
+            dist[neighbours] = depth
+            parent[neighbours] = sources[fresh][first]
+            parent_edge[neighbours] = edges[fresh][first]
+            frontier = neighbours
+
+        paths: Dict[int, Optional[Tuple[List[int], List[int]]]] = {}
+        for target in wanted.tolist():
+            if dist[target] == -1:
+                paths[target] = None
+                continue
+            nodes, path_edges = [target], []
+            node = target
+            while node != source:
+                path_edges.append(int(parent_edge[node]))
+                node = int(parent[node])
+                nodes.append(node)
+            nodes.reverse()
+            path_edges.reverse()
+            paths[target] = (nodes, path_edges)
+        return paths
+
+    def hubs(self, max_degree: int, keep: Collection[int] = ()) -> "np.ndarray":
+        """Indices of nodes with more than `max_degree` relationships, except `keep`."""
+        hubs = np.flatnonzero(self.degrees() > max_degree).astype(np.int32)
+        if len(keep):
+            hubs = hubs[~np.isin(hubs, np.asarray(list(keep), dtype=np.int32))]
+        return hubs
+
+    def node_costs(self, hub_penalty: float) -> List[float]:
+        """
+        Cost of stepping onto each node: 1 + hub_penalty * ln(degree).
+
+        A path through a 500-relationship MediaWork costs about 1 + 6.2 *
+        hub_penalty instead of 1, so weighted_path prefers routes through
+        specific interactions and smaller works. Cached per penalty.
+        """
+        cached = self._node_costs.get(hub_penalty)
+        if cached is None:
+            degrees = np.maximum(self.degrees(), 1)
+            cached = (1.0 + hub_penalty * np.log(degrees)).tolist()
+            self._node_costs = {hub_penalty: cached}
+        return cached
+
+    def weighted_path(
+        self,
+        start: int,
+        end: int,
+        hub_penalty: float = 1.0,
+        max_hub_degree: Optional[int] = None,
+        max_depth: int = MAX_PATH_DEPTH
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """
+        Cheapest path under node_costs(hub_penalty) (Dijkstra).
+
+        Args:
+            start, end: Node indices
+            hub_penalty: Weight of the ln(degree) term; 0 gives plain hop counts
+            max_hub_degree: Never pass through nodes with more relationships
+            max_depth: Longest path considered (in hops); routes that
+                would need more are dropped during the search
+
+        Returns:
+            (node indices, relationship indices) along the path, or None
+        """
+        if start == end:
+            return [start], []
+
+        costs = self.node_costs(hub_penalty)
+        blocked = set(self.hubs(max_hub_degree).tolist()) if max_hub_degree is not None else set()
+        offsets, targets, edges = self.offsets, self.targets, self.edges
+        best = {start: 0.0}
+        hops = {start: 0}
+        parent: Dict[int, Tuple[int, int]] = {}
+        heap = [(0.0, start)]
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if node == end:
+                break
+            if cost > best[node] or hops[node] >= max_depth:
+                continue
+            if node != start and node in blocked:
+                continue
+            lo, hi = int(offsets[node]), int(offsets[node + 1])
+            for neighbour, edge in zip(targets[lo:hi].tolist(), edges[lo:hi].tolist()):
+                step = cost + (1.0 if neighbour == end else costs[neighbour])
+                if step < best.get(neighbour, float("inf")):
+                    best[neighbour] = step
+                    hops[neighbour] = hops[node] + 1
+                    parent[neighbour] = (node, edge)
+                    heapq.heappush(heap, (step, neighbour))
+        else:
+            return None
+
+        nodes, path_edges = [end], []
+        node = end
+        while node != start:
+            node, edge = parent[node]
+            nodes.append(node)
+            path_edges.append(edge)
+        nodes.reverse()
+        path_edges.reverse()
+        return nodes, path_edges
+
+    def k_shortest_paths(
+        self,
+        start: int,
+        end: int,
+        k: int,
+        node_disjoint: bool = False,
+        deadline: Optional[float] = None,
+        max_depth: int = MAX_PATH_DEPTH
+    ) -> List[Tuple[List[int], List[int]]]:
+        """
+        Up to `k` loopless paths in order of length (Yen's algorithm).
+
+        With node_disjoint, each path instead avoids every intermediate node
+        (and relationship) of the paths before it, giving fewer but more
+        varied routes.
+
+        Args:
+            start, end: Node indices
+            k: Maximum number of paths
+            node_disjoint: Return node-disjoint paths only
+            deadline: time.perf_counter() value after which the search stops
+                and returns the paths found so far
+            max_depth: Longest path considered
+
+        Returns:
+            (node indices, relationship indices) per path, shortest first
+        """
+        first = self.shortest_path(start, end, max_depth)
+        if first is None or k <= 0:
+            return []
+        paths = [first]
+
+        if node_disjoint:
+            used_nodes, used_edges = set(), set()
+            while len(paths) < k and (deadline is None or time.perf_counter() < deadline):
+                nodes, edges = paths[-1]
+                used_nodes.update(nodes[1:-1])
+                used_edges.update(edges)
+                found = self.shortest_path(start, end, max_depth, used_nodes, used_edges)
+                if found is None:
+                    break
+                paths.append(found)
+            return paths
+
+        candidates: list = []
+        seen = {tuple(first[1])}
+        counter = 0
+        while len(paths) < k:
+            nodes, edges = paths[-1]
+            for i in range(len(edges)):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return paths
+                root_nodes, root_edges = nodes[:i + 1], edges[:i]
+                # Leave the root by a relationship no accepted path with this root used.
+                # Roots are compared by relationship: parallel relationships make
+                # different roots over the same nodes.
+                banned_edges = {
+                    path_edges[i] for path_edges in (path[1] for path in paths)
+                    if len(path_edges) > i and path_edges[:i] == root_edges
+                }
+                spur = self.shortest_path(
+                    root_nodes[-1], end, max_depth - i,
+                    excluded_nodes=root_nodes[:-1], excluded_edges=banned_edges
+                )
+                if spur is None:
+                    continue
+                candidate = (root_nodes + spur[0][1:], root_edges + spur[1])
+                key = tuple(candidate[1])
+                if key not in seen:
+                    seen.add(key)
+                    counter += 1
+                    heapq.heappush(candidates, (len(candidate[1]), counter, candidate))
+            if not candidates:
+                break
+            paths.append(heapq.heappop(candidates)[2])
+        return paths
+
+    @staticmethod
+    def _join(meet: int, parent, parent_edge) -> Tuple[List[int], List[int]]:
+        """Stitch the forward and backward parent chains at `meet`."""
+        nodes, edges = [meet], []
+        node = meet
+        while parent[0][node] != -1:
+            edges.append(int(parent_edge[0][node]))
+            node = int(parent[0][node])
+            nodes.append(node)
+        nodes.reverse()
+        edges.reverse()
+
+        node = meet
+        while parent[1][node] != -1:
+            edges.append(int(parent_edge[1][node]))
+            node = int(parent[1][node])
+            nodes.append(node)
+        return nodes, edges
+
+    def is_stale(self, driver) -> bool:
+        """Whether the graph has changed (new ingestion_batch data) since this snapshot."""
+        return self.version != graph_version(driver)
+
+    def summary_line(self) -> str:
+        return f"Graph snapshot: {self.node_count:,} nodes, {self.edge_count:,} relationships"
+
+
+def main():
+    from dotenv import load_dotenv
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="Build a pathfinding graph snapshot from Neo4j")
+    parser.add_argument("--output", type=Path, default=DEFAULT_SNAPSHOT_PATH,
+                        help=f"Snapshot file (default: {DEFAULT_SNAPSHOT_PATH})")
+    args = parser.parse_args()
+
+    load_dotenv()
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    if uri.startswith("neo4j+s://"):
+        uri = uri.replace("neo4j+s://", "neo4j+ssc://")
+    driver = GraphDatabase.driver(uri, auth=(os.getenv("NEO4J_USERNAME", "neo4j"), os.getenv("NEO4J_PASSWORD")))
+    try:
+        start = time.perf_counter()
+        snapshot = GraphSnapshot.load(driver)
+        snapshot.save(args.output)
+        print(f"✅ {snapshot.summary_line()} → {args.output} ({time.perf_counter() - start:.1f}s)")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Batch Import Run Journal
+
+SQLite-backed journal that lets a failed batch import resume where it stopped.
+Each run is keyed by its batch_id and records:
+
+- phase results (Wikidata validation, duplicate decisions) as JSON payloads
+- every committed write chunk, as the input-file indices it contained
+
+On --resume, the importer restores phase results instead of recomputing them
+and skips every record whose index is already committed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+
+class ImportJournalError(Exception):
+    """Raised when a journal cannot be used for the requested run."""
+    pass
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    batch_id TEXT PRIMARY KEY,
+    input_path TEXT NOT NULL,
+    input_sha256 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS phases (
+    batch_id TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (batch_id, phase)
+);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    indices TEXT NOT NULL,
+    record_count INTEGER NOT NULL,
+    committed_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS chunks_by_entity ON chunks (batch_id, entity);
+"""
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in 1 MB blocks so large batch files are never fully loaded."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ImportJournal:
+    """Run journal for one batch_id. Safe to share between writer threads."""
+
+    def __init__(self, path: Path, batch_id: str):
+        """
+        Args:
+            path: SQLite file (created if missing); one file can hold many runs
+            batch_id: Run key, the importer's batch_id
+        """
+        self.path = Path(path)
+        self.batch_id = batch_id
+        self._lock = threading.Lock()
+        self._committed: Dict[str, Set[int]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def start_run(self, input_path: Path):
+        """Register a new run for `input_path`."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (batch_id, input_path, input_sha256, status, started_at, updated_at) "
+                "VALUES (?, ?, ?, 'running', ?, ?)",
+                (self.batch_id, str(input_path), file_sha256(input_path), now, now)
+            )
+            self._conn.commit()
+
+    def resume_run(self, input_path: Path):
+        """
+        Reopen an existing run, checking that the input file is unchanged.
+
+        Raises:
+            ImportJournalError: If the run is unknown or the file differs
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT input_sha256, status FROM runs WHERE batch_id = ?", (self.batch_id,)
+            ).fetchone()
+        if row is None:
+            raise ImportJournalError(f"No journal entry for batch {self.batch_id} in {self.path}")
+        if row[0] != file_sha256(input_path):
+            raise ImportJournalError(
+                f"{input_path} has changed since batch {self.batch_id} started; cannot resume"
+            )
+        self.set_status("running")
+
+    def set_status(self, status: str):
+        """Update the run status (running, completed, failed)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE batch_id = ?",
+                (status, datetime.now().isoformat(), self.batch_id)
+            )
+            self._conn.commit()
+
+    def record_phase(self, phase: str, payload: Any):
+        """Store the JSON-serialisable result of a completed phase."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO phases (batch_id, phase, payload, completed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.batch_id, phase, json.dumps(payload, default=str), datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def load_phase(self, phase: str) -> Optional[Any]:
+        """Return the stored payload of a phase, or None if it never completed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM phases WHERE batch_id = ? AND phase = ?",
+                (self.batch_id, phase)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record_chunk(self, entity: str, indices: Iterable[int], record_count: int):
+        """Mark the input records at `indices` as committed."""
+        indices = list(indices)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO chunks (batch_id, entity, indices, record_count, committed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.batch_id, entity, json.dumps(indices), record_count, datetime.now().isoformat())
+            )
+            self._conn.commit()
+            if entity in self._committed:
+                self._committed[entity].update(indices)
+
+    def committed_indices(self, entity: str) -> Set[int]:
+        """Input indices of `entity` records committed by this run so far."""
+        with self._lock:
+            if entity not in self._committed:
+                committed: Set[int] = set()
+                for (indices,) in self._conn.execute(
+                    "SELECT indices FROM chunks WHERE batch_id = ? AND entity = ?",
+                    (self.batch_id, entity)
+                ):
+                    committed.update(json.loads(indices))
+                self._committed[entity] = committed
+            return set(self._committed[entity])
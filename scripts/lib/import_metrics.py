@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Batch Import Phase Metrics
+
+Per-phase instrumentation for BatchImporter: wall time, records processed,
+Bolt round trips, HTTP calls and retries, reported as a table and as JSON so
+that import runs can be compared over time.
+
+Bolt round trips are counted by wrapping the Neo4j driver (one per query
+statement sent). HTTP calls are read from counters exposed by the Wikidata
+client. Counts are attributed to whichever phase is active when they happen;
+with --workers, writes that complete while the importer waits for the writer
+pool land in the phase wrapping that wait.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+COUNTERS = ["bolt_round_trips", "http_calls", "retries"]
+
+
+class PhaseMetrics:
+    """Accumulates timing and counters per named phase."""
+
+    def __init__(self, probes: Optional[Dict[str, Callable[[], int]]] = None):
+        """
+        Args:
+            probes: Counter name -> callable returning a cumulative count kept
+                elsewhere (e.g. the Wikidata client's HTTP call counter); the
+                difference across a phase is added to that phase
+        """
+        self.probes = probes or {}
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str, records: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block of work as (part of) phase `name`.
+
+        Re-entering a phase adds to its totals, so per-chunk work in streaming
+        mode accumulates into the same phase.
+        """
+        with self._lock:
+            entry = self._entry(name)
+            entry["records"] += records
+            previous, self._current = self._current, name
+
+        start_probes = {key: probe() for key, probe in self.probes.items()}
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry["wall_time_s"] += elapsed
+                for key, probe in self.probes.items():
+                    entry[key] += probe() - start_probes[key]
+                self._current = previous
+
+    def count(self, counter: str, n: int = 1):
+        """Add `n` to a counter of the active phase (thread-safe)."""
+        with self._lock:
+            self._entry(self._current or "other")[counter] += n
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        if name not in self.phases:
+            self.phases[name] = {"wall_time_s": 0.0, "records": 0, **{c: 0 for c in COUNTERS}}
+        return self.phases[name]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-phase metrics plus totals, with records_per_second derived."""
+        with self._lock:
+            phases = {name: dict(entry) for name, entry in self.phases.items()}
+
+        totals = {"wall_time_s": 0.0, "records": 0, **{c: 0 for c in COUNTERS}}
+        for entry in phases.values():
+            entry["wall_time_s"] = round(entry["wall_time_s"], 3)
+            entry["records_per_second"] = _rate(entry["records"], entry["wall_time_s"])
+            for key in totals:
+                totals[key] += entry[key]
+        totals["wall_time_s"] = round(totals["wall_time_s"], 3)
+
+        return {"phases": phases, "totals": totals}
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """Write the summary (merged with `extra` run details) as JSON."""
+        payload = dict(extra or {})
+        payload.update(self.summary())
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2)
+
+    def table_rows(self) -> List[List[str]]:
+        """Rows for a human-readable table, header first."""
+        rows = [["Phase", "Wall (s)", "Records", "Rec/s", "Bolt", "HTTP", "Retries"]]
+        for name, entry in self.summary()["phases"].items():
+            rows.append([
+                name,
+                f"{entry['wall_time_s']:.2f}",
+                str(entry["records"]),
+                f"{entry['records_per_second']:.1f}" if entry["records_per_second"] else "-",
+                str(entry["bolt_round_trips"]),
+                str(entry["http_calls"]),
+                str(entry["retries"]),
+            ])
+        return rows
+
+
+def _rate(records: int, seconds: float) -> float:
+    return round(records / seconds, 1) if records and seconds > 0 else 0.0
+
+
+class InstrumentedDriver:
+    """Neo4j driver wrapper that counts every statement sent as a Bolt round trip."""
+
+    def __init__(self, driver, metrics: PhaseMetrics):
+        self._driver = driver
+        self._metrics = metrics
+
+    def session(self, **kwargs):
+        return _InstrumentedSession(self._driver.session(**kwargs), self._metrics)
+
+    def close(self):
+        self._driver.close()
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class _InstrumentedSession:
+    def __init__(self, session, metrics: PhaseMetrics):
+        self._session = session
+        self._metrics = metrics
+
+    def __enter__(self):
+        self._session.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._session.__exit__(*exc)
+
+    def run(self, query, *args, **kwargs):
+        self._metrics.count("bolt_round_trips")
+        return self._session.run(query, *args, **kwargs)
+
+    def execute_write(self, work: Callable, *args, **kwargs):
+        """Managed write; every attempt after the first counts as a retry."""
+        attempts = 0
+
+        def counted(tx, *a, **kw):
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self._metrics.count("retries")
+            return work(_InstrumentedTransaction(tx, self._metrics), *a, **kw)
+
+        return self._session.execute_write(counted, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class _InstrumentedTransaction:
+    def __init__(self, tx, metrics: PhaseMetrics):
+        self._tx = tx
+        self._metrics = metrics
+
+    def run(self, query, *args, **kwargs):
+        self._metrics.count("bolt_round_trips")
+        return self._tx.run(query, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._tx, name)
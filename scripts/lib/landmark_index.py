@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Landmark Distance Index for Degrees of Separation
+
+Precomputes BFS hop distances from a few dozen landmark figures (the
+highest-degree HistoricalFigures) to every HistoricalFigure, stored as a
+compact uint8 matrix (figures x landmarks, 255 = unreachable). By the
+triangle inequality, for any pair (a, b) and landmark L:
+
+    |d(L, a) - d(L, b)|  <=  d(a, b)  <=  d(L, a) + d(L, b)
+
+so one row comparison per pair gives lower and upper bounds in O(landmarks).
+When they meet the distance is exact without any search; otherwise
+FictotumPathfinder.find_degrees_of_separation falls back to a BFS bounded by
+the upper bound. Leaderboard and "Bacon number" style features can therefore
+ask for thousands of separations per second.
+
+The index records the graph_version() (latest ingestion_batch) it was
+built from; FictotumPathfinder ignores a stale index until it is rebuilt.
+
+Usage:
+    python3 scripts/lib/landmark_index.py build                  # from Neo4j (or --snapshot file)
+    python3 scripts/lib/landmark_index.py check                  # stale?
+    python3 scripts/lib/landmark_index.py query julius_caesar cleopatra_vii
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from .graph_snapshot import GraphSnapshot, graph_version
+except ImportError:  # imported as a top-level module with scripts/lib on sys.path
+    from graph_snapshot import GraphSnapshot, graph_version
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent.parent / ".cache" / "landmark_index.npz"
+DEFAULT_LANDMARKS = 32
+
+# Stored distance for "not reachable from this landmark"
+UNREACHABLE = 255
+
+
+class LandmarkIndex:
+    """uint8 landmark distances for HistoricalFigures, with O(landmarks) separation bounds."""
+
+    def __init__(
+        self,
+        figure_ids: List[str],
+        landmark_ids: List[str],
+        distances: "np.ndarray",
+        version: Optional[str] = None,
+        built_at: Optional[float] = None
+    ):
+        """
+        Args:
+            figure_ids: canonical_id per row
+            landmark_ids: canonical_id per column
+            distances: uint8 matrix (figures x landmarks)
+            version: graph_version() the index was built from
+            built_at: Build time (epoch seconds)
+        """
+        self.figure_ids = list(figure_ids)
+        self.landmark_ids = list(landmark_ids)
+        self.distances = distances
+        self.version = version
+        self.built_at = built_at or time.time()
+        self.rows: Dict[str, int] = {figure_id: i for i, figure_id in enumerate(self.figure_ids)}
+
+    @classmethod
+    def build(cls, snapshot: GraphSnapshot, landmarks: int = DEFAULT_LANDMARKS) -> "LandmarkIndex":
+        """BFS from the `landmarks` highest-degree figures of a snapshot."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("LandmarkIndex requires numpy (pip install numpy)")
+
+        figures = np.array(sorted(snapshot.figure_index.values()), dtype=np.int32)
+        degrees = snapshot.degrees()[figures]
+        chosen = figures[np.argsort(-degrees, kind="stable")[:landmarks]]
+
+        distances = np.full((len(figures), len(chosen)), UNREACHABLE, dtype=np.uint8)
+        for column, landmark in enumerate(chosen):
+            dist = snapshot.distances_from(int(landmark), max_depth=UNREACHABLE - 1)[figures]
+            reachable = dist >= 0
+            distances[reachable, column] = dist[reachable]
+
+        return cls(
+            figure_ids=[snapshot.node_ids[i] for i in figures],
+            landmark_ids=[snapshot.node_ids[i] for i in chosen],
+            distances=distances,
+            version=snapshot.version,
+        )
+
+    def save(self, path: Path = DEFAULT_INDEX_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            figure_ids=np.array(self.figure_ids, dtype=object),
+            landmark_ids=np.array(self.landmark_ids, dtype=object),
+            distances=self.distances,
+            version=np.array(self.version, dtype=object),
+            built_at=np.array(self.built_at),
+        )
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_PATH) -> "LandmarkIndex":
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("LandmarkIndex requires numpy (pip install numpy)")
+        with np.load(path, allow_pickle=True) as data:
+            return cls(
+                figure_ids=data["figure_ids"].tolist(),
+                landmark_ids=data["landmark_ids"].tolist(),
+                distances=data["distances"],
+                version=data["version"].item(),
+                built_at=float(data["built_at"]),
+            )
+
+    def is_stale(self, driver) -> bool:
+        """Whether the graph has new ingestion_batch data since the index was built."""
+        return self.version != graph_version(driver)
+
+    def bounds(self, start_id: str, end_id: str) -> Optional[Tuple[float, float]]:
+        """
+        Lower and upper bound on the hop distance between two figures.
+
+        Returns:
+            (lower, upper); (inf, inf) if the figures are in different
+            components; None if either figure is not in the index
+        """
+        a = self.rows.get(start_id)
+        b = self.rows.get(end_id)
+        if a is None or b is None:
+            return None
+        if a == b:
+            return 0, 0
+        return self._row_bounds(self.distances[a].astype(np.int16), self.distances[b].astype(np.int16))
+
+    def bounds_batch(self, pairs: List[Tuple[str, str]]) -> List[Optional[Tuple[float, float]]]:
+        """bounds() for many pairs in one vectorised pass."""
+        known = [i for i, (a, b) in enumerate(pairs) if a in self.rows and b in self.rows]
+        results: List[Optional[Tuple[float, float]]] = [None] * len(pairs)
+        if not known:
+            return results
+
+        rows_a = self.distances[[self.rows[pairs[i][0]] for i in known]].astype(np.int16)
+        rows_b = self.distances[[self.rows[pairs[i][1]] for i in known]].astype(np.int16)
+        seen_a, seen_b = rows_a != UNREACHABLE, rows_b != UNREACHABLE
+        both = seen_a & seen_b
+        split = (seen_a != seen_b).any(axis=1)
+        upper = np.where(both, rows_a + rows_b, 10_000).min(axis=1)
+        lower = np.where(both, np.abs(rows_a - rows_b), 0).max(axis=1)
+        for row, i in enumerate(known):
+            a, b = pairs[i]
+            if a == b:
+                results[i] = (0, 0)
+            elif split[row]:
+                results[i] = (float("inf"), float("inf"))
+            else:
+                results[i] = (int(lower[row]), int(upper[row]) if upper[row] < 10_000 else float("inf"))
+        return results
+
+    @staticmethod
+    def _row_bounds(row_a: "np.ndarray", row_b: "np.ndarray") -> Tuple[float, float]:
+        seen_a, seen_b = row_a != UNREACHABLE, row_b != UNREACHABLE
+        if (seen_a != seen_b).any():
+            # A landmark reaches one figure but not the other: different components
+            return float("inf"), float("inf")
+        both = seen_a & seen_b
+        if not both.any():
+            return 0, float("inf")
+        lower = int(np.abs(row_a[both] - row_b[both]).max())
+        upper = int((row_a[both] + row_b[both]).min())
+        return lower, upper
+
+    def summary_line(self) -> str:
+        return (f"Landmark index: {len(self.figure_ids):,} figures x {len(self.landmark_ids)} landmarks "
+                f"({self.distances.nbytes / 1024:.0f} KiB), graph version {self.version}")
+
+
+def main():
+    from dotenv import load_dotenv
+    from neo4j import GraphDatabase
+
+    parser = argparse.ArgumentParser(description="Build or query the landmark distance index")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH,
+                        help=f"Index file (default: {DEFAULT_INDEX_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Rebuild the index")
+    build.add_argument("--landmarks", type=int, default=DEFAULT_LANDMARKS)
+    build.add_argument("--snapshot", type=Path,
+                       help="Build from a saved graph snapshot instead of reading Neo4j")
+    sub.add_parser("check", help="Exit 1 if the index is missing or stale")
+    query = sub.add_parser("query", help="Separation bounds for two figures")
+    query.add_argument("start_id")
+    query.add_argument("end_id")
+    args = parser.parse_args()
+
+    def connect():
+        load_dotenv()
+        uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+        if uri.startswith("neo4j+s://"):
+            uri = uri.replace("neo4j+s://", "neo4j+ssc://")
+        return GraphDatabase.driver(uri, auth=(os.getenv("NEO4J_USERNAME", "neo4j"), os.getenv("NEO4J_PASSWORD")))
+
+    if args.command == "build":
+        start = time.perf_counter()
+        if args.snapshot:
+            snapshot = GraphSnapshot.load_file(args.snapshot)
+        else:
+            driver = connect()
+            try:
+                snapshot = GraphSnapshot.load(driver)
+            finally:
+                driver.close()
+        index = LandmarkIndex.build(snapshot, args.landmarks)
+        index.save(args.index)
+        print(f"✅ {index.summary_line()} → {args.index} ({time.perf_counter() - start:.1f}s)")
+        return
+
+    if not args.index.exists():
+        print(f"❌ No landmark index at {args.index}; run: python3 scripts/lib/landmark_index.py build")
+        sys.exit(1)
+    index = LandmarkIndex.load(args.index)
+
+    if args.command == "check":
+        driver = connect()
+        try:
+            current = graph_version(driver)
+        finally:
+            driver.close()
+        if current != index.version:
+            print(f"⚠️  Stale: built at {index.version}, graph now at {current}")
+            sys.exit(1)
+        print(f"✅ Up to date: {index.summary_line()}")
+    else:
+        print(f"{args.start_id} <-> {args.end_id}: bounds {index.bounds(args.start_id, args.end_id)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Label-Aware Node Lookup by ID
+
+Resolves canonical_id / media_id / char_id / Wikidata Q-ID strings to nodes
+with labelled, indexed MATCHes instead of an unlabelled
+`WHERE n.canonical_id = $id OR n.media_id = $id OR ...`, which the planner
+can only answer with a scan of every node.
+
+IDs are routed by shape to the (label, property) pairs that can hold them,
+all backed by uniqueness constraints (see schema.py):
+
+    Q12345      HistoricalFigure.canonical_id, MediaWork.wikidata_id, MediaWork.media_id
+    PROV:slug   HistoricalFigure.canonical_id
+    HF_...      HistoricalFigure.canonical_id
+    MW_...      MediaWork.media_id
+    FC_...      FictionalCharacter.char_id
+    other       HistoricalFigure.canonical_id, MediaWork.media_id, FictionalCharacter.char_id
+
+Any number of IDs is resolved in one query: IDs are grouped per (label,
+property) and each group becomes one `UNION ALL` branch with an
+`IN $ids` index seek. When an ID matches in several places, the first route
+listed wins (figures before works).
+
+Usage:
+    nodes = lookup_nodes(driver, ["julius_caesar", "MW_401", "Q1048"])
+    labels, properties = nodes["MW_401"]
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FIGURE_ID = ("HistoricalFigure", "canonical_id")
+MEDIA_ID = ("MediaWork", "media_id")
+MEDIA_QID = ("MediaWork", "wikidata_id")
+CHARACTER_ID = ("FictionalCharacter", "char_id")
+
+QID_PATTERN = re.compile(r"^Q\d+$")
+
+# (prefix, routes) checked in order; Q-IDs are matched by QID_PATTERN
+PREFIX_ROUTES: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("PROV:", [FIGURE_ID]),
+    ("HF_", [FIGURE_ID]),
+    ("MW_", [MEDIA_ID]),
+    ("FC_", [CHARACTER_ID]),
+]
+QID_ROUTES = [FIGURE_ID, MEDIA_QID, MEDIA_ID]
+FALLBACK_ROUTES = [FIGURE_ID, MEDIA_ID, CHARACTER_ID]
+
+
+def route_id(node_id: str) -> List[Tuple[str, str]]:
+    """(label, property) pairs that may hold `node_id`, most likely first."""
+    if QID_PATTERN.match(node_id):
+        return QID_ROUTES
+    for prefix, routes in PREFIX_ROUTES:
+        if node_id.startswith(prefix):
+            return routes
+    return FALLBACK_ROUTES
+
+
+def build_lookup_query(node_ids: Iterable[str]) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    One UNION ALL query resolving all `node_ids`, and its parameters.
+
+    Each branch returns node_id, the (label, property) route it matched
+    (as route_label / route_property), node labels and the node.
+    """
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for node_id in dict.fromkeys(node_ids):
+        for route in route_id(node_id):
+            groups.setdefault(route, []).append(node_id)
+
+    branches = []
+    params: Dict[str, List[str]] = {}
+    for i, ((label, prop), ids) in enumerate(groups.items()):
+        params[f"ids_{i}"] = ids
+        branches.append(
+            f"MATCH (n:{label}) WHERE n.{prop} IN $ids_{i} "
+            f"RETURN n.{prop} AS node_id, '{label}' AS route_label, '{prop}' AS route_property, "
+            f"labels(n) AS node_labels, n"
+        )
+    return "\nUNION ALL\n".join(branches), params
+
+
+def lookup_nodes(driver, node_ids: Iterable[str]) -> Dict[str, Tuple[List[str], dict]]:
+    """
+    Resolve IDs to nodes in one round trip.
+
+    Returns:
+        {node_id: (labels, properties)} for the IDs that exist
+    """
+    query, params = build_lookup_query(node_ids)
+    if not params:
+        return {}
+
+    found: Dict[str, Tuple[int, List[str], dict]] = {}
+    with driver.session() as session:
+        for record in session.run(query, **params):
+            node_id = record["node_id"]
+            priority = route_id(node_id).index((record["route_label"], record["route_property"]))
+            current: Optional[Tuple[int, List[str], dict]] = found.get(node_id)
+            if current is None or priority < current[0]:
+                found[node_id] = (priority, record["node_labels"], dict(record["n"]))
+    return {node_id: (labels, props) for node_id, (_, labels, props) in found.items()}
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Partitioned Concurrent Writer for Neo4j Imports
+
+Spreads batch-import writes across a pool of worker threads, each with its own
+session. Nodes are hash-partitioned by their ID property so that two workers
+never MERGE the same node at the same time, and relationship chunks are only
+scheduled once the node partitions they touch have committed.
+
+Every chunk runs in a managed transaction (`session.execute_write`), which the
+driver retries on transient errors such as deadlocks or leader switches.
+"""
+
+import threading
+import zlib
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class PartitionedWriter:
+    """
+    Concurrent, partition-aware writer used by BatchImporter --workers.
+
+    Work is keyed by (label, partition). Tasks that share a key run one after
+    another in submission order; tasks with different keys run concurrently.
+    """
+
+    def __init__(
+        self,
+        driver,
+        workers: int,
+        on_error: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            driver: Neo4j driver shared by all workers
+            workers: Number of partitions and worker threads
+            on_error: Called with a message for every chunk that fails after retries
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+
+        self.driver = driver
+        self.workers = workers
+        self.on_error = on_error or (lambda message: None)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-writer")
+
+        self.retries = 0
+        self._lock = threading.Lock()
+        self._tail: Dict[Tuple[str, int], Future] = {}
+        self._submitted: List[Future] = []
+
+    def close(self):
+        """Wait for outstanding work and stop the worker threads."""
+        self.executor.shutdown(wait=True)
+
+    def partition_of(self, key: Any) -> int:
+        """Stable partition for an ID value (independent of PYTHONHASHSEED)."""
+        return zlib.crc32(str(key).encode("utf-8")) % self.workers
+
+    def write_chunk(self, session, query: str, rows: List[Dict], params: Optional[Dict] = None) -> int:
+        """
+        Run one UNWIND statement over `rows` in a managed write transaction.
+
+        Args:
+            params: Extra query parameters besides `rows`
+
+        Returns:
+            The `count` column returned by the query
+        """
+        attempts = 0
+
+        def work(tx):
+            nonlocal attempts
+            attempts += 1
+            return tx.run(query, rows=rows, **(params or {})).single()["count"]
+
+        count = session.execute_write(work)
+        if attempts > 1:
+            with self._lock:
+                self.retries += attempts - 1
+        return count
+
+    def submit_nodes(
+        self,
+        label: str,
+        id_prop: str,
+        query: str,
+        rows: List[Dict],
+        chunk_size: int,
+        params: Optional[Dict] = None,
+        on_commit: Optional[Callable[[List[Dict], int], None]] = None
+    ) -> List[Future]:
+        """
+        Partition node rows by `id_prop` and write each partition concurrently.
+
+        Args:
+            params: Extra query parameters besides `rows`
+            on_commit: Called from the worker with (chunk, count) after each chunk commits
+
+        Returns:
+            One future per partition, resolving to the number of nodes written
+        """
+        partitions: Dict[int, List[Dict]] = defaultdict(list)
+        for row in rows:
+            partitions[self.partition_of(row[id_prop])].append(row)
+
+        futures = []
+        for partition, partition_rows in sorted(partitions.items()):
+            chunks = [
+                partition_rows[i:i + chunk_size]
+                for i in range(0, len(partition_rows), chunk_size)
+            ]
+            futures.append(self._submit_keyed(
+                (label, partition), self._in_session, self._write_partition,
+                label, partition, query, chunks, params, on_commit
+            ))
+        return futures
+
+    def submit_relationships(
+        self,
+        from_label: str,
+        to_label: str,
+        rows: List[Dict],
+        chunk_size: int,
+        write: Callable[[Any, List[Dict]], int]
+    ) -> List[Future]:
+        """
+        Schedule relationship chunks behind the node partitions they touch.
+
+        Rows are partitioned by `from_id` so concurrent chunks never share a
+        start node. A chunk is started only after every node partition holding
+        one of its endpoints has committed.
+
+        Args:
+            write: Callable(session, chunk) -> count that writes one chunk
+
+        Returns:
+            One future per chunk, resolving to the number of relationships written
+        """
+        partitions: Dict[int, List[Dict]] = defaultdict(list)
+        for row in rows:
+            partitions[self.partition_of(row["from_id"])].append(row)
+
+        futures = []
+        for partition, partition_rows in sorted(partitions.items()):
+            for i in range(0, len(partition_rows), chunk_size):
+                chunk = partition_rows[i:i + chunk_size]
+                deps = self._node_dependencies(from_label, (r["from_id"] for r in chunk))
+                deps |= self._node_dependencies(to_label, (r["to_id"] for r in chunk))
+                futures.append(self._submit_keyed(
+                    ("relationships", partition), self._in_session, write, chunk, deps=deps
+                ))
+        return futures
+
+    def wait(self):
+        """Block until every submitted task has finished."""
+        while True:
+            with self._lock:
+                pending = [f for f in self._submitted if not f.done()]
+            if not pending:
+                return
+            wait(pending)
+
+    def _node_dependencies(self, label: str, ids: Iterable[Any]) -> set:
+        """
+        Latest write submitted to each partition holding one of `ids`.
+
+        Writes to a partition run in order, so its tail future completing
+        implies every earlier write to it has committed.
+        """
+        with self._lock:
+            deps = set()
+            for partition in {self.partition_of(node_id) for node_id in ids}:
+                if (label, partition) in self._tail:
+                    deps.add(self._tail[(label, partition)])
+            return deps
+
+    def _write_partition(
+        self,
+        session,
+        label: str,
+        partition: int,
+        query: str,
+        chunks: List[List[Dict]],
+        params: Optional[Dict],
+        on_commit: Optional[Callable[[List[Dict], int], None]]
+    ) -> int:
+        """Write every chunk of one partition sequentially in its own session."""
+        total = 0
+        for chunk_no, chunk in enumerate(chunks, start=1):
+            try:
+                count = self.write_chunk(session, query, chunk, params)
+                total += count
+                if on_commit:
+                    on_commit(chunk, count)
+                print(f"   ✅ {label} partition {partition} chunk {chunk_no}: {count} nodes")
+            except Exception as e:
+                self.on_error(f"Failed to import {label} partition {partition} chunk {chunk_no}: {e}")
+        return total
+
+    def _in_session(self, fn: Callable, *args):
+        with self.driver.session() as session:
+            return fn(session, *args)
+
+    def _submit_keyed(self, key: Tuple[str, int], fn: Callable, *args, deps: Optional[set] = None) -> Future:
+        """Submit a task that runs after the previous task with the same key."""
+        with self._lock:
+            deps = set(deps or ())
+            if key in self._tail:
+                deps.add(self._tail[key])
+        future = self._submit_after(deps, fn, *args)
+        with self._lock:
+            self._tail[key] = future
+        return future
+
+    def _submit_after(self, deps: set, fn: Callable, *args) -> Future:
+        """
+        Submit `fn(*args)` to the pool once every future in `deps` is done.
+
+        Dependencies are awaited with done-callbacks rather than by blocking a
+        worker thread, so a full pool can never deadlock on its own queue.
+        """
+        result: Future = Future()
+        with self._lock:
+            self._submitted.append(result)
+
+        def start(_=None):
+            inner = self.executor.submit(fn, *args)
+            inner.add_done_callback(lambda f: _copy_result(f, result))
+
+        pending = [dep for dep in deps if not dep.done()]
+        if not pending:
+            start()
+            return result
+
+        remaining = [len(pending)]
+        remaining_lock = threading.Lock()
+
+        def on_dep_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                start()
+
+        for dep in pending:
+            dep.add_done_callback(on_dep_done)
+        return result
+
+
+def _copy_result(source: Future, target: Future):
+    """Propagate the outcome of `source` into `target`."""
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Cross-Process Token-Bucket Rate Limiter for Wikidata
+
+Every script that calls Wikidata takes a token from a shared bucket before
+each network request. Bucket state lives in a small SQLite file, and each
+refill-and-take runs in an IMMEDIATE transaction, so threads in one process
+and separate processes draw from the same budget. Several enrichment jobs
+can therefore run in parallel without exceeding the rate together.
+
+Endpoints have separate buckets:
+
+- api:    www.wikidata.org/w/api.php      (2 requests/s, bursts of 4)
+- sparql: query.wikidata.org/sparql       (1 request per 1.5 s, bursts of 2)
+
+Rates can be overridden with WIKIDATA_API_RATE / WIKIDATA_SPARQL_RATE
+(requests per second). When Wikidata answers 429/503 with Retry-After,
+report it with penalize(); the bucket is then closed for every process
+until that time.
+
+Wait time is recorded per bucket and process (stats(), summary_line()).
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+
+class BucketConfig(NamedTuple):
+    rate: float       # tokens added per second
+    capacity: float   # maximum burst
+
+
+DEFAULT_BUCKETS = {
+    "api": BucketConfig(rate=float(os.getenv("WIKIDATA_API_RATE", 2.0)), capacity=4),
+    "sparql": BucketConfig(rate=float(os.getenv("WIKIDATA_SPARQL_RATE", 1 / 1.5)), capacity=2),
+}
+
+DEFAULT_LIMITER_PATH = Path(
+    os.getenv("WIKIDATA_RATE_LIMIT_PATH",
+              Path(__file__).parent.parent.parent / ".cache" / "wikidata_rate_limit.sqlite")
+)
+
+# Retry-After assumed when a 429/503 response carries no usable header
+DEFAULT_RETRY_AFTER = 5.0
+
+# Longest single sleep between bucket checks, so a penalty set by another
+# process is noticed promptly
+MAX_SLEEP = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def bucket_for_url(url: str) -> str:
+    """Bucket name for a Wikidata endpoint URL."""
+    return "sparql" if "query.wikidata.org" in url else "api"
+
+
+def parse_retry_after(value: Optional[str], default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """Token buckets shared through one SQLite file; one instance is safe to share between threads."""
+
+    def __init__(self, path: Path = DEFAULT_LIMITER_PATH, buckets: Optional[Dict[str, BucketConfig]] = None):
+        """
+        Args:
+            path: SQLite file holding bucket state (created if missing)
+            buckets: Bucket name -> BucketConfig (default: DEFAULT_BUCKETS)
+        """
+        self.path = Path(path)
+        self.buckets = dict(buckets or DEFAULT_BUCKETS)
+
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def try_acquire(self, bucket: str) -> float:
+        """
+        Take one token if available.
+
+        Returns:
+            0.0 if a token was taken, else seconds until one may be available
+        """
+        config = self.buckets[bucket]
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at, blocked_until FROM buckets WHERE name = ?", (bucket,)
+                ).fetchone()
+                tokens, updated_at, blocked_until = row if row else (config.capacity, now, 0.0)
+
+                tokens = min(config.capacity, tokens + max(0.0, now - updated_at) * config.rate)
+                if now < blocked_until:
+                    wait = blocked_until - now
+                elif tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / config.rate
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at, blocked_until) "
+                    "VALUES (?, ?, ?, ?)",
+                    (bucket, tokens, now, blocked_until)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def acquire(self, bucket: str) -> float:
+        """
+        Block until a token is taken from `bucket`.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(bucket)
+            if wait <= 0:
+                self._record_wait(bucket, waited)
+                return waited
+            wait = min(wait, MAX_SLEEP)
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, bucket: str) -> float:
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the loop."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(bucket)
+            if wait <= 0:
+                self._record_wait(bucket, waited)
+                return waited
+            wait = min(wait, MAX_SLEEP)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def penalize(self, bucket: str, retry_after: float):
+        """Close `bucket` for every process until `retry_after` seconds from now and drain its tokens."""
+        until = time.time() + retry_after
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO buckets (name, tokens, updated_at, blocked_until) VALUES (?, 0, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET tokens = 0, updated_at = excluded.updated_at, "
+                    "blocked_until = max(blocked_until, excluded.blocked_until)",
+                    (bucket, time.time(), until)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._bucket_metrics(bucket)["retry_after"] += 1
+
+    def _record_wait(self, bucket: str, waited: float):
+        with self._lock:
+            metrics = self._bucket_metrics(bucket)
+            metrics["requests"] += 1
+            if waited > 0:
+                metrics["waits"] += 1
+                metrics["wait_s"] += waited
+                metrics["max_wait_s"] = max(metrics["max_wait_s"], waited)
+
+    def _bucket_metrics(self, bucket: str) -> Dict[str, float]:
+        if bucket not in self._metrics:
+            self._metrics[bucket] = {
+                "requests": 0, "waits": 0, "wait_s": 0.0, "max_wait_s": 0.0, "retry_after": 0
+            }
+        return self._metrics[bucket]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-bucket requests, waits, total and max wait seconds and Retry-After events (this process)."""
+        with self._lock:
+            return {
+                bucket: {
+                    **metrics,
+                    "wait_s": round(metrics["wait_s"], 3),
+                    "max_wait_s": round(metrics["max_wait_s"], 3),
+                    "mean_wait_s": round(metrics["wait_s"] / metrics["requests"], 3) if metrics["requests"] else 0.0,
+                }
+                for bucket, metrics in self._metrics.items()
+            }
+
+    def summary_line(self) -> str:
+        """One-line wait summary for script output."""
+        stats = self.stats()
+        if not stats:
+            return "Wikidata rate limit: no requests"
+        parts = [
+            f"{bucket} {s['requests']} requests, {s['wait_s']:.1f}s waiting"
+            + (f", {s['retry_after']} Retry-After" if s["retry_after"] else "")
+            for bucket, s in sorted(stats.items())
+        ]
+        return "Wikidata rate limit: " + "; ".join(parts)
+
+
+_shared: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    """The process-wide limiter, opened at DEFAULT_LIMITER_PATH on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter()
+        return _shared
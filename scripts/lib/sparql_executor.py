@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Adaptive SPARQL Executor for Q-ID Batches
+
+Runs one SPARQL query template over a long list of Q-IDs by substituting
+chunks of them into its VALUES clause, replacing the fixed-size batch loops
+(and fixed sleeps) scripts used to carry. Chunk size adapts to the endpoint:
+
+- a chunk that times out (client timeout, or the 500/502/504 the endpoint
+  returns when its own 60 s limit is hit) is split in half and retried
+- a chunk that finishes quickly lets the next chunks grow by half again
+- the learned size is kept per template for the life of the executor
+
+Up to `max_concurrency` chunks run at once, each taking a token from the
+shared "sparql" rate-limit bucket (rate_limiter.py), so the request rate
+stays within the budget every Wikidata job shares. Bindings are yielded as
+chunks complete, so callers can process results while later chunks run.
+
+Results are cached per Q-ID (not per chunk) in the shared Wikidata cache,
+so reruns are served locally whatever chunk sizes were used before.
+
+Usage:
+    executor = SparqlExecutor(user_agent="FictotumLinkBuilder/1.0 (...)")
+    template = '''
+        SELECT ?person ?type WHERE {
+          VALUES ?person { {values} }
+          ?person wdt:P31 ?type .
+        }
+    '''
+    for binding in executor.run(template, qids):
+        ...
+    print(executor.summary_line())
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterable, Iterator, List, Tuple
+
+import requests
+
+try:
+    from .wikidata_cache import get_cache
+    from .rate_limiter import get_limiter, parse_retry_after
+except ImportError:  # imported as a top-level module with scripts/lib on sys.path
+    from wikidata_cache import get_cache
+    from rate_limiter import get_limiter, parse_retry_after
+
+SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
+
+# Placeholder in query templates for the chunk's "wd:Q1 wd:Q2 ..." list
+VALUES_PLACEHOLDER = "{values}"
+
+# Answers the endpoint gives for queries that ran past its time limit
+TIMEOUT_STATUSES = {500, 502, 504}
+
+_VALUES_VARIABLE = re.compile(r"VALUES\s+\?(\w+)\s*\{\s*" + re.escape(VALUES_PLACEHOLDER))
+
+
+class SparqlExecutionError(Exception):
+    """Raised for unusable query templates"""
+    pass
+
+
+class _ChunkTimeout(Exception):
+    pass
+
+
+def uri_qid(uri: str) -> str:
+    """Extract Q-ID from Wikidata URI."""
+    return uri.split("/")[-1]
+
+
+class SparqlExecutor:
+    """Runs VALUES-clause query templates over Q-ID lists with adaptive, concurrent chunks."""
+
+    def __init__(
+        self,
+        user_agent: str = "Fictotum/1.0 (https://github.com/fictotum; SPARQL Executor)",
+        initial_chunk: int = 50,
+        max_chunk: int = 400,
+        fast_seconds: float = 10.0,
+        max_concurrency: int = 2,
+        timeout: int = 60,
+        max_retries: int = 3,
+        verbose: bool = True
+    ):
+        """
+        Args:
+            user_agent: User-Agent sent to the endpoint
+            initial_chunk: Q-IDs in the first chunk of each template
+            max_chunk: Upper bound for chunk growth
+            fast_seconds: Chunks finishing within this grow the next ones
+            max_concurrency: Chunks in flight at once
+            timeout: Per-request timeout in seconds
+            max_retries: Attempts for a chunk that fails for reasons other
+                than a timeout, and for single-Q-ID chunks that keep timing out
+            verbose: Print progress and failures
+        """
+        self.headers = {"Accept": "application/sparql-results+json", "User-Agent": user_agent}
+        self.initial_chunk = initial_chunk
+        self.max_chunk = max_chunk
+        self.fast_seconds = fast_seconds
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.verbose = verbose
+
+        self.chunk_sizes: Dict[str, int] = {}
+        self.failed: List[str] = []
+        self.metrics = {"requests": 0, "timeouts": 0, "errors": 0, "cached_qids": 0, "fetched_qids": 0}
+
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+
+    def run(self, template: str, qids: Iterable[str]) -> Iterator[Dict]:
+        """
+        Yield the bindings of `template` for every Q-ID in `qids`.
+
+        `template` is a SPARQL query with a `VALUES ?var { {values} }` clause.
+        Bindings arrive chunk by chunk, in completion order; cached Q-IDs
+        come first. Q-IDs whose chunk still fails after all retries are
+        skipped, reported and listed in `failed`.
+        """
+        match = _VALUES_VARIABLE.search(template)
+        if not match:
+            raise SparqlExecutionError(f"Template needs a 'VALUES ?var {{ {VALUES_PLACEHOLDER} }}' clause")
+        variable = match.group(1)
+
+        cache = get_cache()
+        pending: List[str] = []
+        for qid in dict.fromkeys(qids):
+            cached = cache.get("sparql", {"template": template, "qid": qid})
+            if cached is None:
+                pending.append(qid)
+                continue
+            self.metrics["cached_qids"] += 1
+            yield from cached
+
+        if not pending:
+            return
+
+        total = len(pending)
+        done = 0
+        remaining: Deque[str] = deque(pending)
+        retry: Deque[Tuple[List[str], int]] = deque()
+        size = self.chunk_sizes.get(template, self.initial_chunk)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            in_flight = {}
+            while remaining or retry or in_flight:
+                while (remaining or retry) and len(in_flight) < self.max_concurrency:
+                    if retry:
+                        chunk, attempts = retry.popleft()
+                    else:
+                        chunk = [remaining.popleft() for _ in range(min(size, len(remaining)))]
+                        attempts = 0
+                    future = pool.submit(self._fetch, template.replace(VALUES_PLACEHOLDER, _values(chunk)))
+                    in_flight[future] = (chunk, attempts)
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk, attempts = in_flight.pop(future)
+                    try:
+                        bindings, elapsed = future.result()
+                    except _ChunkTimeout:
+                        self.metrics["timeouts"] += 1
+                        size = max(1, min(size, len(chunk) // 2))
+                        self.chunk_sizes[template] = size
+                        if len(chunk) > 1:
+                            half = len(chunk) // 2
+                            retry.appendleft((chunk[half:], 0))
+                            retry.appendleft((chunk[:half], 0))
+                            self._log(f"  Chunk of {len(chunk)} timed out, splitting")
+                        elif attempts + 1 < self.max_retries:
+                            retry.append((chunk, attempts + 1))
+                        else:
+                            self._give_up(chunk, "timed out")
+                            done += len(chunk)
+                        continue
+                    except requests.RequestException as e:
+                        self.metrics["errors"] += 1
+                        if attempts + 1 < self.max_retries:
+                            self._log(f"  SPARQL error (attempt {attempts + 1}): {e}")
+                            time.sleep(5 * (attempts + 1))
+                            retry.append((chunk, attempts + 1))
+                        else:
+                            self._give_up(chunk, str(e))
+                            done += len(chunk)
+                        continue
+
+                    if elapsed < self.fast_seconds and len(chunk) >= size:
+                        size = min(self.max_chunk, size + max(1, size // 2))
+                    self.chunk_sizes[template] = size
+
+                    self._store(cache, template, variable, chunk, bindings)
+                    self.metrics["fetched_qids"] += len(chunk)
+                    done += len(chunk)
+                    self._log(f"  {done}/{total} Q-IDs ({len(chunk)} in {elapsed:.1f}s, next chunk {size})")
+                    yield from bindings
+
+    def run_all(self, template: str, qids: Iterable[str]) -> List[Dict]:
+        """run() collected into a list."""
+        return list(self.run(template, qids))
+
+    def _fetch(self, query: str) -> Tuple[List[Dict], float]:
+        """One rate-limited request; raises _ChunkTimeout or requests.RequestException."""
+        limiter = get_limiter()
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire("sparql")
+            with self._lock:
+                self.metrics["requests"] += 1
+            start = time.perf_counter()
+            try:
+                response = self._session.get(
+                    SPARQL_ENDPOINT, params={"query": query}, headers=self.headers, timeout=self.timeout
+                )
+            except requests.Timeout:
+                raise _ChunkTimeout()
+            if response.status_code == 429 and attempt < self.max_retries:
+                wait_s = parse_retry_after(response.headers.get("Retry-After"), default=30)
+                self._log(f"  Rate limited, waiting {wait_s:.0f}s...")
+                limiter.penalize("sparql", wait_s)
+                continue
+            if response.status_code in TIMEOUT_STATUSES:
+                raise _ChunkTimeout()
+            response.raise_for_status()
+            return response.json()["results"]["bindings"], time.perf_counter() - start
+        raise requests.RequestException("Rate limited after retries")
+
+    @staticmethod
+    def _store(cache, template: str, variable: str, chunk: List[str], bindings: List[Dict]):
+        """
+        Cache a chunk's bindings per Q-ID (empty lists included).
+
+        Nothing is cached when a binding lacks the VALUES variable, since it
+        could not be attributed to a Q-ID on the next run.
+        """
+        by_qid: Dict[str, List[Dict]] = {qid: [] for qid in chunk}
+        for binding in bindings:
+            value = binding.get(variable, {}).get("value")
+            if not value:
+                return
+            by_qid.setdefault(uri_qid(value), []).append(binding)
+        for qid in chunk:
+            cache.set("sparql", {"template": template, "qid": qid}, by_qid[qid])
+
+    def _give_up(self, chunk: List[str], reason: str):
+        self.failed.extend(chunk)
+        self._log(f"  SPARQL failed for {len(chunk)} Q-ID(s) after retries ({reason}): {' '.join(chunk[:5])}"
+                  + (" ..." if len(chunk) > 5 else ""))
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def summary_line(self) -> str:
+        """One-line run summary for script output."""
+        m = self.metrics
+        sizes = ", ".join(str(size) for size in self.chunk_sizes.values()) or "-"
+        return (f"SPARQL executor: {m['requests']} requests, {m['fetched_qids']} Q-IDs fetched, "
+                f"{m['cached_qids']} cached, {m['timeouts']} timeouts, {len(self.failed)} failed "
+                f"(chunk sizes: {sizes})")
+
+
+def _values(qids: List[str]) -> str:
+    return " ".join(f"wd:{qid}" for qid in qids)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Staging-Label Bulk Loader for Batch Imports
+
+Loads incoming records as plain `:Staging` nodes (no MERGE, no uniqueness
+constraints), resolves duplicates with set-based joins between staging and
+live nodes, and promotes the survivors into their real labels in a single
+server-side transaction. Live nodes are only locked during promotion, which
+is a handful of statements instead of one MERGE round trip per chunk.
+
+Every staging node carries:
+- _staging_batch: batch_id of the import that created it
+- _staging_label: live label it will be promoted to
+- _staging_index: position of the record in the input file
+- _staging_key:   "<batch_id>:<label>:<index>", unique per staged record
+- _duplicate / _match_type: set on records resolved as duplicates
+
+Abandoned imports are removed with cleanup(), which deletes staging nodes
+by batch (or all of them); live data is never touched.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+STAGING_INDEXES = [
+    "CREATE INDEX staging_batch_idx IF NOT EXISTS FOR (s:Staging) ON (s._staging_batch)",
+    "CREATE INDEX staging_key_idx IF NOT EXISTS FOR (s:Staging) ON (s._staging_key)",
+]
+
+STAGING_PROPERTIES = [
+    "_staging_batch", "_staging_label", "_staging_index", "_staging_key",
+    "_duplicate", "_match_type"
+]
+
+# Exact duplicate checks per label, in priority order:
+# (match_type, guard on staged node s, pattern binding live node `live`)
+EXACT_MATCHES = {
+    "HistoricalFigure": [
+        ("exact_qid", "s.wikidata_id STARTS WITH 'Q'",
+         "MATCH (live:HistoricalFigure {wikidata_id: s.wikidata_id})"),
+        ("exact_canonical_id", "s.canonical_id IS NOT NULL",
+         "MATCH (live:HistoricalFigure {canonical_id: s.canonical_id})"),
+    ],
+    "MediaWork": [
+        ("title_year_type_exact", "s.release_year IS NOT NULL AND s.media_type IS NOT NULL",
+         "MATCH (live:MediaWork {release_year: s.release_year, media_type: s.media_type}) "
+         "WHERE toLower(trim(live.title)) = toLower(trim(s.title))"),
+        ("exact_qid", "s.wikidata_id STARTS WITH 'Q'",
+         "MATCH (live:MediaWork {wikidata_id: s.wikidata_id})"),
+    ],
+    "HistoricalEvent": [
+        ("exact_event_id", "s.event_id IS NOT NULL",
+         "MATCH (live:HistoricalEvent {event_id: s.event_id})"),
+        ("exact_qid", "s.wikidata_id STARTS WITH 'Q'",
+         "MATCH (live:HistoricalEvent {wikidata_id: s.wikidata_id})"),
+    ],
+    "Source": [
+        ("exact_source_id", "s.source_id IS NOT NULL",
+         "MATCH (live:Source {source_id: s.source_id})"),
+    ],
+}
+
+# Properties returned for existing nodes, matching the whole-file duplicate report
+EXISTING_FIELDS = {
+    "HistoricalFigure": "{.canonical_id, .name, .wikidata_id, .birth_year, .death_year}",
+    "MediaWork": "{.media_id, .title, .wikidata_id, .release_year}",
+    "HistoricalEvent": "{.event_id, .name, .wikidata_id, .start_year}",
+    "Source": "{.source_id, .title}",
+}
+
+# Name-similarity candidate lookup: (name property, candidates per search token)
+SIMILARITY_CANDIDATES = {
+    "HistoricalFigure": ("name", 20),
+    "MediaWork": ("title", 10),
+    "HistoricalEvent": ("name", 10),
+}
+
+
+class StagingLoader:
+    """Cypher side of BatchImporter --staging; scoring stays in the importer."""
+
+    def __init__(self, driver, batch_id: str, chunk_size: int = 5000):
+        """
+        Args:
+            driver: Neo4j driver
+            batch_id: Import batch whose staging nodes this loader manages
+            chunk_size: Records per staging CREATE statement
+        """
+        self.driver = driver
+        self.batch_id = batch_id
+        self.chunk_size = chunk_size
+
+    def setup_indexes(self):
+        """Create the staging lookup indexes (idempotent)."""
+        with self.driver.session() as session:
+            for statement in STAGING_INDEXES:
+                session.run(statement)
+
+    def stage(self, label: str, rows: List[Dict], indices: List[int]) -> int:
+        """
+        Bulk-create staging nodes for prepared rows of one label.
+
+        Returns:
+            Number of staging nodes created
+        """
+        query = """
+        UNWIND $rows AS row
+        CREATE (s:Staging)
+        SET s = row.props,
+            s._staging_batch = $batch_id,
+            s._staging_label = $label,
+            s._staging_index = row.index,
+            s._staging_key = $batch_id + ':' + $label + ':' + toString(row.index)
+        RETURN count(*) AS count
+        """
+        staged = 0
+        with self.driver.session() as session:
+            for i in range(0, len(rows), self.chunk_size):
+                chunk = [
+                    {"props": row, "index": idx}
+                    for row, idx in zip(rows[i:i + self.chunk_size], indices[i:i + self.chunk_size])
+                ]
+                staged += session.run(
+                    query, rows=chunk, batch_id=self.batch_id, label=label
+                ).single()["count"]
+        return staged
+
+    def staged_labels(self) -> List[str]:
+        """Live labels that have staging nodes in this batch."""
+        query = """
+        MATCH (s:Staging {_staging_batch: $batch_id})
+        RETURN DISTINCT s._staging_label AS label
+        """
+        with self.driver.session() as session:
+            return [record["label"] for record in session.run(query, batch_id=self.batch_id)]
+
+    def mark_exact_duplicates(self, label: str) -> List[Dict[str, Any]]:
+        """
+        Join staging nodes to live nodes on exact keys and mark the matches.
+
+        Each check runs as one set-based statement over the whole batch, in
+        priority order; a staged node matched by an earlier check is skipped.
+
+        Returns:
+            One dict per match: index, input (staged properties), existing,
+            match_type
+        """
+        matches = []
+        with self.driver.session() as session:
+            for match_type, guard, pattern in EXACT_MATCHES.get(label, []):
+                query = f"""
+                MATCH (s:Staging {{_staging_batch: $batch_id}})
+                WHERE s._staging_label = $label AND s._duplicate IS NULL AND {guard}
+                CALL {{
+                    WITH s
+                    {pattern}
+                    RETURN live
+                    LIMIT 1
+                }}
+                SET s._duplicate = true, s._match_type = $match_type
+                RETURN s._staging_index AS index, s {{.*}} AS input,
+                       live {EXISTING_FIELDS[label]} AS existing
+                """
+                for record in session.run(
+                    query, batch_id=self.batch_id, label=label, match_type=match_type
+                ):
+                    matches.append({**dict(record), "match_type": match_type})
+        return matches
+
+    def similarity_candidates(self, label: str) -> List[Tuple[List[Dict], List[Dict]]]:
+        """
+        Fetch name-similarity candidates for unmatched staging nodes.
+
+        Staged nodes are grouped by search token (lowercased first word) on the
+        server, so each distinct token costs one bounded index lookup.
+
+        Returns:
+            (staged records, live candidates) per search token
+        """
+        if label not in SIMILARITY_CANDIDATES:
+            return []
+
+        name_prop, limit = SIMILARITY_CANDIDATES[label]
+        query = f"""
+        MATCH (s:Staging {{_staging_batch: $batch_id}})
+        WHERE s._staging_label = $label AND s._duplicate IS NULL
+        WITH toLower(split(trim(s.{name_prop}), ' ')[0]) AS token, collect(s {{.*}}) AS staged
+        CALL {{
+            WITH token
+            MATCH (live:{label})
+            WHERE toLower(live.{name_prop}) CONTAINS token
+               OR token CONTAINS toLower(live.{name_prop})
+            RETURN live
+            LIMIT {limit}
+        }}
+        RETURN token, staged, collect(live {EXISTING_FIELDS[label]}) AS candidates
+        """
+        with self.driver.session() as session:
+            return [
+                (record["staged"], record["candidates"])
+                for record in session.run(query, batch_id=self.batch_id, label=label)
+            ]
+
+    def mark_duplicates(self, marks: List[Dict[str, Any]]):
+        """Mark staging nodes as duplicates; marks are {key, match_type} dicts."""
+        if not marks:
+            return
+        query = """
+        UNWIND $marks AS mark
+        MATCH (s:Staging {_staging_key: mark.key})
+        SET s._duplicate = true, s._match_type = mark.match_type
+        """
+        with self.driver.session() as session:
+            session.run(query, marks=marks)
+
+    def promote(
+        self,
+        labels: List[str],
+        id_props: Dict[str, str],
+        agent_name: str,
+        skip_unchanged: bool = True
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Promote every unmarked staging node of this batch in one transaction.
+
+        Each label is one MERGE statement on its ID property; staging-only
+        properties are stripped and CREATED_BY is merged in the same pass.
+        With skip_unchanged, nodes whose content_hash equals the live node's
+        are left alone.
+
+        Returns:
+            {label: {"promoted": n, "unchanged": m}}
+        """
+        def work(tx):
+            results = {}
+            for label in labels:
+                id_prop = id_props[label]
+                match_staged = f"""
+                MATCH (s:Staging {{_staging_batch: $batch_id}})
+                WHERE s._staging_label = $label AND s._duplicate IS NULL
+                OPTIONAL MATCH (live:{label} {{{id_prop}: s.{id_prop}}})
+                WITH s, live,
+                     live IS NOT NULL AND live.content_hash IS NOT NULL
+                     AND live.content_hash = s.content_hash AS unchanged
+                """
+                unchanged = 0
+                if skip_unchanged:
+                    unchanged = tx.run(
+                        match_staged + "RETURN count(CASE WHEN unchanged THEN 1 END) AS count",
+                        batch_id=self.batch_id, label=label
+                    ).single()["count"]
+
+                promoted = tx.run(match_staged + f"""
+                WHERE NOT ($skip_unchanged AND unchanged)
+                MERGE (n:{label} {{{id_prop}: s.{id_prop}}})
+                ON CREATE SET n += properties(s), n.created_at = datetime()
+                ON MATCH SET n += properties(s), n.updated_at = datetime()
+                REMOVE {", ".join(f"n.{prop}" for prop in STAGING_PROPERTIES)}
+                WITH n
+                MATCH (a:Agent {{name: $agent_name}})
+                MERGE (n)-[r:CREATED_BY]->(a)
+                ON CREATE SET r.timestamp = datetime(), r.batch_id = $batch_id
+                RETURN count(*) AS count
+                """, batch_id=self.batch_id, label=label, agent_name=agent_name,
+                    skip_unchanged=skip_unchanged).single()["count"]
+
+                results[label] = {"promoted": promoted, "unchanged": unchanged}
+            return results
+
+        with self.driver.session() as session:
+            session.run(
+                "MERGE (a:Agent {name: $agent_name}) ON CREATE SET a.created_at = datetime()",
+                agent_name=agent_name
+            )
+            return session.execute_write(work)
+
+    def cleanup(self, batch_id: Optional[str] = None, all_batches: bool = False) -> int:
+        """
+        Delete staging nodes of one batch (default: this loader's batch) or of all batches.
+
+        Deletes in server-side batches so large abandoned imports do not
+        need one huge transaction.
+
+        Returns:
+            Number of staging nodes deleted
+        """
+        if all_batches:
+            match = "MATCH (s:Staging)"
+        else:
+            match = "MATCH (s:Staging {_staging_batch: $batch_id})"
+
+        query = f"""
+        {match}
+        CALL {{
+            WITH s
+            DETACH DELETE s
+        }} IN TRANSACTIONS OF 10000 ROWS
+        RETURN count(*) AS count
+        """
+        with self.driver.session() as session:
+            return session.run(query, batch_id=batch_id or self.batch_id).single()["count"]
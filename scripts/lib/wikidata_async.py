@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Async Wikidata Client
+
+asyncio counterpart of wikidata_search.py for bulk lookups. One client holds a
+pooled keep-alive connection (aiohttp) and keeps several requests in flight,
+so a bulk job is bounded by the allowed request rate rather than by
+round-trip latency. Request starts are paced by the shared token buckets in
+rate_limiter.py, like every other Wikidata request.
+
+Request building, scoring and result shapes are shared with wikidata_search,
+as are the response cache and the HTTP call counter, so async and sync
+lookups return identical results and reuse each other's cached entries.
+
+Usage:
+    async with AsyncWikidataClient(max_concurrency=8) as client:
+        match = await client.search_wikidata_for_work("War and Peace", "Leo Tolstoy")
+        results = await client.gather(
+            client.validate_qid(qid, title) for qid, title in pairs
+        )
+
+    # From synchronous code
+    results = run(lambda client: client.validate_qids(pairs))
+
+Requires aiohttp (pip install aiohttp); without it the synchronous functions
+in wikidata_search remain available.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    from . import wikidata_search as ws
+    from .wikidata_cache import get_cache
+    from .rate_limiter import get_limiter, bucket_for_url, parse_retry_after
+except ImportError:  # imported as a top-level module with scripts/lib on sys.path
+    import wikidata_search as ws
+    from wikidata_cache import get_cache
+    from rate_limiter import get_limiter, bucket_for_url, parse_retry_after
+
+
+class AsyncWikidataClient:
+    """Pooled asyncio Wikidata client; use as an async context manager."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_connections: int = 8,
+        timeout: int = 10
+    ):
+        """
+        Args:
+            max_concurrency: Maximum requests in flight
+            max_connections: Size of the keep-alive connection pool
+            timeout: Per-request timeout in seconds
+        """
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncWikidataClient":
+        if not AIOHTTP_AVAILABLE:
+            raise ws.WikidataSearchError("AsyncWikidataClient requires aiohttp (pip install aiohttp)")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    async def _fetch(self, url: str, params: Dict, headers: Dict) -> Dict:
+        """
+        GET and decode JSON, uncached; raises aiohttp.ClientError or asyncio.TimeoutError.
+
+        Each attempt takes a token from the shared rate limiter; 429/503
+        answers close the bucket for their Retry-After delay and are retried.
+        """
+        limiter = get_limiter()
+        bucket = bucket_for_url(url)
+        async with self._semaphore:
+            for attempt in range(ws.MAX_RATE_LIMIT_RETRIES + 1):
+                await limiter.acquire_async(bucket)
+                ws.count_http_call()
+                async with self._session.get(url, params=params, headers=headers) as response:
+                    if response.status in ws.RETRY_STATUSES and attempt < ws.MAX_RATE_LIMIT_RETRIES:
+                        limiter.penalize(bucket, parse_retry_after(response.headers.get("Retry-After")))
+                        continue
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+
+    async def _get_json(self, url: str, params: Dict, headers: Dict, namespace: str) -> Dict:
+        """GET through the shared response cache (same keys as wikidata_search)."""
+        cache = get_cache()
+        request = {"url": url, **params}
+        cached = cache.get(namespace, request)
+        if cached is not None:
+            return cached
+
+        data = await self._fetch(url, params, headers)
+        cache.set(namespace, request, data)
+        return data
+
+    async def search_wikidata_for_work(
+        self,
+        title: str,
+        creator: Optional[str] = None,
+        year: Optional[int] = None,
+        media_type: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Async search_wikidata_for_work; same arguments, result and errors."""
+        if not title:
+            raise ValueError("Title is required")
+
+        data = ws.offline_search(title, year, media_type)
+        if data is None:
+            try:
+                data = await self._get_json(
+                    ws.API_URL, ws.build_search_params(title, creator, year), ws.API_HEADERS, "search"
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise ws.WikidataSearchError(f"Wikidata API request failed: {e}")
+
+        return ws.score_search_results(data, title, creator, media_type)
+
+    async def search_wikidata_for_works(
+        self,
+        specs: List[Dict]
+    ) -> List[Union[Optional[Dict], "ws.WikidataSearchError"]]:
+        """Async search_wikidata_for_works: deduplicated searches in flight at once, scored in one pass."""
+        queries = ws.search_queries(specs)
+        offline = [ws.offline_search(spec["title"], spec.get("year"), spec.get("media_type")) for spec in specs]
+        params_by_query = {
+            params["search"]: params for params, data in zip(queries, offline) if data is None
+        }
+        unique = list(params_by_query)
+
+        responses = await self.gather(
+            self._get_json(ws.API_URL, params_by_query[query], ws.API_HEADERS, "search")
+            for query in unique
+        )
+        by_query = {
+            query: ws.WikidataSearchError(f"Wikidata API request failed: {response}")
+            if isinstance(response, Exception) else response
+            for query, response in zip(unique, responses)
+        }
+        return ws.score_search_responses(specs, [
+            data if data is not None else by_query[params["search"]]
+            for params, data in zip(queries, offline)
+        ])
+
+    async def validate_qid(self, qid: str, expected_title: str) -> Dict:
+        """Async validate_qid; same result dict."""
+        entities, online = ws.offline_entities([qid])
+        if not online:
+            return ws.evaluate_entity(qid, entities, expected_title)
+
+        try:
+            data = await self._get_json(
+                ws.API_URL, ws.build_entity_params([qid]), ws.API_HEADERS, "entity"
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ws.fetch_failure(qid, e)
+
+        return ws.evaluate_entity(qid, data.get("entities"), expected_title)
+
+    async def validate_qids(
+        self,
+        pairs: List[Tuple[str, str]],
+        batch_size: int = ws.MAX_IDS_PER_REQUEST
+    ) -> List[Dict]:
+        """Async validate_qids: batched wbgetentities requests, all chunks in flight at once."""
+        entities, qids = ws.cached_entities(pairs)
+        batch_size = max(1, min(batch_size, ws.MAX_IDS_PER_REQUEST))
+        chunks = [qids[i:i + batch_size] for i in range(0, len(qids), batch_size)]
+
+        responses = await self.gather(
+            self._fetch(ws.API_URL, ws.build_entity_params(chunk), ws.API_HEADERS)
+            for chunk in chunks
+        )
+
+        errors: Dict[str, Exception] = {}
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                errors.update({qid: response for qid in chunk})
+                continue
+            chunk_entities = response.get("entities", {})
+            entities.update(chunk_entities)
+            ws.store_entities(chunk_entities)
+
+        return [
+            ws.fetch_failure(qid, errors[qid]) if qid in errors
+            else ws.evaluate_entity(qid, entities, expected_title)
+            for qid, expected_title in pairs
+        ]
+
+    async def search_by_creator(self, creator_name: str, limit: int = 50) -> List[Dict]:
+        """Async search_by_creator; same result list and errors."""
+        try:
+            data = await self._get_json(
+                ws.SPARQL_URL, ws.build_creator_params(creator_name, limit), ws.SPARQL_HEADERS, "sparql"
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ws.WikidataSearchError(f"Wikidata SPARQL query failed: {e}")
+
+        return ws.parse_creator_works(data)
+
+    async def iter_works_by_creator(
+        self,
+        creator_name: str,
+        page_size: int = 200,
+        after: Optional[str] = None,
+        max_works: Optional[int] = None,
+        max_retries: int = 3
+    ) -> AsyncIterator[Dict]:
+        """Async iter_works_by_creator: same pages, cursor, retries and yielded works."""
+        size = page_size
+        yielded = 0
+        failures = 0
+
+        while max_works is None or yielded < max_works:
+            params = ws.build_creator_page_params(creator_name, after, size)
+            try:
+                data = await self._get_json(ws.SPARQL_URL, params, ws.SPARQL_HEADERS, "sparql")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                timed_out = isinstance(e, asyncio.TimeoutError) or \
+                    getattr(e, "status", None) in ws.SPARQL_TIMEOUT_STATUSES
+                failures += 1
+                if not timed_out or failures > max_retries:
+                    raise ws.WikidataSearchError(
+                        f"Wikidata SPARQL query failed after {after or 'start'}: {e}"
+                    )
+                size = max(1, size // 2)
+                continue
+
+            failures = 0
+            works = ws.merge_creator_works(ws.parse_creator_works(data))
+            for work in works:
+                if max_works is not None and yielded >= max_works:
+                    return
+                yield work
+                yielded += 1
+
+            if len(works) < size:
+                return
+            after = works[-1]["qid"]
+            size = min(page_size, size * 2)
+
+    async def gather(self, calls: Iterable[Awaitable], return_exceptions: bool = True) -> List[Any]:
+        """
+        Run many lookups concurrently, results in input order.
+
+        Concurrency is bounded by the client (max_concurrency requests in
+        flight, starts paced by the shared rate limiter), so any number of
+        calls can be passed. With return_exceptions, a failed call yields its exception in
+        place of a result instead of cancelling the rest.
+        """
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+
+def run(work: Callable[[AsyncWikidataClient], Awaitable[Any]], **client_kwargs) -> Any:
+    """
+    Run `work(client)` on a fresh event loop from synchronous code.
+
+    Example:
+        >>> run(lambda client: client.gather(
+        ...     client.search_by_creator(name) for name in ["Leo Tolstoy", "Hilary Mantel"]))
+    """
+    async def main():
+        async with AsyncWikidataClient(**client_kwargs) as client:
+            return await work(client)
+
+    return asyncio.run(main())
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Persistent Wikidata Response Cache
+
+SQLite-backed cache shared by every script that talks to Wikidata (api.php
+and the SPARQL endpoint), so reruns of enrichment jobs are served from local
+disk instead of the network.
+
+- Keys are the namespace plus the normalised request: sorted-key JSON of the
+  request parameters, with whitespace collapsed in SPARQL query text.
+- Entries expire after a per-namespace TTL (entities change rarely, search
+  results and SPARQL answers more often).
+- The file is bounded by max_entries with least-recently-used eviction.
+- WAL mode and a busy timeout make the file safe to share between processes
+  running at the same time; one instance is safe to share between threads.
+
+Scripts get the shared instance from get_cache() and wire the standard
+switches with add_cache_arguments()/configure_from_args() (or
+configure_from_argv() for scripts without argparse):
+
+    --no-cache     bypass the cache entirely (no reads, no writes)
+    --refresh      ignore cached entries but store fresh responses
+    --cache-ttl    override every TTL, in days
+
+Inspect or prune the cache file directly:
+
+    python3 scripts/lib/wikidata_cache.py --stats
+    python3 scripts/lib/wikidata_cache.py --purge-expired
+    python3 scripts/lib/wikidata_cache.py --clear [NAMESPACE]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DAY = 24 * 60 * 60
+
+DEFAULT_CACHE_PATH = Path(
+    os.getenv("WIKIDATA_CACHE_PATH", Path(__file__).parent.parent.parent / ".cache" / "wikidata_cache.sqlite")
+)
+
+# Time-to-live per namespace, in seconds; unknown namespaces use "default"
+DEFAULT_TTLS = {
+    "entity": 30 * DAY,
+    "search": 7 * DAY,
+    "sparql": 7 * DAY,
+    "default": 7 * DAY,
+}
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+# A hit only rewrites accessed_at when the stored value is older than this,
+# so hot keys do not turn every read into a write
+ACCESS_RESOLUTION = 60
+
+# Check the size bound once per this many writes
+EVICTION_CHECK_INTERVAL = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    request TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at);
+"""
+
+_MISS = object()
+
+# Request-dict fields holding SPARQL text ("query" for endpoint params,
+# "template" for sparql_executor), whose layout must not change the key
+SPARQL_FIELDS = ("query", "template")
+
+
+def normalise_request(request: Any) -> str:
+    """
+    Canonical text for a request.
+
+    Strings (SPARQL queries) have runs of whitespace collapsed, as do the
+    SPARQL_FIELDS of a params dict such as {"url": ..., "query": ...};
+    requests are otherwise dumped as sorted-key JSON.
+    """
+    if isinstance(request, str):
+        return " ".join(request.split())
+    if isinstance(request, dict):
+        request = {
+            k: " ".join(v.split()) if k in SPARQL_FIELDS and isinstance(v, str) else v
+            for k, v in request.items()
+        }
+    return json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class WikidataCache:
+    """Namespaced, TTL-bounded, LRU-evicted response cache in one SQLite file."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        enabled: bool = True,
+        refresh: bool = False,
+        ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            path: SQLite file (created if missing)
+            enabled: False bypasses the cache entirely (--no-cache)
+            refresh: Ignore stored entries but store fresh responses (--refresh)
+            ttl: Seconds; overrides DEFAULT_TTLS for every namespace
+            max_entries: Size bound; least recently used entries are evicted
+        """
+        self.path = Path(path)
+        self.enabled = enabled
+        self.refresh = refresh
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.counts = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def ttl_for(self, namespace: str) -> float:
+        """TTL in seconds for `namespace`."""
+        if self.ttl is not None:
+            return self.ttl
+        return DEFAULT_TTLS.get(namespace, DEFAULT_TTLS["default"])
+
+    @staticmethod
+    def make_key(namespace: str, request: Any) -> str:
+        """Cache key: SHA-256 of the namespace and normalised request."""
+        text = f"{namespace}\n{normalise_request(request)}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, request: Any, default: Any = None) -> Any:
+        """Cached payload for a request, or `default` on a miss or expired entry."""
+        value = self._lookup(namespace, request)
+        return default if value is _MISS else value
+
+    def set(self, namespace: str, request: Any, payload: Any, ttl: Optional[float] = None):
+        """Store a JSON-serialisable payload."""
+        if self._conn is None:
+            return
+
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl_for(namespace))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, namespace, request, payload, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(namespace, request), namespace, normalise_request(request),
+                 json.dumps(payload, ensure_ascii=False), now, expires_at, now)
+            )
+            self._conn.commit()
+            self.counts["writes"] += 1
+            self._writes_since_check += 1
+            if self._writes_since_check >= EVICTION_CHECK_INTERVAL:
+                self._writes_since_check = 0
+                self._evict()
+
+    def fetch(
+        self,
+        namespace: str,
+        request: Any,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached payload for a request, calling `loader` on a miss.
+
+        The loader's result is stored; if it raises, nothing is stored and the
+        exception propagates, so failed requests are never cached.
+        """
+        value = self._lookup(namespace, request)
+        if value is not _MISS:
+            return value
+
+        value = loader()
+        self.set(namespace, request, value, ttl)
+        return value
+
+    def _lookup(self, namespace: str, request: Any) -> Any:
+        if self._conn is None:
+            return _MISS
+        if self.refresh:
+            with self._lock:
+                self.counts["misses"] += 1
+            return _MISS
+
+        key = self.make_key(namespace, request)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at, accessed_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.counts["misses"] += 1
+                return _MISS
+            payload, expires_at, accessed_at = row
+            if expires_at <= now:
+                self.counts["expired"] += 1
+                self.counts["misses"] += 1
+                return _MISS
+
+            if now - accessed_at > ACCESS_RESOLUTION:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.counts["hits"] += 1
+        return json.loads(payload)
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones down to 90% of max_entries."""
+        now = time.time()
+        deleted = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        total = self._conn.execute("SELECT count(*) FROM responses").fetchone()[0]
+        if total > self.max_entries:
+            excess = total - int(self.max_entries * 0.9)
+            deleted += self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess,)
+            ).rowcount
+        self._conn.commit()
+        self.counts["evictions"] += deleted
+
+    def purge_expired(self) -> int:
+        """Delete expired entries (and enforce the size bound); returns entries removed."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            before = self.counts["evictions"]
+            self._evict()
+            return self.counts["evictions"] - before
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """Delete every entry (or every entry of one namespace); returns entries removed."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            if namespace:
+                cursor = self._conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+            else:
+                cursor = self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """This process's hit/miss counters plus the hit rate."""
+        with self._lock:
+            counts = dict(self.counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_rate"] = round(counts["hits"] / lookups, 3) if lookups else 0.0
+        return counts
+
+    def summary_line(self) -> str:
+        """One-line hit-rate summary for script output."""
+        if not self.enabled:
+            return "Wikidata cache: disabled (--no-cache)"
+        s = self.stats()
+        return (f"Wikidata cache: {s['hits']} hits, {s['misses']} misses "
+                f"({s['hit_rate']:.0%} hit rate), {s['expired']} expired, "
+                f"{s['evictions']} evicted{' [refresh]' if self.refresh else ''}")
+
+    def storage_stats(self) -> List[Dict[str, Any]]:
+        """Entries, expired entries and payload bytes per namespace in the file."""
+        if self._conn is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, count(*), sum(expires_at <= ?), sum(length(payload)) "
+                "FROM responses GROUP BY namespace ORDER BY namespace",
+                (time.time(),)
+            ).fetchall()
+        return [
+            {"namespace": ns, "entries": n, "expired": expired or 0, "payload_bytes": size or 0}
+            for ns, n, expired, size in rows
+        ]
+
+
+_shared: Optional[WikidataCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_cache() -> WikidataCache:
+    """The process-wide cache, opened at DEFAULT_CACHE_PATH on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = WikidataCache()
+        return _shared
+
+
+def configure(
+    enabled: bool = True,
+    refresh: bool = False,
+    ttl_days: Optional[float] = None,
+    path: Optional[Path] = None
+) -> WikidataCache:
+    """Replace the process-wide cache with one using these settings."""
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = WikidataCache(
+            path=path or DEFAULT_CACHE_PATH,
+            enabled=enabled,
+            refresh=refresh,
+            ttl=ttl_days * DAY if ttl_days is not None else None
+        )
+        return _shared
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser):
+    """Add --no-cache, --refresh, --cache-ttl and --cache-path to a script's parser."""
+    group = parser.add_argument_group("Wikidata cache")
+    group.add_argument("--no-cache", action="store_true",
+                       help="Bypass the local Wikidata response cache")
+    group.add_argument("--refresh", action="store_true",
+                       help="Re-fetch from Wikidata and overwrite cached responses")
+    group.add_argument("--cache-ttl", type=float, default=None, metavar="DAYS",
+                       help="Override cache entry lifetime in days (default: 30 for entities, 7 otherwise)")
+    group.add_argument("--cache-path", type=Path, default=None,
+                       help=f"Cache file (default: {DEFAULT_CACHE_PATH}, or $WIKIDATA_CACHE_PATH)")
+
+
+def configure_from_args(args: argparse.Namespace) -> WikidataCache:
+    """Configure the process-wide cache from add_cache_arguments() options."""
+    return configure(
+        enabled=not args.no_cache,
+        refresh=args.refresh,
+        ttl_days=args.cache_ttl,
+        path=args.cache_path
+    )
+
+
+def configure_from_argv(argv: List[str]) -> WikidataCache:
+    """Configure the process-wide cache from --no-cache/--refresh in a raw argv list."""
+    return configure(enabled="--no-cache" not in argv, refresh="--refresh" in argv)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or prune the Wikidata response cache")
+    parser.add_argument("--cache-path", type=Path, default=DEFAULT_CACHE_PATH,
+                        help=f"Cache file (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--stats", action="store_true", help="Show entries per namespace")
+    parser.add_argument("--purge-expired", action="store_true", help="Delete expired entries")
+    parser.add_argument("--clear", nargs="?", const="", default=None, metavar="NAMESPACE",
+                        help="Delete all entries, or those of one namespace")
+    args = parser.parse_args()
+
+    cache = WikidataCache(path=args.cache_path)
+    try:
+        if args.clear is not None:
+            print(f"Deleted {cache.clear(args.clear or None)} entries")
+        if args.purge_expired:
+            print(f"Deleted {cache.purge_expired()} expired entries")
+
+        print(f"Cache: {cache.path}")
+        print(f"{'Namespace':<12} {'Entries':>10} {'Expired':>10} {'Payload MB':>12}")
+        for row in cache.storage_stats():
+            print(f"{row['namespace']:<12} {row['entries']:>10} {row['expired']:>10} "
+                  f"{row['payload_bytes'] / 1e6:>12.1f}")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
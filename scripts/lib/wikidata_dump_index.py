@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Offline Wikidata Label Index
+
+Builds a compact SQLite index from a Wikidata JSON dump (latest-all.json.bz2
+or .gz, or a pre-filtered subset with one entity per line) and serves Q-ID
+validation and title search from it, so large backfills need no network.
+
+Only entities we resolve against are kept: humans and the creative-work
+classes Fictotum imports (film, book, TV series, video game, play). For each
+one the index stores the English label, aliases and description, its
+instance-of (P31) classes, and the years of publication (P577), birth (P569)
+and death (P570). Labels, aliases and descriptions are searchable through an
+FTS5 table; Q-ID lookups hit the integer primary key.
+
+The dump is streamed line by line, so building never holds it in memory.
+
+Usage:
+    # Build (once per dump)
+    python3 scripts/lib/wikidata_dump_index.py build latest-all.json.bz2 --output data/wikidata_index.sqlite
+
+    # Inspect
+    python3 scripts/lib/wikidata_dump_index.py lookup data/wikidata_index.sqlite Q161531
+    python3 scripts/lib/wikidata_dump_index.py search data/wikidata_index.sqlite "War and Peace" --creator "Leo Tolstoy"
+
+    # Use as the backend for validate_qid / search_wikidata_for_work
+    export WIKIDATA_OFFLINE_INDEX=data/wikidata_index.sqlite
+    python3 scripts/import/batch_import.py data/batch.json --offline-index data/wikidata_index.sqlite
+    (--offline-index / --offline-only in batch_import.py and fix_bad_qids.py,
+    or call wikidata_search.use_offline_index(path) from other scripts)
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+# Instance-of classes to keep, mapped to the kind stored in the index
+# (MediaWork media_type values, or HUMAN)
+KEPT_CLASSES = {
+    "Q5": "HUMAN",
+    "Q11424": "FILM",          # film
+    "Q202866": "FILM",         # animated film
+    "Q24862": "FILM",          # short film
+    "Q571": "BOOK",            # book
+    "Q7725634": "BOOK",        # literary work
+    "Q8261": "BOOK",           # novel
+    "Q47461344": "BOOK",       # written work
+    "Q5398426": "TV_SERIES",   # television series
+    "Q1259759": "TV_SERIES",   # miniseries
+    "Q7889": "GAME",           # video game
+    "Q25379": "PLAY",          # play
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,      -- numeric part of the Q-ID
+    qid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT,
+    aliases TEXT,                -- JSON list
+    description TEXT,
+    instance_of TEXT,            -- space-separated Q-IDs
+    publication_year INTEGER,
+    birth_year INTEGER,
+    death_year INTEGER
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entity_fts USING fts5(
+    label, aliases, description,
+    content='entities', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# FTS candidates fetched per search before year/kind reranking
+SEARCH_CANDIDATES = 50
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def open_dump(path: Path) -> TextIO:
+    """Open a dump as text, decompressing .bz2/.gz by extension."""
+    path = Path(path)
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_dump_entities(stream: TextIO) -> Iterator[Dict]:
+    """
+    Yield entities from a dump stream.
+
+    Handles both the official layout (a JSON array with one entity per line,
+    lines ending in ",") and JSON lines.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line or line in ("[", "]"):
+            continue
+        if line.endswith(","):
+            line = line[:-1]
+        yield json.loads(line)
+
+
+def _claim_ids(entity: Dict, prop: str) -> List[str]:
+    ids = []
+    for claim in entity.get("claims", {}).get(prop, []):
+        value = claim.get("mainsnak", {}).get("datavalue", {}).get("value")
+        if isinstance(value, dict) and "id" in value:
+            ids.append(value["id"])
+    return ids
+
+
+def _claim_year(entity: Dict, prop: str) -> Optional[int]:
+    """Earliest year among a time property's values ("+1869-01-01T00:00:00Z" -> 1869)."""
+    years = []
+    for claim in entity.get("claims", {}).get(prop, []):
+        value = claim.get("mainsnak", {}).get("datavalue", {}).get("value")
+        if isinstance(value, dict) and "time" in value:
+            match = re.match(r"([+-])(\d+)-", value["time"])
+            if match:
+                year = int(match.group(2))
+                years.append(-year if match.group(1) == "-" else year)
+    return min(years) if years else None
+
+
+def extract_record(entity: Dict) -> Optional[Dict]:
+    """Index row for an entity, or None if it is not a kept item."""
+    qid = entity.get("id", "")
+    if entity.get("type") != "item" or not qid.startswith("Q"):
+        return None
+
+    instance_of = _claim_ids(entity, "P31")
+    kinds = [KEPT_CLASSES[cls] for cls in instance_of if cls in KEPT_CLASSES]
+    if not kinds:
+        return None
+
+    aliases = [alias["value"] for alias in entity.get("aliases", {}).get("en", [])]
+    return {
+        "id": int(qid[1:]),
+        "qid": qid,
+        "kind": kinds[0],
+        "label": entity.get("labels", {}).get("en", {}).get("value"),
+        "aliases": json.dumps(aliases, ensure_ascii=False) if aliases else None,
+        "description": entity.get("descriptions", {}).get("en", {}).get("value"),
+        "instance_of": " ".join(instance_of),
+        "publication_year": _claim_year(entity, "P577"),
+        "birth_year": _claim_year(entity, "P569"),
+        "death_year": _claim_year(entity, "P570"),
+    }
+
+
+def build_index(dump_path: Path, output: Path, batch_size: int = 10000, progress_every: int = 1_000_000) -> Dict:
+    """
+    Stream a dump into a fresh index file.
+
+    Returns:
+        Build statistics: scanned, kept, per-kind counts, seconds
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.exists():
+        output.unlink()
+
+    conn = sqlite3.connect(str(output))
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(SCHEMA)
+
+    stats = {"scanned": 0, "kept": 0, "kinds": {}}
+    start = time.perf_counter()
+    columns = ["id", "qid", "kind", "label", "aliases", "description", "instance_of",
+               "publication_year", "birth_year", "death_year"]
+    insert = (f"INSERT OR REPLACE INTO entities ({', '.join(columns)}) "
+              f"VALUES ({', '.join('?' for _ in columns)})")
+
+    batch = []
+    with open_dump(dump_path) as stream:
+        for entity in iter_dump_entities(stream):
+            stats["scanned"] += 1
+            if progress_every and stats["scanned"] % progress_every == 0:
+                print(f"   {stats['scanned']:,} scanned, {stats['kept']:,} kept")
+
+            record = extract_record(entity)
+            if record is None:
+                continue
+            stats["kept"] += 1
+            stats["kinds"][record["kind"]] = stats["kinds"].get(record["kind"], 0) + 1
+            batch.append(tuple(record[column] for column in columns))
+            if len(batch) >= batch_size:
+                conn.executemany(insert, batch)
+                batch = []
+
+    if batch:
+        conn.executemany(insert, batch)
+    conn.execute("INSERT INTO entity_fts(entity_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO entity_fts(entity_fts) VALUES ('optimize')")
+
+    stats["seconds"] = round(time.perf_counter() - start, 1)
+    conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+        ("source", str(dump_path)),
+        ("built_at", datetime.now().isoformat()),
+        ("stats", json.dumps(stats)),
+    ])
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return stats
+
+
+class WikidataDumpIndex:
+    """Read-only lookups against an index built by build_index()."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Wikidata index not found: {self.path}")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA mmap_size=1073741824")
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, qid: str) -> Optional[Dict]:
+        """Index row for a Q-ID, or None if it is not in the index."""
+        if not qid.startswith("Q") or not qid[1:].isdigit():
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM entities WHERE id = ?", (int(qid[1:]),)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def get_entities(self, qids: List[str]) -> Dict[str, Dict]:
+        """Found Q-IDs as wbgetentities-style entities (English label and description)."""
+        entities = {}
+        for qid in qids:
+            record = self.get(qid)
+            if record is None:
+                continue
+            entity: Dict = {"id": qid, "labels": {}, "descriptions": {}}
+            if record["label"]:
+                entity["labels"]["en"] = {"language": "en", "value": record["label"]}
+            if record["description"]:
+                entity["descriptions"]["en"] = {"language": "en", "value": record["description"]}
+            entities[qid] = entity
+        return entities
+
+    def search(
+        self,
+        title: str,
+        year: Optional[int] = None,
+        kind: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Candidates whose label or aliases contain every word of `title`.
+
+        Ranked by FTS relevance, with exact label matches first and, when
+        `year` is given, items within a year of it ahead of the rest.
+        Humans are excluded unless kind="HUMAN".
+
+        Returns:
+            Index rows, best first
+        """
+        tokens = _TOKEN.findall(title.lower())
+        if not tokens:
+            return []
+        match = "{label aliases}: " + " ".join(f'"{token}"' for token in tokens)
+        kind_filter = "e.kind = 'HUMAN'" if kind == "HUMAN" else "e.kind != 'HUMAN'"
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT e.*, bm25(entity_fts, 10.0, 5.0, 1.0) AS rank
+                FROM entity_fts JOIN entities e ON e.id = entity_fts.rowid
+                WHERE entity_fts MATCH ? AND {kind_filter}
+                ORDER BY rank
+                LIMIT ?
+            """, (match, SEARCH_CANDIDATES)).fetchall()
+
+        title_lower = title.lower()
+        records = [self._to_dict(row) for row in rows]
+
+        def sort_key(item):
+            position, record = item
+            exact = (record["label"] or "").lower() == title_lower or any(
+                alias.lower() == title_lower for alias in record["aliases"]
+            )
+            year_match = year is not None and record["publication_year"] is not None \
+                and abs(record["publication_year"] - year) <= 1
+            kind_match = kind is not None and record["kind"] == kind
+            return (not exact, not year_match, not kind_match, position)
+
+        return [record for _, record in sorted(enumerate(records), key=sort_key)][:limit]
+
+    def search_response(
+        self,
+        title: str,
+        year: Optional[int] = None,
+        media_type: Optional[str] = None,
+        limit: int = 10
+    ) -> Dict:
+        """search() results in wbsearchentities response shape, for score_search_results."""
+        return {"search": [
+            {"id": record["qid"], "label": record["label"] or "", "description": record["description"] or ""}
+            for record in self.search(title, year=year, kind=media_type, limit=limit)
+        ]}
+
+    def meta(self) -> Dict[str, str]:
+        with self._lock:
+            return {row["key"]: row["value"] for row in self._conn.execute("SELECT key, value FROM meta")}
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        record = {key: row[key] for key in row.keys() if key != "rank"}
+        record["aliases"] = json.loads(record["aliases"]) if record["aliases"] else []
+        record["instance_of"] = record["instance_of"].split() if record["instance_of"] else []
+        return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query an offline Wikidata label index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Stream a dump into an index")
+    build.add_argument("dump", type=Path, help="Wikidata JSON dump (.json, .json.bz2, .json.gz)")
+    build.add_argument("--output", type=Path, default=Path("data/wikidata_index.sqlite"),
+                       help="Index file (default: data/wikidata_index.sqlite)")
+
+    lookup = sub.add_parser("lookup", help="Show index rows for Q-IDs")
+    lookup.add_argument("index", type=Path)
+    lookup.add_argument("qids", nargs="+")
+
+    search = sub.add_parser("search", help="Search works (or humans) by title")
+    search.add_argument("index", type=Path)
+    search.add_argument("title")
+    search.add_argument("--creator")
+    search.add_argument("--year", type=int)
+    search.add_argument("--media-type")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"📦 Building Wikidata index from {args.dump}")
+        stats = build_index(args.dump, args.output)
+        print(f"✅ Kept {stats['kept']:,} of {stats['scanned']:,} entities in {stats['seconds']}s → {args.output}")
+        for kind, count in sorted(stats["kinds"].items()):
+            print(f"   {kind}: {count:,}")
+        return
+
+    index = WikidataDumpIndex(args.index)
+    try:
+        if args.command == "lookup":
+            for qid in args.qids:
+                print(json.dumps(index.get(qid) or {"qid": qid, "missing": True}, ensure_ascii=False))
+        else:
+            from wikidata_search import score_search_results
+            response = index.search_response(args.title, year=args.year, media_type=args.media_type)
+            for result in response["search"]:
+                print(f"{result['id']:<12} {result['label']} — {result['description']}")
+            print(f"Best match: {score_search_results(response, args.title, args.creator, args.media_type)}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
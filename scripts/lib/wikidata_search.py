@@ -4,12 +4,39 @@ Wikidata Search & Validation Module
 
 Provides robust Q-ID lookup and validation for MediaWork entities.
 Used by both maintenance scripts and live API endpoints.
+
+Title similarity uses rapidfuzz when installed (difflib otherwise).
+With an offline index built from a Wikidata dump (wikidata_dump_index.py,
+enabled by use_offline_index() or WIKIDATA_OFFLINE_INDEX), Q-ID validation
+and work search are answered locally and only index misses reach the network.
+Synchronous requests share one pooled keep-alive session. Request builders
+and result parsers are public so wikidata_async.AsyncWikidataClient can
+offer the same lookups over asyncio for bulk work.
 """
 
+import argparse
+import os
 import requests
 import difflib
-from typing import Optional, List, Dict
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Iterator, Tuple, Union
+
+try:
+    from rapidfuzz import fuzz as rapidfuzz_fuzz
+    from rapidfuzz import process as rapidfuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    from .wikidata_cache import get_cache
+    from .rate_limiter import get_limiter, bucket_for_url, parse_retry_after
+    from .wikidata_dump_index import WikidataDumpIndex
+except ImportError:  # imported as a top-level module with scripts/lib on sys.path
+    from wikidata_cache import get_cache
+    from rate_limiter import get_limiter, bucket_for_url, parse_retry_after
+    from wikidata_dump_index import WikidataDumpIndex
 
 
 class WikidataSearchError(Exception):
@@ -17,6 +44,192 @@ class WikidataSearchError(Exception):
     pass
 
 
+API_URL = "https://www.wikidata.org/w/api.php"
+SPARQL_URL = "https://query.wikidata.org/sparql"
+API_HEADERS = {
+    "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Q-ID Validation)"
+}
+SPARQL_HEADERS = {
+    "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Creator Search)",
+    "Accept": "application/json"
+}
+
+# Responses that mean "slow down"; retried after their Retry-After delay
+RETRY_STATUSES = {429, 503}
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Cumulative HTTP request count, read by callers that report per-phase metrics
+request_counts = {"http_calls": 0}
+_counts_lock = threading.Lock()
+
+# One keep-alive connection pool for every synchronous request, so repeated
+# calls reuse TLS connections instead of handshaking each time
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=8))
+
+
+# Offline dump index (see use_offline_index); opened from WIKIDATA_OFFLINE_INDEX
+# on first use when set
+_offline = {"index": None, "fallback": True, "loaded": False}
+_offline_lock = threading.Lock()
+
+
+def use_offline_index(path: Optional[str], fallback: bool = True):
+    """
+    Answer validate_qid(s) and search_wikidata_for_work(s) from a local dump index.
+
+    Args:
+        path: Index built by wikidata_dump_index.py, or None to go back to
+            network-only lookups
+        fallback: Query Wikidata for Q-IDs and titles the index does not
+            contain; with False, lookups never touch the network
+    """
+    with _offline_lock:
+        if _offline["index"] is not None:
+            _offline["index"].close()
+        _offline["index"] = WikidataDumpIndex(path) if path else None
+        _offline["fallback"] = fallback
+        _offline["loaded"] = True
+
+
+def add_offline_index_arguments(parser: argparse.ArgumentParser):
+    """Add --offline-index and --offline-only to a script's parser."""
+    group = parser.add_argument_group("Offline Wikidata index")
+    group.add_argument("--offline-index", default=None, metavar="PATH",
+                       help="Validate Q-IDs and search titles in a dump index built by "
+                            "wikidata_dump_index.py (default: $WIKIDATA_OFFLINE_INDEX)")
+    group.add_argument("--offline-only", action="store_true",
+                       help="Never query Wikidata for Q-IDs and titles missing from the offline index")
+
+
+def configure_offline_index_from_args(args: argparse.Namespace):
+    """Enable the offline index from add_offline_index_arguments() options."""
+    path = args.offline_index or os.getenv("WIKIDATA_OFFLINE_INDEX")
+    if path:
+        use_offline_index(path, fallback=not args.offline_only)
+
+
+def offline_index() -> Optional[WikidataDumpIndex]:
+    """The active offline index, if any."""
+    with _offline_lock:
+        if not _offline["loaded"]:
+            path = os.getenv("WIKIDATA_OFFLINE_INDEX")
+            _offline["index"] = WikidataDumpIndex(path) if path else None
+            _offline["loaded"] = True
+        return _offline["index"]
+
+
+def offline_search(title: str, year: Optional[int], media_type: Optional[str]) -> Optional[Dict]:
+    """Search response from the offline index, or None when the network should be asked."""
+    index = offline_index()
+    if index is None:
+        return None
+    data = index.search_response(title, year=year, media_type=media_type)
+    if data["search"] or not _offline["fallback"]:
+        return data
+    return None
+
+
+def offline_entities(qids: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+    """Entities found in the offline index, and Q-IDs still to look up online."""
+    index = offline_index()
+    if index is None:
+        return {}, list(qids)
+    entities = index.get_entities(qids)
+    if not _offline["fallback"]:
+        return entities, []
+    return entities, [qid for qid in qids if qid not in entities]
+
+
+def count_http_call():
+    """Add one to request_counts (thread-safe); also used by the async client."""
+    with _counts_lock:
+        request_counts["http_calls"] += 1
+
+
+def _http_get(url: str, **kwargs) -> requests.Response:
+    """GET on the pooled session, counted in request_counts."""
+    count_http_call()
+    return _session.get(url, **kwargs)
+
+
+def _get_json(url: str, params: Dict, headers: Dict, timeout: int, namespace: str) -> Dict:
+    """
+    GET a Wikidata endpoint and decode its JSON body, through the shared cache.
+
+    Only cache misses are rate-limited and reach the network; failed requests
+    raise requests.RequestException and are never cached.
+    """
+    return get_cache().fetch(
+        namespace, {"url": url, **params}, lambda: _request_json(url, params, headers, timeout)
+    )
+
+
+def _request_json(url: str, params: Dict, headers: Dict, timeout: int) -> Dict:
+    """
+    Uncached GET, rate-limited by the shared token bucket for the endpoint.
+
+    A 429/503 answer closes the bucket for its Retry-After delay (for every
+    process sharing the limiter) and is retried up to MAX_RATE_LIMIT_RETRIES
+    times.
+    """
+    limiter = get_limiter()
+    bucket = bucket_for_url(url)
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        limiter.acquire(bucket)
+        response = _http_get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code in RETRY_STATUSES and attempt < MAX_RATE_LIMIT_RETRIES:
+            limiter.penalize(bucket, parse_retry_after(response.headers.get("Retry-After")))
+            continue
+        response.raise_for_status()
+        return response.json()
+
+
+def build_search_params(title: str, creator: Optional[str] = None, year: Optional[int] = None) -> Dict:
+    """wbsearchentities parameters for a work search."""
+    # Build search query
+    search_terms = [title]
+    if creator:
+        search_terms.append(creator)
+    if year:
+        search_terms.append(str(year))
+
+    return {
+        "action": "wbsearchentities",
+        "search": " ".join(search_terms),
+        "language": "en",
+        "limit": 10,  # Get top 10 results
+        "format": "json",
+        "type": "item"
+    }
+
+
+def build_entity_params(ids: List[str]) -> Dict:
+    """wbgetentities parameters fetching English labels and descriptions."""
+    return {
+        "action": "wbgetentities",
+        "ids": "|".join(ids),
+        "props": "labels|descriptions",
+        "languages": "en",
+        "format": "json"
+    }
+
+
+def build_creator_params(creator_name: str, limit: int) -> Dict:
+    """SPARQL endpoint parameters for the works-by-creator query."""
+    sparql_query = f"""
+        SELECT DISTINCT ?work ?workLabel ?year ?typeLabel WHERE {{
+          ?creator ?label "{creator_name}"@en .
+          ?work wdt:P50|wdt:P57|wdt:P170|wdt:P178 ?creator .
+          OPTIONAL {{ ?work wdt:P577 ?publicationDate . BIND(YEAR(?publicationDate) AS ?year) }}
+          OPTIONAL {{ ?work wdt:P31 ?type }}
+          SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en" }}
+        }}
+        LIMIT {limit}
+        """
+    return {"query": sparql_query, "format": "json"}
+
+
 def search_wikidata_for_work(
     title: str,
     creator: Optional[str] = None,
@@ -46,107 +259,202 @@ def search_wikidata_for_work(
     if not title:
         raise ValueError("Title is required")
 
-    # Build search query
-    search_terms = [title]
-    if creator:
-        search_terms.append(creator)
-    if year:
-        search_terms.append(str(year))
+    data = offline_search(title, year, media_type)
+    if data is None:
+        try:
+            data = _get_json(API_URL, build_search_params(title, creator, year), API_HEADERS, timeout, "search")
+        except requests.RequestException as e:
+            raise WikidataSearchError(f"Wikidata API request failed: {e}")
 
-    search_query = " ".join(search_terms)
+    return score_search_results(data, title, creator, media_type)
 
-    try:
-        # Use Wikidata search API
-        url = "https://www.wikidata.org/w/api.php"
-        params = {
-            "action": "wbsearchentities",
-            "search": search_query,
-            "language": "en",
-            "limit": 10,  # Get top 10 results
-            "format": "json",
-            "type": "item"
-        }
-        headers = {
-            "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Q-ID Validation)"
-        }
 
-        response = requests.get(url, params=params, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
-
-        if "search" not in data or len(data["search"]) == 0:
-            return None
-
-        # Score each result
-        candidates = []
-        for result in data["search"]:
-            qid = result["id"]
-            result_label = result.get("label", "")
-            result_description = result.get("description", "")
-
-            # Calculate title similarity
-            similarity = difflib.SequenceMatcher(
-                None,
-                title.lower(),
-                result_label.lower()
-            ).ratio()
-
-            # Bonus points for matching creator in description
-            creator_bonus = 0
-            if creator and creator.lower() in result_description.lower():
-                creator_bonus = 0.2
-
-            # Media type filtering (if we can determine from description)
-            media_type_match = True
-            if media_type:
-                media_type_match = _matches_media_type(media_type, result_description)
-
-            score = similarity + creator_bonus
-
-            candidates.append({
-                "qid": qid,
-                "title": result_label,
-                "description": result_description,
-                "similarity": similarity,
-                "score": score,
-                "media_type_match": media_type_match
-            })
-
-        # Filter by media type if specified
-        if media_type:
-            type_matches = [c for c in candidates if c["media_type_match"]]
-            if type_matches:
-                candidates = type_matches
+def title_similarities(pairs: List[Tuple[str, str]]) -> List[float]:
+    """
+    Case-insensitive similarity (0-1) of every (title, label) pair in one pass.
 
-        # Sort by score
-        candidates.sort(key=lambda x: x["score"], reverse=True)
+    Uses rapidfuzz (normalised Indel similarity, the LCS form of difflib's
+    ratio, in C and across all cores) when installed, else difflib.
+    """
+    if not pairs:
+        return []
+
+    titles = [title.lower() for title, _ in pairs]
+    labels = [label.lower() for _, label in pairs]
+    if RAPIDFUZZ_AVAILABLE:
+        if hasattr(rapidfuzz_process, "cpdist"):  # rapidfuzz >= 3.6
+            scores = rapidfuzz_process.cpdist(titles, labels, scorer=rapidfuzz_fuzz.ratio, workers=-1)
+        else:
+            scores = [rapidfuzz_fuzz.ratio(title, label) for title, label in zip(titles, labels)]
+        return [float(score) / 100 for score in scores]
+    return [difflib.SequenceMatcher(None, title, label).ratio() for title, label in zip(titles, labels)]
 
-        # Return best match if similarity is good enough
-        best = candidates[0]
 
-        # Confidence thresholds
-        if best["score"] >= 0.9:
-            confidence = "high"
-        elif best["score"] >= 0.7:
-            confidence = "medium"
-        else:
-            confidence = "low"
-
-        # Only return if we have reasonable confidence
-        if best["score"] >= 0.7:
-            return {
-                "qid": best["qid"],
-                "title": best["title"],
-                "description": best["description"],
-                "similarity": best["similarity"],
-                "score": best["score"],
-                "confidence": confidence
-            }
+def score_search_results(
+    data: Dict,
+    title: str,
+    creator: Optional[str] = None,
+    media_type: Optional[str] = None,
+    similarities: Optional[List[float]] = None
+) -> Optional[Dict]:
+    """
+    Pick the best wbsearchentities result for a work, or None below medium confidence.
 
+    `similarities` are precomputed title similarities for data["search"], in
+    order (see score_search_responses); computed here if omitted.
+    """
+    if "search" not in data or len(data["search"]) == 0:
         return None
 
-    except requests.RequestException as e:
-        raise WikidataSearchError(f"Wikidata API request failed: {e}")
+    if similarities is None:
+        similarities = title_similarities([(title, result.get("label", "")) for result in data["search"]])
+
+    # Score each result
+    candidates = []
+    for result, similarity in zip(data["search"], similarities):
+        qid = result["id"]
+        result_label = result.get("label", "")
+        result_description = result.get("description", "")
+
+        # Bonus points for matching creator in description
+        creator_bonus = 0
+        if creator and creator.lower() in result_description.lower():
+            creator_bonus = 0.2
+
+        # Media type filtering (if we can determine from description)
+        media_type_match = True
+        if media_type:
+            media_type_match = _matches_media_type(media_type, result_description)
+
+        score = similarity + creator_bonus
+
+        candidates.append({
+            "qid": qid,
+            "title": result_label,
+            "description": result_description,
+            "similarity": similarity,
+            "score": score,
+            "media_type_match": media_type_match
+        })
+
+    # Filter by media type if specified
+    if media_type:
+        type_matches = [c for c in candidates if c["media_type_match"]]
+        if type_matches:
+            candidates = type_matches
+
+    # Sort by score
+    candidates.sort(key=lambda x: x["score"], reverse=True)
+
+    # Return best match if similarity is good enough
+    best = candidates[0]
+
+    # Confidence thresholds
+    if best["score"] >= 0.9:
+        confidence = "high"
+    elif best["score"] >= 0.7:
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    # Only return if we have reasonable confidence
+    if best["score"] >= 0.7:
+        return {
+            "qid": best["qid"],
+            "title": best["title"],
+            "description": best["description"],
+            "similarity": best["similarity"],
+            "score": best["score"],
+            "confidence": confidence
+        }
+
+    return None
+
+
+def search_wikidata_for_works(
+    specs: List[Dict],
+    max_concurrency: int = 4,
+    timeout: int = 10
+) -> List[Union[Optional[Dict], WikidataSearchError]]:
+    """
+    Search Wikidata for many works at once
+
+    Identical queries (same title, creator and year) are sent once, distinct
+    ones run with at most `max_concurrency` requests in flight (each still
+    rate-limited and cached), and all candidates are scored in one pass.
+
+    Args:
+        specs: Dicts with search_wikidata_for_work arguments: title
+            (required), creator, year, media_type
+        max_concurrency: Maximum concurrent requests
+        timeout: Request timeout in seconds
+
+    Returns:
+        One entry per spec, in input order: the search_wikidata_for_work
+        result (dict or None), or a WikidataSearchError if that search failed
+
+    Example:
+        >>> search_wikidata_for_works([{"title": "War and Peace", "creator": "Leo Tolstoy"}])
+        [{'qid': 'Q161531', 'title': 'War and Peace', 'similarity': 1.0, 'confidence': 'high', ...}]
+    """
+    queries = search_queries(specs)
+    offline = [offline_search(spec["title"], spec.get("year"), spec.get("media_type")) for spec in specs]
+    params_by_query = {
+        params["search"]: params for params, data in zip(queries, offline) if data is None
+    }
+    unique = list(params_by_query)
+
+    def fetch(query: str) -> Union[Dict, WikidataSearchError]:
+        try:
+            return _get_json(API_URL, params_by_query[query], API_HEADERS, timeout, "search")
+        except requests.RequestException as e:
+            return WikidataSearchError(f"Wikidata API request failed: {e}")
+
+    responses: Dict[str, Union[Dict, WikidataSearchError]] = {}
+    if unique:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(unique)))) as pool:
+            responses = dict(zip(unique, pool.map(fetch, unique)))
+
+    return score_search_responses(specs, [
+        data if data is not None else responses[params["search"]]
+        for params, data in zip(queries, offline)
+    ])
+
+
+def search_queries(specs: List[Dict]) -> List[Dict]:
+    """wbsearchentities parameters per spec; identical searches share a "search" string."""
+    queries = []
+    for spec in specs:
+        if not spec.get("title"):
+            raise ValueError("Title is required")
+        queries.append(build_search_params(spec["title"], spec.get("creator"), spec.get("year")))
+    return queries
+
+
+def score_search_responses(
+    specs: List[Dict],
+    responses: List[Union[Dict, WikidataSearchError]]
+) -> List[Union[Optional[Dict], WikidataSearchError]]:
+    """Score the search response of every spec, computing all title similarities in one pass."""
+    pairs = []
+    for spec, data in zip(specs, responses):
+        if isinstance(data, dict):
+            pairs.extend((spec["title"], result.get("label", "")) for result in data.get("search", []))
+    similarities = title_similarities(pairs)
+
+    results = []
+    offset = 0
+    for spec, data in zip(specs, responses):
+        if not isinstance(data, dict):
+            results.append(data)
+            continue
+        count = len(data.get("search", []))
+        results.append(score_search_results(
+            data, spec["title"], spec.get("creator"), spec.get("media_type"),
+            similarities=similarities[offset:offset + count]
+        ))
+        offset += count
+    return results
 
 
 def _matches_media_type(media_type: str, description: str) -> bool:
@@ -183,73 +491,160 @@ def validate_qid(qid: str, expected_title: str, timeout: int = 10) -> Dict:
         {'valid': True, 'wikidata_label': 'War and Peace', 'similarity': 1.0}
     """
 
+    entities, online = offline_entities([qid])
+    if not online:
+        return evaluate_entity(qid, entities, expected_title)
+
     try:
-        # Fetch entity from Wikidata
-        url = "https://www.wikidata.org/w/api.php"
-        params = {
-            "action": "wbgetentities",
-            "ids": qid,
-            "props": "labels|descriptions",
-            "languages": "en",
-            "format": "json"
-        }
-        headers = {
-            "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Q-ID Validation)"
+        data = _get_json(API_URL, build_entity_params([qid]), API_HEADERS, timeout, "entity")
+    except requests.RequestException as e:
+        return fetch_failure(qid, e)
+
+    return evaluate_entity(qid, data.get("entities"), expected_title)
+
+
+def fetch_failure(qid: str, error: Exception) -> Dict:
+    """validate_qid result for a Q-ID whose request failed."""
+    return {
+        "valid": False,
+        "error": f"Failed to fetch Q-ID {qid}: {error}"
+    }
+
+
+def evaluate_entity(qid: str, entities: Optional[Dict], expected_title: str) -> Dict:
+    """Build the validate_qid result for `qid` from a wbgetentities "entities" map."""
+    if not entities or qid not in entities:
+        return {
+            "valid": False,
+            "error": f"Q-ID {qid} not found in Wikidata"
         }
 
-        response = requests.get(url, params=params, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
-
-        if "entities" not in data or qid not in data["entities"]:
-            return {
-                "valid": False,
-                "error": f"Q-ID {qid} not found in Wikidata"
-            }
-
-        entity = data["entities"][qid]
-
-        # Check if entity exists (not deleted/missing)
-        if "missing" in entity:
-            return {
-                "valid": False,
-                "error": f"Q-ID {qid} is missing/deleted in Wikidata"
-            }
-
-        # Get label
-        if "labels" not in entity or "en" not in entity["labels"]:
-            return {
-                "valid": False,
-                "error": f"Q-ID {qid} has no English label"
-            }
-
-        wikidata_label = entity["labels"]["en"]["value"]
-        description = entity.get("descriptions", {}).get("en", {}).get("value", "")
-
-        # Calculate similarity
-        similarity = difflib.SequenceMatcher(
-            None,
-            expected_title.lower(),
-            wikidata_label.lower()
-        ).ratio()
-
-        # Validation threshold: 75% similarity
-        is_valid = similarity >= 0.75
+    entity = entities[qid]
 
+    # Check if entity exists (not deleted/missing)
+    if "missing" in entity:
         return {
-            "valid": is_valid,
-            "wikidata_label": wikidata_label,
-            "description": description,
-            "similarity": similarity,
-            "qid": qid
+            "valid": False,
+            "error": f"Q-ID {qid} is missing/deleted in Wikidata"
         }
 
-    except requests.RequestException as e:
+    # Get label
+    if "labels" not in entity or "en" not in entity["labels"]:
         return {
             "valid": False,
-            "error": f"Failed to fetch Q-ID {qid}: {e}"
+            "error": f"Q-ID {qid} has no English label"
         }
 
+    wikidata_label = entity["labels"]["en"]["value"]
+    description = entity.get("descriptions", {}).get("en", {}).get("value", "")
+
+    # Calculate similarity
+    similarity = difflib.SequenceMatcher(
+        None,
+        expected_title.lower(),
+        wikidata_label.lower()
+    ).ratio()
+
+    # Validation threshold: 75% similarity
+    is_valid = similarity >= 0.75
+
+    return {
+        "valid": is_valid,
+        "wikidata_label": wikidata_label,
+        "description": description,
+        "similarity": similarity,
+        "qid": qid
+    }
+
+
+# wbgetentities accepts up to 50 IDs per request
+MAX_IDS_PER_REQUEST = 50
+
+
+def validate_qids(
+    pairs: List[Tuple[str, str]],
+    batch_size: int = MAX_IDS_PER_REQUEST,
+    max_concurrency: int = 4,
+    timeout: int = 10
+) -> List[Dict]:
+    """
+    Validate many Q-IDs with a handful of batched wbgetentities requests
+
+    Distinct Q-IDs not in the offline index or the response cache are fetched
+    `batch_size` at a time, with at most `max_concurrency` requests in flight; every
+    request still takes a token from the shared rate limiter.
+
+    Args:
+        pairs: (qid, expected_title) tuples
+        batch_size: Q-IDs per request (capped at 50)
+        max_concurrency: Maximum concurrent requests
+        timeout: Request timeout in seconds
+
+    Returns:
+        One validate_qid-style result dict per pair, in input order. If a
+        request fails, each of its Q-IDs gets a "Failed to fetch" error.
+
+    Example:
+        >>> validate_qids([("Q161531", "War and Peace"), ("Q8337", "Harry Potter")])
+        [{'valid': True, 'wikidata_label': 'War and Peace', ...}, {...}]
+    """
+    entities, qids = cached_entities(pairs)
+
+    batch_size = max(1, min(batch_size, MAX_IDS_PER_REQUEST))
+    chunks = [qids[i:i + batch_size] for i in range(0, len(qids), batch_size)]
+
+    def fetch(chunk: List[str]) -> Tuple[List[str], Dict, Optional[Exception]]:
+        try:
+            data = _request_json(API_URL, build_entity_params(chunk), API_HEADERS, timeout)
+            return chunk, data.get("entities", {}), None
+        except requests.RequestException as e:
+            return chunk, {}, e
+
+    errors: Dict[str, Exception] = {}
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as pool:
+            for chunk, chunk_entities, error in pool.map(fetch, chunks):
+                if error is not None:
+                    errors.update({qid: error for qid in chunk})
+                    continue
+                entities.update(chunk_entities)
+                store_entities(chunk_entities)
+
+    results = []
+    for qid, expected_title in pairs:
+        if qid in errors:
+            results.append(fetch_failure(qid, errors[qid]))
+        else:
+            results.append(evaluate_entity(qid, entities, expected_title))
+    return results
+
+
+def cached_entities(pairs: List[Tuple[str, str]]) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Split the distinct Q-IDs of `pairs` into cached entities and Q-IDs to fetch.
+
+    Entities are cached one per Q-ID under the key validate_qid uses, so single
+    and bulk validation share entries. The offline index, when active, is
+    consulted first.
+    """
+    cache = get_cache()
+    entities, online = offline_entities(list(dict.fromkeys(qid for qid, _ in pairs)))
+    missing = []
+    for qid in online:
+        cached = cache.get("entity", {"url": API_URL, **build_entity_params([qid])})
+        if cached is not None and qid in cached.get("entities", {}):
+            entities[qid] = cached["entities"][qid]
+        else:
+            missing.append(qid)
+    return entities, missing
+
+
+def store_entities(entities: Dict[str, Dict]):
+    """Cache entities from a batched wbgetentities response, one entry per Q-ID."""
+    cache = get_cache()
+    for qid, entity in entities.items():
+        cache.set("entity", {"url": API_URL, **build_entity_params([qid])}, {"entities": {qid: entity}})
+
 
 def search_by_creator(creator_name: str, limit: int = 50, timeout: int = 10) -> List[Dict]:
     """
@@ -264,82 +659,177 @@ def search_by_creator(creator_name: str, limit: int = 50, timeout: int = 10) ->
 
     Returns:
         List of dicts with keys: qid, title, year, type
+
+    Results stop at `limit` rows; use iter_works_by_creator for creators
+    with more works than that.
     """
 
     try:
-        # Use Wikidata SPARQL endpoint
-        sparql_query = f"""
-        SELECT DISTINCT ?work ?workLabel ?year ?typeLabel WHERE {{
-          ?creator ?label "{creator_name}"@en .
-          ?work wdt:P50|wdt:P57|wdt:P170|wdt:P178 ?creator .
+        data = _get_json(SPARQL_URL, build_creator_params(creator_name, limit), SPARQL_HEADERS, timeout, "sparql")
+    except requests.RequestException as e:
+        raise WikidataSearchError(f"Wikidata SPARQL query failed: {e}")
+
+    return parse_creator_works(data)
+
+
+def parse_creator_works(data: Dict) -> List[Dict]:
+    """Works (qid, title, year, type) from the works-by-creator SPARQL response."""
+    works = []
+    for result in data.get("results", {}).get("bindings", []):
+        qid = result["work"]["value"].split("/")[-1]
+        title = result.get("workLabel", {}).get("value", "")
+        year = result.get("year", {}).get("value")
+        work_type = result.get("typeLabel", {}).get("value", "literary work")
+
+        if year:
+            year = int(year)
+
+        works.append({
+            "qid": qid,
+            "title": title,
+            "year": year,
+            "type": work_type
+        })
+
+    return works
+
+
+ENTITY_URI_PREFIX = "http://www.wikidata.org/entity/"
+
+# Server-side failures the SPARQL endpoint returns for queries that ran too
+# long; the page is retried at half size
+SPARQL_TIMEOUT_STATUSES = {500, 502, 504}
+
+
+def build_creator_page_params(creator_name: str, after: Optional[str], page_size: int) -> Dict:
+    """
+    SPARQL endpoint parameters for one keyset page of works by a creator.
+
+    Works are ordered by entity URI and a page holds the first `page_size`
+    works after the `after` Q-ID, so pages stay stable while the result set
+    is read and a page never splits a work's ?type rows.
+    """
+    name = creator_name.replace("\\", "\\\\").replace('"', '\\"')
+    cursor = f'FILTER(STR(?work) > "{ENTITY_URI_PREFIX}{after}")' if after else ""
+    sparql_query = f"""
+        SELECT ?work ?workLabel ?year ?typeLabel WHERE {{
+          {{
+            SELECT DISTINCT ?work WHERE {{
+              ?creator ?label "{name}"@en .
+              ?work wdt:P50|wdt:P57|wdt:P170|wdt:P178 ?creator .
+              {cursor}
+            }}
+            ORDER BY STR(?work)
+            LIMIT {page_size}
+          }}
           OPTIONAL {{ ?work wdt:P577 ?publicationDate . BIND(YEAR(?publicationDate) AS ?year) }}
           OPTIONAL {{ ?work wdt:P31 ?type }}
           SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en" }}
         }}
-        LIMIT {limit}
+        ORDER BY STR(?work)
         """
+    return {"query": sparql_query, "format": "json"}
 
-        url = "https://query.wikidata.org/sparql"
-        headers = {
-            "User-Agent": "Fictotum/1.0 (https://github.com/fictotum; Creator Search)",
-            "Accept": "application/json"
-        }
 
-        response = requests.get(
-            url,
-            params={"query": sparql_query, "format": "json"},
-            headers=headers,
-            timeout=timeout
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        works = []
-        for result in data.get("results", {}).get("bindings", []):
-            qid = result["work"]["value"].split("/")[-1]
-            title = result.get("workLabel", {}).get("value", "")
-            year = result.get("year", {}).get("value")
-            work_type = result.get("typeLabel", {}).get("value", "literary work")
+def merge_creator_works(works: List[Dict]) -> List[Dict]:
+    """
+    Collapse parse_creator_works rows to one work per Q-ID, in first-seen order.
 
-            if year:
-                year = int(year)
+    A work with several instance-of classes (or publication dates) comes back
+    once per combination; the merged work keeps its earliest year, the first
+    type as "type" and every type under "types".
+    """
+    merged: Dict[str, Dict] = {}
+    for work in works:
+        existing = merged.get(work["qid"])
+        if existing is None:
+            merged[work["qid"]] = {**work, "types": [work["type"]]}
+            continue
+        if work["year"] is not None and (existing["year"] is None or work["year"] < existing["year"]):
+            existing["year"] = work["year"]
+        if work["type"] not in existing["types"]:
+            existing["types"].append(work["type"])
+    return list(merged.values())
+
+
+def iter_works_by_creator(
+    creator_name: str,
+    page_size: int = 200,
+    after: Optional[str] = None,
+    max_works: Optional[int] = None,
+    timeout: int = 30,
+    max_retries: int = 3
+) -> Iterator[Dict]:
+    """
+    Yield every work by a creator, one keyset-paginated SPARQL page at a time
 
-            works.append({
-                "qid": qid,
-                "title": title,
-                "year": year,
-                "type": work_type
-            })
+    Unlike search_by_creator there is no overall limit: pages of `page_size`
+    works (ordered by Q-ID) are fetched until the creator runs out, and each
+    work is yielded once even when it has several types. A page that times
+    out is retried from the same cursor at half the size (never below 1);
+    later pages grow back towards `page_size`.
 
-        return works
+    Args:
+        creator_name: Name of creator (author, director, etc.)
+        page_size: Works per query
+        after: Resume after this Q-ID (the last one a previous run yielded)
+        max_works: Stop after this many works
+        timeout: Request timeout per page in seconds
+        max_retries: Consecutive failed attempts allowed for one page
 
-    except requests.RequestException as e:
-        raise WikidataSearchError(f"Wikidata SPARQL query failed: {e}")
+    Yields:
+        Dicts with keys: qid, title, year, type, types
 
+    Raises:
+        WikidataSearchError: When a page still fails after max_retries retries;
+            works already yielded stay valid and `after` can resume the run
 
-# Rate limiting helper
-_last_request_time = 0
-_min_request_interval = 0.5  # 500ms between requests
+    Example:
+        >>> for work in iter_works_by_creator("Isaac Asimov"):
+        ...     print(work["qid"], work["title"])
+    """
+    size = page_size
+    yielded = 0
+    failures = 0
+
+    while max_works is None or yielded < max_works:
+        params = build_creator_page_params(creator_name, after, size)
+        try:
+            data = _get_json(SPARQL_URL, params, SPARQL_HEADERS, timeout, "sparql")
+        except requests.RequestException as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            timed_out = isinstance(e, requests.Timeout) or status in SPARQL_TIMEOUT_STATUSES
+            failures += 1
+            if not timed_out or failures > max_retries:
+                raise WikidataSearchError(
+                    f"Wikidata SPARQL query failed after {after or 'start'}: {e}"
+                )
+            size = max(1, size // 2)
+            continue
+
+        failures = 0
+        works = merge_creator_works(parse_creator_works(data))
+        for work in works:
+            if max_works is not None and yielded >= max_works:
+                return
+            yield work
+            yielded += 1
+
+        if len(works) < size:
+            return
+        after = works[-1]["qid"]
+        size = min(page_size, size * 2)
 
 
 def rate_limited_request(func):
-    """Decorator to rate-limit Wikidata requests"""
+    """Decorator to rate-limit Wikidata requests (one api.php token per call)"""
     def wrapper(*args, **kwargs):
-        global _last_request_time
-
-        # Wait if needed
-        elapsed = time.time() - _last_request_time
-        if elapsed < _min_request_interval:
-            time.sleep(_min_request_interval - elapsed)
-
-        result = func(*args, **kwargs)
-        _last_request_time = time.time()
-
-        return result
+        get_limiter().acquire("api")
+        return func(*args, **kwargs)
 
     return wrapper
 
 
-# Apply rate limiting to public functions
-search_wikidata_for_work = rate_limited_request(search_wikidata_for_work)
-validate_qid = rate_limited_request(validate_qid)
+# Rate limiting is applied per network request in _request_json, through the
+# shared token buckets in rate_limiter.py, so responses served from the cache
+# are not delayed and concurrent threads and processes share one budget
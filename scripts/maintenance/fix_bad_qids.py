@@ -21,7 +21,10 @@ from neo4j import GraphDatabase
 
 # Add lib directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lib'))
-from wikidata_search import search_wikidata_for_work, validate_qid
+from wikidata_search import (
+    search_wikidata_for_works, validate_qid, WikidataSearchError,
+    add_offline_index_arguments, configure_offline_index_from_args
+)
 
 # Load environment variables
 load_dotenv()
@@ -103,19 +106,41 @@ def validate_existing_qids(session, limit=None):
     return suspicious
 
 
-def fix_work(session, work, dry_run=False):
-    """Attempt to find and update correct Q-ID for a work"""
+def work_year(work):
+    """Release year as a Python int (older drivers return Neo4j Integers)"""
+    year = work['release_year']
+    if year and hasattr(year, 'toNumber'):
+        year = year.toNumber()
+    return year
+
+
+def search_works(works):
+    """Search Wikidata for every work in one bulk call (deduplicated, concurrent)"""
+    print(f"\n🔎 Searching Wikidata for {len(works)} works...")
+    return search_wikidata_for_works([
+        {
+            'title': work['title'],
+            'creator': work['creator'],
+            'year': work_year(work),
+            'media_type': work['media_type']
+        }
+        for work in works
+    ])
+
+
+def fix_work(session, work, result, dry_run=False):
+    """
+    Update a work with the Q-ID found by search_works
+
+    `result` is that work's search result: a match dict, None (no match) or
+    a WikidataSearchError.
+    """
 
     media_id = work['media_id']
     title = work['title']
     old_qid = work['wikidata_id']
     creator = work['creator']
-    year = work['release_year']
-    media_type = work['media_type']
-
-    # Convert Neo4j Integer to Python int
-    if year and hasattr(year, 'toNumber'):
-        year = year.toNumber()
+    year = work_year(work)
 
     print(f"\n{'[DRY RUN] ' if dry_run else ''}Fixing: {title}")
     print(f"  Media ID: {media_id}")
@@ -123,14 +148,9 @@ def fix_work(session, work, dry_run=False):
     print(f"  Creator: {creator or 'Unknown'}")
     print(f"  Year: {year or 'Unknown'}")
 
-    # Search Wikidata
     try:
-        result = search_wikidata_for_work(
-            title=title,
-            creator=creator,
-            year=year,
-            media_type=media_type
-        )
+        if isinstance(result, WikidataSearchError):
+            raise result
 
         if result is None:
             print(f"  ❌ No good match found in Wikidata")
@@ -177,8 +197,10 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be fixed without making changes')
     parser.add_argument('--limit', type=int, help='Only process first N works')
     parser.add_argument('--validate-existing', action='store_true', help='Validate existing Q-IDs instead of just missing ones')
+    add_offline_index_arguments(parser)
 
     args = parser.parse_args()
+    configure_offline_index_from_args(args)
 
     print("="*80)
     print("WIKIDATA Q-ID FIX SCRIPT")
@@ -206,8 +228,9 @@ def main():
             fixed_count = 0
             failed_count = 0
 
-            for work in suspicious_works:
-                success = fix_work(session, work, dry_run=args.dry_run)
+            results = search_works(suspicious_works)
+            for work, result in zip(suspicious_works, results):
+                success = fix_work(session, work, result, dry_run=args.dry_run)
                 if success:
                     fixed_count += 1
                 else:
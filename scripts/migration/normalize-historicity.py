@@ -18,23 +18,19 @@ Usage:
 
 import os
 import sys
-import time
 import argparse
 from pathlib import Path
 from typing import Dict, List, Set
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-import requests
 
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
-SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
-SPARQL_HEADERS = {
-    "Accept": "application/sparql-results+json",
-    "User-Agent": "FictotumHistoricity/1.0 (https://fictotum.com)"
-}
-SPARQL_DELAY = 1.5
-BATCH_SIZE = 50
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lib.sparql_executor import SparqlExecutor
+
+SPARQL_USER_AGENT = "FictotumHistoricity/1.0 (https://fictotum.com)"
 
 # Wikidata P31 (instance-of) Q-IDs for classification
 FICTIONAL_QIDS = {"Q15632617", "Q95074", "Q15773347", "Q14514600"}  # fictional human, fictional character, etc.
@@ -56,32 +52,6 @@ NORMALIZE_MAP = {
 }
 
 
-def sparql_query(query: str, retries: int = 3) -> list:
-    for attempt in range(retries):
-        try:
-            resp = requests.get(
-                SPARQL_ENDPOINT,
-                params={"query": query},
-                headers=SPARQL_HEADERS,
-                timeout=60
-            )
-            if resp.status_code == 429:
-                wait = int(resp.headers.get("Retry-After", 30))
-                print(f"  Rate limited, waiting {wait}s...")
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            return resp.json()["results"]["bindings"]
-        except requests.exceptions.RequestException as e:
-            if attempt < retries - 1:
-                print(f"  SPARQL error (attempt {attempt+1}): {e}")
-                time.sleep(5 * (attempt + 1))
-            else:
-                print(f"  SPARQL failed after {retries} attempts: {e}")
-                return []
-    return []
-
-
 def qid(uri: str) -> str:
     return uri.split("/")[-1]
 
@@ -123,23 +93,22 @@ def get_null_status_figures(driver) -> List[Dict]:
         return [dict(r) for r in result]
 
 
-def classify_via_wikidata(figure_qids: List[str]) -> Dict[str, str]:
-    """Query Wikidata P31 for a batch of Q-IDs and classify them."""
-    if not figure_qids:
-        return {}
-
-    values = " ".join(f"wd:{q}" for q in figure_qids)
-    query = f"""
-    SELECT ?person ?type WHERE {{
-      VALUES ?person {{ {values} }}
+INSTANCE_OF_QUERY = """
+    SELECT ?person ?type WHERE {
+      VALUES ?person { {values} }
       ?person wdt:P31 ?type .
-    }}
+    }
     """
-    results = sparql_query(query)
+
+
+def classify_via_wikidata(executor: SparqlExecutor, figure_qids: List[str]) -> Dict[str, str]:
+    """Query Wikidata P31 for Q-IDs and classify them."""
+    if not figure_qids:
+        return {}
 
     # Build a map of person -> set of types
     type_map: Dict[str, Set[str]] = {}
-    for r in results:
+    for r in executor.run(INSTANCE_OF_QUERY, figure_qids):
         person_id = qid(r["person"]["value"])
         type_id = qid(r["type"]["value"])
         if person_id not in type_map:
@@ -196,15 +165,9 @@ def backfill_nulls(driver, figures: List[Dict], dry_run: bool) -> Dict[str, int]
 
     # Batch-query Wikidata for figures with Q-IDs
     qid_list = [f["wid"] for f in with_qid]
-    all_classifications: Dict[str, str] = {}
-
-    for i in range(0, len(qid_list), BATCH_SIZE):
-        batch = qid_list[i:i + BATCH_SIZE]
-        print(f"  Batch {i // BATCH_SIZE + 1}: querying {len(batch)} figures...")
-        classifications = classify_via_wikidata(batch)
-        all_classifications.update(classifications)
-        if i + BATCH_SIZE < len(qid_list):
-            time.sleep(SPARQL_DELAY)
+    executor = SparqlExecutor(user_agent=SPARQL_USER_AGENT)
+    all_classifications = classify_via_wikidata(executor, qid_list)
+    print(f"  {executor.summary_line()}")
 
     # Apply Wikidata classifications
     for fig in with_qid:
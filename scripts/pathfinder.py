@@ -7,11 +7,22 @@ Finds connections between historical figures through:
 - APPEARS_IN relationships (media portrayals)
 - Bridges via FictionalCharacters and shared MediaWorks
 
+Shortest paths can also be answered from an in-memory snapshot of the
+traversed subgraph (lib/graph_snapshot.py) instead of a Cypher query per
+request; see FictotumPathfinder.load_snapshot(). Degrees of separation are
+bounded (often answered outright) by a precomputed landmark distance index
+(lib/landmark_index.py); see FictotumPathfinder.load_landmarks().
+
 Database: Neo4j Aura (c78564a4)
 """
 
 import os
+import sys
 import json
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -19,6 +30,12 @@ from dotenv import load_dotenv
 from neo4j import GraphDatabase
 from neo4j.exceptions import ServiceUnavailable, AuthError
 
+sys.path.append(str(Path(__file__).parent))
+
+from lib.graph_snapshot import GraphSnapshot, MAX_PATH_DEPTH
+from lib.landmark_index import LandmarkIndex, DEFAULT_INDEX_PATH
+from lib.node_lookup import lookup_nodes
+
 
 class BridgeType(str, Enum):
     """Types of bridges in historiographic paths."""
@@ -67,12 +84,66 @@ class FictotumPathfinder:
         if uri.startswith("neo4j+s://"):
             uri = uri.replace("neo4j+s://", "neo4j+ssc://")
         self.driver = GraphDatabase.driver(uri, auth=(username, password))
+        self.snapshot: Optional[GraphSnapshot] = None
+        self.landmarks: Optional[LandmarkIndex] = None
+
+    def load_snapshot(self, path: Optional[Path] = None, refresh: bool = False) -> GraphSnapshot:
+        """
+        Answer shortest-path queries from an in-memory snapshot from now on.
+
+        Args:
+            path: Snapshot file; read if it exists (unless refresh), else
+                written after loading from Neo4j
+            refresh: Reload from Neo4j even if `path` exists
+
+        Returns:
+            The loaded snapshot
+        """
+        if path and Path(path).exists() and not refresh:
+            self.snapshot = GraphSnapshot.load_file(path)
+        else:
+            self.snapshot = GraphSnapshot.load(self.driver)
+            if path:
+                self.snapshot.save(path)
+        return self.snapshot
+
+    def load_landmarks(self, path: Path = DEFAULT_INDEX_PATH, allow_stale: bool = False) -> Optional[LandmarkIndex]:
+        """
+        Bound degrees-of-separation queries with a landmark index from now on.
+
+        Build the index with `python3 scripts/lib/landmark_index.py build`.
+
+        Args:
+            path: Index file
+            allow_stale: Use the index even if the graph has new ingestion
+                batches since it was built (bounds may then be wrong)
+
+        Returns:
+            The loaded index, or None if it is missing or stale
+        """
+        self.landmarks = None
+        if not Path(path).exists():
+            print(f"[WARN] No landmark index at {path}", file=sys.stderr)
+            return None
+        index = LandmarkIndex.load(path)
+        if not allow_stale and index.is_stale(self.driver):
+            print(f"[WARN] Landmark index {path} is stale (built at graph version {index.version}); "
+                  f"rebuild with: python3 scripts/lib/landmark_index.py build", file=sys.stderr)
+            return None
+        self.landmarks = index
+        return index
 
     def close(self):
         """Close the database connection."""
         self.driver.close()
 
-    def find_shortest_path(self, start_id: str, end_id: str) -> Optional[dict]:
+    def find_shortest_path(
+        self,
+        start_id: str,
+        end_id: str,
+        max_hub_degree: Optional[int] = None,
+        hub_penalty: float = 0.0
+    ) -> Optional[dict]:
         """
         Find shortest path between two HistoricalFigures.
 
@@ -80,178 +151,380 @@ class FictotumPathfinder:
         - INTERACTED_WITH (Historical social connections)
         - APPEARS_IN (Fictional media portrayals)
 
+        With a snapshot loaded, the search runs locally (bidirectional BFS)
+        and only the path's nodes are fetched from Neo4j; figures missing
+        from the snapshot fall back to the Cypher query.
+
+        Large MediaWorks (HBO Rome, Assassin's Creed) link hundreds of
+        figures, so unrestricted paths are often a trivial "both appear in X".
+        max_hub_degree and hub_penalty steer around them; either one runs
+        the search over the snapshot (loaded on first use). The Cypher
+        query cannot apply them, so a figure missing from the snapshot
+        gives None (with a warning) rather than an unrestricted path.
+
         Args:
             start_id: canonical_id of starting HistoricalFigure
             end_id: canonical_id of ending HistoricalFigure
+            max_hub_degree: Never pass through nodes with more relationships
+                than this (the search also skips expanding them)
+            hub_penalty: Find the cheapest path where stepping onto a node
+                costs 1 + hub_penalty * ln(degree) (Dijkstra), instead of the
+                fewest hops; around 1.0 favours specific connections
 
         Returns:
             JSON-formatted dictionary with path details and bridge highlights,
-            or None if no path exists.
+            or None if no path exists (or the search failed; the error is
+            printed to stderr).
         """
-        with self.driver.session() as session:
-            try:
-                result = session.run("""
-                    MATCH (start:HistoricalFigure {canonical_id: $start_id}),
-                          (end:HistoricalFigure {canonical_id: $end_id})
-                    MATCH path = shortestPath(
-                        (start)-[*..10]-(end)
-                    )
-                    WHERE ALL(rel IN relationships(path)
-                        WHERE type(rel) IN ['INTERACTED_WITH', 'APPEARS_IN'])
-                    RETURN path,
-                           nodes(path) as path_nodes,
-                           relationships(path) as path_rels,
-                           length(path) as path_length
-                    LIMIT 1
-                """, start_id=start_id, end_id=end_id)
-
-                record = result.single()
-                if not record:
-                    return None
+        try:
+            return self._shortest_path(start_id, end_id, max_hub_degree, hub_penalty)
+        except Exception as e:
+            print(f"[ERROR] Failed to find path: {e}", file=sys.stderr)
+            return None
+
+    def _shortest_path(
+        self,
+        start_id: str,
+        end_id: str,
+        max_hub_degree: Optional[int] = None,
+        hub_penalty: float = 0.0
+    ) -> Optional[dict]:
+        """find_shortest_path, raising on errors."""
+        hub_aware = max_hub_degree is not None or hub_penalty > 0
+        if hub_aware and self.snapshot is None:
+            self.load_snapshot()
+
+        if self.snapshot is not None:
+            start = self.snapshot.figure_index.get(start_id)
+            end = self.snapshot.figure_index.get(end_id)
+            if start is not None and end is not None:
+                return self._find_snapshot_path(start_id, end_id, start, end, max_hub_degree, hub_penalty)
+            if hub_aware:
+                missing = start_id if start is None else end_id
+                print(f"[WARN] {missing} is not in the graph snapshot; "
+                      f"max_hub_degree/hub_penalty need it, no path returned", file=sys.stderr)
+                return None
 
-                # Parse the path
-                path_nodes = record["path_nodes"]
-                path_rels = record["path_rels"]
-                path_length = record["path_length"]
-
-                # Build structured path representation
-                nodes = []
-                relationships = []
-                bridges = []
-
-                # Process nodes
-                for idx, node in enumerate(path_nodes):
-                    labels = list(node.labels)
-                    node_type = labels[0] if labels else "Unknown"
-
-                    # Extract node properties
-                    props = dict(node)
-                    node_id = props.get("canonical_id") or props.get("media_id") or props.get("char_id")
-                    name = props.get("name") or props.get("title", "Unknown")
-
-                    path_node = PathNode(
-                        node_type=node_type,
-                        node_id=node_id,
-                        name=name,
-                        properties=props
-                    )
-                    nodes.append(path_node)
-
-                    # Detect bridges
-                    if node_type == "FictionalCharacter":
-                        bridges.append({
-                            "position": idx,
-                            "type": BridgeType.FICTIONAL_CHARACTER.value,
-                            "node_id": node_id,
-                            "name": name,
-                            "description": f"Path bridged by fictional character '{name}'"
-                        })
-                    elif node_type == "MediaWork":
-                        bridges.append({
-                            "position": idx,
-                            "type": BridgeType.SHARED_MEDIA.value,
-                            "node_id": node_id,
-                            "name": name,
-                            "description": f"Path bridged by shared media work '{name}'"
-                        })
-
-                # Process relationships
-                for idx, rel in enumerate(path_rels):
-                    rel_type = rel.type
-                    from_node = nodes[idx].node_id
-                    to_node = nodes[idx + 1].node_id
-
-                    # Determine bridge type
-                    bridge_type = BridgeType.NONE
-                    context = dict(rel).get("context") or dict(rel).get("sentiment")
-
-                    if rel_type == "INTERACTED_WITH":
-                        bridge_type = BridgeType.HISTORICAL_INTERACTION
-                    elif rel_type == "APPEARS_IN":
-                        # Check if next node is MediaWork (indicating fictional bridge)
-                        if nodes[idx + 1].node_type == "MediaWork":
-                            bridge_type = BridgeType.SHARED_MEDIA
-
-                    path_rel = PathRelationship(
-                        rel_type=rel_type,
-                        from_node=from_node,
-                        to_node=to_node,
-                        bridge_type=bridge_type,
-                        context=str(context) if context else None
-                    )
-                    relationships.append(path_rel)
-
-                # Create final path object
-                historiographic_path = HistoriographicPath(
-                    start_node=start_id,
-                    end_node=end_id,
-                    path_length=path_length,
-                    nodes=nodes,
-                    relationships=relationships,
-                    bridges=bridges,
-                    total_bridges=len(bridges)
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (start:HistoricalFigure {canonical_id: $start_id}),
+                      (end:HistoricalFigure {canonical_id: $end_id})
+                MATCH path = shortestPath(
+                    (start)-[*..10]-(end)
                 )
-
-                # Convert to JSON-serializable dict
-                return self._to_json_dict(historiographic_path)
-
-            except Exception as e:
-                print(f"[ERROR] Failed to find path: {e}")
+                WHERE ALL(rel IN relationships(path)
+                    WHERE type(rel) IN ['INTERACTED_WITH', 'APPEARS_IN'])
+                RETURN path,
+                       nodes(path) as path_nodes,
+                       relationships(path) as path_rels,
+                       length(path) as path_length
+                LIMIT 1
+            """, start_id=start_id, end_id=end_id)
+
+            record = result.single()
+            if not record:
                 return None
 
-    def find_all_paths(self, start_id: str, end_id: str, max_paths: int = 5) -> list[dict]:
+            return self._build_path(
+                start_id,
+                end_id,
+                [(list(node.labels), dict(node)) for node in record["path_nodes"]],
+                [(rel.type, dict(rel)) for rel in record["path_rels"]]
+            )
+
+    def _find_snapshot_path(
+        self,
+        start_id: str,
+        end_id: str,
+        start: int,
+        end: int,
+        max_hub_degree: Optional[int] = None,
+        hub_penalty: float = 0.0
+    ) -> Optional[dict]:
+        """find_shortest_path over the snapshot; nodes are hydrated in one query."""
+        if hub_penalty > 0:
+            found = self.snapshot.weighted_path(start, end, hub_penalty, max_hub_degree)
+        elif max_hub_degree is not None:
+            hubs = self.snapshot.hubs(max_hub_degree, keep=(start, end))
+            found = self.snapshot.shortest_path(start, end, excluded_nodes=hubs)
+        else:
+            found = self.snapshot.shortest_path(start, end)
+        if found is None:
+            return None
+        paths = self._build_snapshot_paths(start_id, end_id, [found])
+        if not paths:
+            # Nodes deleted since the snapshot was taken
+            self.snapshot = None
+            return self._shortest_path(start_id, end_id, max_hub_degree, hub_penalty)
+        return paths[0]
+
+    def _hydrate_nodes(self, element_ids: list[str]) -> dict:
+        """(labels, properties) of nodes by elementId, in one query."""
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (n)
+                WHERE elementId(n) IN $element_ids
+                RETURN elementId(n) as element_id, labels(n) as node_labels, n
+            """, element_ids=list(set(element_ids)))
+            return {
+                record["element_id"]: (record["node_labels"], dict(record["n"]))
+                for record in result
+            }
+
+    def find_all_paths(
+        self,
+        start_id: str,
+        end_id: str,
+        max_paths: int = 5,
+        node_disjoint: bool = False,
+        time_budget: float = 2.0
+    ) -> list[dict]:
         """
         Find multiple paths between two HistoricalFigures.
 
+        Runs Yen's k-shortest-paths over the graph snapshot (loaded on first
+        use), so results include longer alternatives, not just ties for the
+        shortest. Nodes of all paths are hydrated with a single query.
+
         Args:
             start_id: canonical_id of starting HistoricalFigure
             end_id: canonical_id of ending HistoricalFigure
             max_paths: Maximum number of paths to return
+            node_disjoint: Only return paths sharing no intermediate nodes
+            time_budget: Seconds to spend searching; paths found so far are
+                returned when it runs out
+
+        Returns:
+            List of JSON-formatted path dictionaries (as find_shortest_path),
+            shortest first; empty if the search failed (the error is
+            printed to stderr)
+        """
+        try:
+            return self._all_paths(start_id, end_id, max_paths, node_disjoint, time_budget)
+        except Exception as e:
+            print(f"[ERROR] Failed to find all paths: {e}", file=sys.stderr)
+            return []
+
+    def _all_paths(
+        self,
+        start_id: str,
+        end_id: str,
+        max_paths: int = 5,
+        node_disjoint: bool = False,
+        time_budget: float = 2.0
+    ) -> list[dict]:
+        """find_all_paths, raising on errors."""
+        deadline = time.perf_counter() + time_budget
+        if self.snapshot is None:
+            self.load_snapshot()
+
+        start = self.snapshot.figure_index.get(start_id)
+        end = self.snapshot.figure_index.get(end_id)
+        if start is None or end is None:
+            return self._find_all_shortest_paths(start_id, end_id, max_paths)
+
+        found = self.snapshot.k_shortest_paths(
+            start, end, max_paths, node_disjoint=node_disjoint, deadline=deadline
+        )
+        return self._build_snapshot_paths(start_id, end_id, found)
+
+    def find_paths_batch(
+        self,
+        pairs: list[tuple[str, str]],
+        workers: int = 1,
+        hydrate: bool = True
+    ) -> list[Union[dict, int, None]]:
+        """
+        Find shortest paths for many figure pairs at once.
+
+        Pairs are grouped by a shared endpoint (the figure that occurs in
+        the most pairs), and each group is answered by one multi-target BFS
+        over the graph snapshot (loaded on first use). Nodes of every path
+        are then hydrated with a single query. Pairs with figures missing
+        from the snapshot fall back to find_shortest_path.
+
+        Args:
+            pairs: (start_id, end_id) canonical_id pairs
+            workers: Threads to spread the BFS groups over (NumPy releases
+                the GIL for the bulk of each search)
+            hydrate: Build full path dictionaries; if False, return only the
+                number of hops and skip node hydration (Neo4j is still
+                queried to load the snapshot on first use, and once per
+                pair with a figure missing from it)
 
         Returns:
-            List of JSON-formatted path dictionaries
+            One entry per pair, in order: a path dictionary (as
+            find_shortest_path) or, without hydrate, the number of hops;
+            None where no path exists, and for every pair if the search
+            failed (the error is printed to stderr)
+        """
+        try:
+            return self._paths_batch(pairs, workers, hydrate)
+        except Exception as e:
+            print(f"[ERROR] Failed to find paths: {e}", file=sys.stderr)
+            return [None] * len(pairs)
+
+    def _paths_batch(
+        self,
+        pairs: list[tuple[str, str]],
+        workers: int = 1,
+        hydrate: bool = True
+    ) -> list[Union[dict, int, None]]:
+        """find_paths_batch, raising on errors."""
+        if self.snapshot is None:
+            self.load_snapshot()
+        snapshot = self.snapshot
+        index = snapshot.figure_index
+
+        frequency = Counter(figure_id for pair in pairs for figure_id in pair)
+        groups: dict[int, set[int]] = defaultdict(set)
+        oriented = []  # (source, target, reversed) per pair, None if not in the snapshot
+        for start_id, end_id in pairs:
+            start, end = index.get(start_id), index.get(end_id)
+            if start is None or end is None:
+                oriented.append(None)
+                continue
+            flip = frequency[end_id] > frequency[start_id]
+            source, target = (end, start) if flip else (start, end)
+            groups[source].add(target)
+            oriented.append((source, target, flip))
+
+        def search(group):
+            source, targets = group
+            return source, snapshot.paths_from(source, targets)
+
+        if workers > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                found = dict(pool.map(search, groups.items()))
+        else:
+            found = dict(search(group) for group in groups.items())
+
+        results: list[Union[dict, int, None]] = [None] * len(pairs)
+        to_build = []
+        for i, entry in enumerate(oriented):
+            if entry is None:
+                continue
+            source, target, flip = entry
+            path = found[source][target]
+            if path is None:
+                continue
+            nodes, edges = path
+            if flip:
+                nodes, edges = nodes[::-1], edges[::-1]
+            if hydrate:
+                to_build.append((i, (nodes, edges)))
+            else:
+                results[i] = len(edges)
+
+        if to_build:
+            built = self._hydrate_snapshot_paths([(*pairs[i], path) for i, path in to_build])
+            if any(path is None for path in built):
+                self.snapshot = None  # nodes deleted since the snapshot was taken
+            for (i, _), path in zip(to_build, built):
+                results[i] = path if path is not None else self._shortest_path(*pairs[i])
+
+        for i, entry in enumerate(oriented):
+            if entry is None:
+                path = self._shortest_path(*pairs[i])
+                results[i] = path if hydrate or path is None else path["path_length"]
+        return results
+
+    def _build_snapshot_paths(
+        self,
+        start_id: str,
+        end_id: str,
+        found: list[tuple[list[int], list[int]]]
+    ) -> list[dict]:
+        """Path dictionaries for snapshot paths, hydrating every node in one query."""
+        paths = self._hydrate_snapshot_paths([(start_id, end_id, path) for path in found])
+        return [path for path in paths if path is not None]
+
+    def _hydrate_snapshot_paths(
+        self,
+        items: list[tuple[str, str, tuple[list[int], list[int]]]]
+    ) -> list[Optional[dict]]:
         """
+        Path dictionaries for (start_id, end_id, snapshot path) items, with
+        one hydration query for all of them. None for paths with a node
+        deleted since the snapshot was taken.
+        """
+        element_ids = [self.snapshot.element_ids[i] for _, _, (nodes, _) in items for i in nodes]
+        hydrated = self._hydrate_nodes(element_ids)
+
+        paths = []
+        for start_id, end_id, (node_indices, edge_indices) in items:
+            path_element_ids = [self.snapshot.element_ids[i] for i in node_indices]
+            if any(element_id not in hydrated for element_id in path_element_ids):
+                paths.append(None)
+                continue
+            paths.append(self._build_path(
+                start_id,
+                end_id,
+                [hydrated[element_id] for element_id in path_element_ids],
+                [
+                    (self.snapshot.edge_types[e], {"context": self.snapshot.edge_contexts[e]})
+                    for e in edge_indices
+                ]
+            ))
+        return paths
+
+    def _find_all_shortest_paths(self, start_id: str, end_id: str, max_paths: int) -> list[dict]:
+        """allShortestPaths fallback for figures missing from the snapshot."""
         with self.driver.session() as session:
-            try:
-                result = session.run("""
-                    MATCH (start:HistoricalFigure {canonical_id: $start_id}),
-                          (end:HistoricalFigure {canonical_id: $end_id})
-                    MATCH path = allShortestPaths(
-                        (start)-[*..10]-(end)
-                    )
-                    WHERE ALL(rel IN relationships(path)
-                        WHERE type(rel) IN ['INTERACTED_WITH', 'APPEARS_IN'])
-                    RETURN path,
-                           nodes(path) as path_nodes,
-                           relationships(path) as path_rels,
-                           length(path) as path_length
-                    LIMIT $max_paths
-                """, start_id=start_id, end_id=end_id, max_paths=max_paths)
-
-                paths = []
-                for record in result:
-                    # Reuse single path parsing logic
-                    # (simplified for brevity - would extract to shared method)
-                    paths.append({
-                        "path_length": record["path_length"],
-                        "node_count": len(record["path_nodes"]),
-                        "relationship_count": len(record["path_rels"])
-                    })
-
-                return paths
-
-            except Exception as e:
-                print(f"[ERROR] Failed to find all paths: {e}")
-                return []
+            result = session.run("""
+                MATCH (start:HistoricalFigure {canonical_id: $start_id}),
+                      (end:HistoricalFigure {canonical_id: $end_id})
+                MATCH path = allShortestPaths(
+                    (start)-[*..10]-(end)
+                )
+                WHERE ALL(rel IN relationships(path)
+                    WHERE type(rel) IN ['INTERACTED_WITH', 'APPEARS_IN'])
+                RETURN nodes(path) as path_nodes,
+                       relationships(path) as path_rels
+                LIMIT $max_paths
+            """, start_id=start_id, end_id=end_id, max_paths=max_paths)
+
+            return [
+                self._build_path(
+                    start_id,
+                    end_id,
+                    [(list(node.labels), dict(node)) for node in record["path_nodes"]],
+                    [(rel.type, dict(rel)) for rel in record["path_rels"]]
+                )
+                for record in result
+            ]
 
     def find_degrees_of_separation(self, start_id: str, end_id: str) -> Optional[int]:
         """
         Calculate degrees of separation between two figures.
 
+        With a landmark index loaded, its bounds answer the query outright
+        when they meet (or rule out any path within 10 hops); otherwise a
+        snapshot, if loaded, is searched no deeper than the upper bound and
+        no path nodes are fetched. Failing both, the full path is found.
+
         Returns:
             Number of hops in shortest path, or None if no path exists
         """
-        path = self.find_shortest_path(start_id, end_id)
+        max_depth = MAX_PATH_DEPTH
+        if self.landmarks is not None:
+            bounds = self.landmarks.bounds(start_id, end_id)
+            if bounds is not None:
+                lower, upper = bounds
+                if lower > MAX_PATH_DEPTH:
+                    return None
+                if lower == upper:
+                    return int(lower)
+                max_depth = int(min(upper, MAX_PATH_DEPTH))
+
+        if self.snapshot is not None:
+            start = self.snapshot.figure_index.get(start_id)
+            end = self.snapshot.figure_index.get(end_id)
+            if start is not None and end is not None:
+                found = self.snapshot.shortest_path(start, end, max_depth=max_depth)
+                return len(found[1]) if found else None
+
+        path = self._shortest_path(start_id, end_id)
         if path:
             return path["path_length"]
         return None
@@ -261,37 +534,137 @@ class FictotumPathfinder:
         Retrieve information about a specific node.
 
         Args:
-            node_id: canonical_id, media_id, or char_id
+            node_id: canonical_id, media_id, char_id or MediaWork Q-ID
 
         Returns:
             Node properties and label
         """
-        with self.driver.session() as session:
-            try:
-                result = session.run("""
-                    MATCH (n)
-                    WHERE n.canonical_id = $node_id
-                       OR n.media_id = $node_id
-                       OR n.char_id = $node_id
-                    RETURN n, labels(n) as node_labels
-                """, node_id=node_id)
-
-                record = result.single()
-                if not record:
-                    return None
+        return self.get_nodes_info([node_id]).get(node_id)
 
-                node = record["n"]
-                labels = record["node_labels"]
+    def get_nodes_info(self, node_ids: list[str]) -> dict[str, dict]:
+        """
+        Retrieve information about many nodes in one query.
 
-                return {
-                    "node_type": labels[0] if labels else "Unknown",
-                    "labels": labels,
-                    "properties": dict(node)
-                }
+        IDs are routed by shape (Q-ID, PROV:, HF_, MW_, FC_) to labelled,
+        indexed lookups; see lib/node_lookup.py.
 
-            except Exception as e:
-                print(f"[ERROR] Failed to get node info: {e}")
-                return None
+        Args:
+            node_ids: canonical_ids, media_ids, char_ids or MediaWork Q-IDs
+
+        Returns:
+            {node_id: node info (as get_node_info)} for the IDs found; empty
+            if the lookup failed (the error is printed to stderr)
+        """
+        try:
+            return self._nodes_info(node_ids)
+        except Exception as e:
+            print(f"[ERROR] Failed to get node info: {e}", file=sys.stderr)
+            return {}
+
+    def _nodes_info(self, node_ids: list[str]) -> dict[str, dict]:
+        """get_nodes_info, raising on errors."""
+        return {
+            node_id: {
+                "node_type": labels[0] if labels else "Unknown",
+                "labels": labels,
+                "properties": properties
+            }
+            for node_id, (labels, properties) in lookup_nodes(self.driver, node_ids).items()
+        }
+
+    def _build_path(
+        self,
+        start_id: str,
+        end_id: str,
+        path_nodes: list[tuple[list[str], dict]],
+        path_rels: list[tuple[str, dict]]
+    ) -> dict:
+        """
+        Build the JSON path dictionary, with bridge detection.
+
+        Args:
+            start_id: canonical_id of starting HistoricalFigure
+            end_id: canonical_id of ending HistoricalFigure
+            path_nodes: (labels, properties) of each node along the path
+            path_rels: (type, properties) of each relationship along the path
+        """
+        # Build structured path representation
+        nodes = []
+        relationships = []
+        bridges = []
+
+        # Process nodes
+        for idx, (labels, props) in enumerate(path_nodes):
+            node_type = labels[0] if labels else "Unknown"
+
+            # Extract node properties
+            node_id = props.get("canonical_id") or props.get("media_id") or props.get("char_id")
+            name = props.get("name") or props.get("title", "Unknown")
+
+            path_node = PathNode(
+                node_type=node_type,
+                node_id=node_id,
+                name=name,
+                properties=props
+            )
+            nodes.append(path_node)
+
+            # Detect bridges
+            if node_type == "FictionalCharacter":
+                bridges.append({
+                    "position": idx,
+                    "type": BridgeType.FICTIONAL_CHARACTER.value,
+                    "node_id": node_id,
+                    "name": name,
+                    "description": f"Path bridged by fictional character '{name}'"
+                })
+            elif node_type == "MediaWork":
+                bridges.append({
+                    "position": idx,
+                    "type": BridgeType.SHARED_MEDIA.value,
+                    "node_id": node_id,
+                    "name": name,
+                    "description": f"Path bridged by shared media work '{name}'"
+                })
+
+        # Process relationships
+        for idx, (rel_type, rel_props) in enumerate(path_rels):
+            from_node = nodes[idx].node_id
+            to_node = nodes[idx + 1].node_id
+
+            # Determine bridge type
+            bridge_type = BridgeType.NONE
+            context = rel_props.get("context") or rel_props.get("sentiment")
+
+            if rel_type == "INTERACTED_WITH":
+                bridge_type = BridgeType.HISTORICAL_INTERACTION
+            elif rel_type == "APPEARS_IN":
+                # Check if next node is MediaWork (indicating fictional bridge)
+                if nodes[idx + 1].node_type == "MediaWork":
+                    bridge_type = BridgeType.SHARED_MEDIA
+
+            path_rel = PathRelationship(
+                rel_type=rel_type,
+                from_node=from_node,
+                to_node=to_node,
+                bridge_type=bridge_type,
+                context=str(context) if context else None
+            )
+            relationships.append(path_rel)
+
+        # Create final path object
+        historiographic_path = HistoriographicPath(
+            start_node=start_id,
+            end_node=end_id,
+            path_length=len(path_rels),
+            nodes=nodes,
+            relationships=relationships,
+            bridges=bridges,
+            total_bridges=len(bridges)
+        )
+
+        # Convert to JSON-serializable dict
+        return self._to_json_dict(historiographic_path)
 
     def _to_json_dict(self, path: HistoriographicPath) -> dict:
         """Convert HistoriographicPath to JSON-serializable dictionary."""
@@ -383,8 +756,73 @@ def format_path_human_readable(path_dict: dict) -> str:
     return "\n".join(lines)
 
 
+def print_path_report(pathfinder: FictotumPathfinder, start_id: str, end_id: str):
+    """Print the path between two figures (readable and JSON) and their degrees of separation."""
+    print(f"Finding path between {start_id} and {end_id}")
+    print("-" * 70)
+
+    path = pathfinder.find_shortest_path(start_id, end_id)
+
+    if path:
+        print(format_path_human_readable(path))
+
+        # Also print JSON
+        print("\nJSON OUTPUT:")
+        print(json.dumps(path, indent=2))
+    else:
+        print("No path found between these figures.")
+
+    print("\n" + "=" * 70)
+    print("Degrees of Separation:")
+    degrees = pathfinder.find_degrees_of_separation(start_id, end_id)
+    print(f"{start_id} <-> {end_id}: {degrees} degrees")
+
+
+def serve(pathfinder: FictotumPathfinder, args):
+    """Run the long-lived service (see pathfinder_service.py) until interrupted."""
+    import asyncio
+    from pathfinder_service import PathfinderService
+
+    if args.snapshot:
+        pathfinder.load_snapshot(args.snapshot)
+        print(pathfinder.snapshot.summary_line(), file=sys.stderr)
+    if args.landmarks:
+        pathfinder.load_landmarks(args.landmarks)
+
+    service = PathfinderService(pathfinder, cache_size=args.cache_size,
+                                version_check_interval=args.version_interval,
+                                snapshot_path=args.snapshot, landmarks_path=args.landmarks)
+    try:
+        if args.stdin:
+            asyncio.run(service.serve_stdin())
+        else:
+            asyncio.run(service.serve_http(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
     """CLI interface for pathfinding."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Six Degrees of Historiography pathfinder")
+    sub = parser.add_subparsers(dest="command")
+    path_parser = sub.add_parser("path", help="Print the path between two figures (default)")
+    path_parser.add_argument("start_id", nargs="?", default="julius_caesar")
+    path_parser.add_argument("end_id", nargs="?", default="cleopatra_vii")
+    serve_parser = sub.add_parser("serve", help="Long-running service with a warm driver and result cache")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--stdin", action="store_true",
+                              help="Read JSON request lines from stdin instead of serving HTTP")
+    serve_parser.add_argument("--snapshot", type=Path,
+                              help="Answer from a graph snapshot (file is created if missing)")
+    serve_parser.add_argument("--landmarks", type=Path, help="Landmark index for degrees of separation")
+    serve_parser.add_argument("--cache-size", type=int, default=4096, help="Cached results (LRU)")
+    serve_parser.add_argument("--version-interval", type=float, default=30.0,
+                              help="Seconds between checks for new ingestion batches")
+    args = parser.parse_args()
+
     load_dotenv()
 
     uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -394,35 +832,24 @@ def main():
     if not password:
         raise ValueError("NEO4J_PASSWORD not found in environment variables")
 
-    print("=" * 70)
-    print("Fictotum Pathfinder - Six Degrees of Historiography")
-    print("=" * 70)
-    print(f"Connected to: Neo4j Aura (c78564a4)")
-    print()
-
     pathfinder = FictotumPathfinder(uri, username, password)
 
     try:
-        # Example: Find path between Julius Caesar and Cleopatra
-        print("Example: Finding path between Julius Caesar and Cleopatra VII")
-        print("-" * 70)
-
-        path = pathfinder.find_shortest_path("julius_caesar", "cleopatra_vii")
-
-        if path:
-            print(format_path_human_readable(path))
-
-            # Also print JSON
-            print("\nJSON OUTPUT:")
-            print(json.dumps(path, indent=2))
-        else:
-            print("No path found between these figures.")
-
-        # Example: Get degrees of separation
-        print("\n" + "=" * 70)
-        print("Degrees of Separation:")
-        degrees = pathfinder.find_degrees_of_separation("julius_caesar", "cleopatra_vii")
-        print(f"Julius Caesar <-> Cleopatra VII: {degrees} degrees")
+        if args.command == "serve":
+            serve(pathfinder, args)
+            return
+
+        print("=" * 70)
+        print("Fictotum Pathfinder - Six Degrees of Historiography")
+        print("=" * 70)
+        print(f"Connected to: Neo4j Aura (c78564a4)")
+        print()
+
+        print_path_report(
+            pathfinder,
+            getattr(args, "start_id", "julius_caesar"),
+            getattr(args, "end_id", "cleopatra_vii")
+        )
 
     except (ServiceUnavailable, AuthError) as e:
         print(f"\n[ERROR] Database connection failed: {e}")
@@ -0,0 +1,355 @@
+"""
+Fictotum Pathfinder Service
+
+Long-running asyncio front end for FictotumPathfinder, so callers (the web
+app's pathfinder route, report scripts) skip driver start-up and repeated
+queries. One process keeps the Neo4j driver, graph snapshot and landmark
+index warm and answers requests from an LRU result cache.
+
+Cached results are keyed by (operation, figures, options) and dropped as a
+whole when graph_version() changes, i.e. when a new ingestion_batch lands;
+the snapshot is then reloaded and the landmark index rebuilt from it (and
+both written back to their files). A snapshot or index file older than the
+graph at start-up is refreshed the same way. Failed queries are reported
+as errors and never cached; diagnostics go to stderr.
+
+Protocols (requests and responses are JSON):
+
+- HTTP on 127.0.0.1:
+    GET  /shortest_path?start_id=julius_caesar&end_id=cleopatra_vii&hub_penalty=1
+    POST /all_paths   {"start_id": "...", "end_id": "...", "max_paths": 3}
+    GET  /health
+- stdin/stdout lines: one request object per line, e.g.
+    {"id": 1, "op": "degrees", "start_id": "julius_caesar", "end_id": "cleopatra_vii"}
+  answered by one response line echoing "id"
+
+Operations: shortest_path, all_paths, degrees, batch (with "pairs"), node
+(with "node_id"), nodes (with "node_ids", a list or comma-separated), stats.
+Responses are {"ok": true, "result": ..., "cached": bool} or
+{"ok": false, "error": "..."}.
+
+Usage:
+    python3 scripts/pathfinder.py serve --port 8765 --snapshot .cache/graph_snapshot.npz
+    python3 scripts/pathfinder.py serve --stdin
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.append(str(Path(__file__).parent))
+
+from lib.graph_snapshot import graph_version
+from lib.landmark_index import LandmarkIndex
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 4096
+
+# Seconds between graph_version() checks
+VERSION_CHECK_INTERVAL = 30.0
+
+# Request fields per operation and how to parse them (query-string values arrive as text)
+OPERATIONS: Dict[str, Dict[str, Callable]] = {
+    "shortest_path": {"start_id": str, "end_id": str, "max_hub_degree": int, "hub_penalty": float},
+    "all_paths": {"start_id": str, "end_id": str, "max_paths": int, "node_disjoint": "bool"},
+    "degrees": {"start_id": str, "end_id": str},
+    "batch": {"pairs": list, "hydrate": "bool"},
+    "node": {"node_id": str},
+    "nodes": {"node_ids": "ids"},
+    "stats": {},
+}
+
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """Raised for malformed or unknown requests"""
+    pass
+
+
+class PathCache:
+    """LRU of results, cleared as a whole when the graph version changes."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        # Bumped by clear(); results computed across a clear are not stored
+        self.generation = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return True, self.entries[key]
+        self.stats["misses"] += 1
+        return False, None
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None):
+        """Store a result, unless the cache was cleared since `generation`."""
+        if generation is not None and generation != self.generation:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.generation += 1
+        self.stats["invalidations"] += 1
+
+
+def parse_request(op: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and type-convert a request; returns {"op": ..., **options}."""
+    if op not in OPERATIONS:
+        raise RequestError(f"Unknown operation '{op}' (expected one of: {', '.join(OPERATIONS)})")
+    request = {"op": op}
+    for name, parse in OPERATIONS[op].items():
+        if fields.get(name) is None:
+            continue
+        value = fields[name]
+        try:
+            if parse == "bool":
+                request[name] = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+            elif parse == "ids":
+                request[name] = value.split(",") if isinstance(value, str) else [str(v) for v in value]
+            elif parse is list:
+                request[name] = [tuple(pair) for pair in (json.loads(value) if isinstance(value, str) else value)]
+            else:
+                request[name] = parse(value)
+        except (TypeError, ValueError) as e:
+            raise RequestError(f"Invalid {name}: {value!r} ({e})")
+    missing = [name for name in ("start_id", "end_id", "node_id", "node_ids", "pairs")
+               if name in OPERATIONS[op] and name not in request]
+    if missing:
+        raise RequestError(f"Missing {', '.join(missing)} for {op}")
+    return request
+
+
+class PathfinderService:
+    """Serves FictotumPathfinder queries from one warm process, with a result cache."""
+
+    def __init__(
+        self,
+        pathfinder,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        version_check_interval: float = VERSION_CHECK_INTERVAL,
+        snapshot_path: Optional[Path] = None,
+        landmarks_path: Optional[Path] = None
+    ):
+        """
+        Args:
+            pathfinder: FictotumPathfinder (snapshot / landmarks optionally loaded)
+            cache_size: Results kept in the LRU cache
+            version_check_interval: Seconds between graph_version() checks
+            snapshot_path: File the snapshot was loaded from; rewritten on reload
+            landmarks_path: File the landmark index was loaded from; rewritten on rebuild
+        """
+        self.pathfinder = pathfinder
+        self.snapshot_path = snapshot_path
+        self.landmarks_path = landmarks_path
+        self.cache = PathCache(cache_size)
+        self.version_check_interval = version_check_interval
+        self.version: Optional[str] = None
+        self.started_at = time.time()
+        self.requests = 0
+        # FictotumPathfinder swaps its snapshot on reload, so calls run one at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pathfinder")
+
+    async def _call(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def check_version(self) -> bool:
+        """
+        Drop cached results (and refresh snapshot and landmarks) if the graph
+        changed. The first check compares against the versions the snapshot
+        and landmark index were built at, so stale files are refreshed.
+        """
+        version = await self._call(graph_version, self.pathfinder.driver)
+        if version == self.version:
+            return False
+        if self.version is None:
+            self.version = version
+            if not self._stale(version):
+                return False
+        self.version = version
+        self.cache.clear()
+        await self._call(self._reload)
+        print(f"[INFO] Graph version now {version}; cache cleared", file=sys.stderr)
+        return True
+
+    def _stale(self, version: str) -> bool:
+        pathfinder = self.pathfinder
+        return any(
+            loaded is not None and loaded.version != version
+            for loaded in (pathfinder.snapshot, pathfinder.landmarks)
+        )
+
+    def _reload(self):
+        pathfinder = self.pathfinder
+        if pathfinder.snapshot is not None or self.snapshot_path:
+            pathfinder.snapshot = None
+            pathfinder.load_snapshot(self.snapshot_path, refresh=True)
+        if pathfinder.landmarks is None:
+            return
+        if pathfinder.snapshot is None:
+            # Nothing to rebuild from; stale bounds would give wrong answers
+            print("[WARN] Landmark index dropped (no snapshot to rebuild it from)", file=sys.stderr)
+            pathfinder.landmarks = None
+            return
+        pathfinder.landmarks = LandmarkIndex.build(pathfinder.snapshot, len(pathfinder.landmarks.landmark_ids))
+        if self.landmarks_path:
+            pathfinder.landmarks.save(self.landmarks_path)
+
+    async def watch_version(self):
+        """Background task: check graph_version() every version_check_interval seconds."""
+        while True:
+            await asyncio.sleep(self.version_check_interval)
+            try:
+                await self.check_version()
+            except Exception as e:
+                print(f"[WARN] Graph version check failed: {e}", file=sys.stderr)
+
+    async def handle(self, op: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one request; never raises."""
+        self.requests += 1
+        try:
+            request = parse_request(op, fields)
+            if op == "stats":
+                return {"ok": True, "result": self.stats(), "cached": False}
+
+            key = json.dumps(request, sort_keys=True)
+            hit, result = self.cache.get(key)
+            if not hit:
+                # A request queued ahead of a reload answers from the old
+                # snapshot; its result must not outlive the cache clear
+                generation = self.cache.generation
+                result = await self._call(self._run, request)
+                self.cache.set(key, result, generation)
+            return {"ok": True, "result": result, "cached": hit}
+        except RequestError as e:
+            return {"ok": False, "error": str(e), "status": 400}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}", "status": 500}
+
+    def _run(self, request: Dict[str, Any]) -> Any:
+        # The raising variants: a failed query must become an error response,
+        # not a cached None / [] / {}
+        pathfinder = self.pathfinder
+        options = {k: v for k, v in request.items() if k not in ("op", "start_id", "end_id")}
+        op = request["op"]
+        if op == "shortest_path":
+            return pathfinder._shortest_path(request["start_id"], request["end_id"], **options)
+        if op == "all_paths":
+            return pathfinder._all_paths(request["start_id"], request["end_id"], **options)
+        if op == "degrees":
+            return pathfinder.find_degrees_of_separation(request["start_id"], request["end_id"])
+        if op == "batch":
+            return pathfinder._paths_batch(request["pairs"], hydrate=request.get("hydrate", True))
+        if op == "nodes":
+            return pathfinder._nodes_info(request["node_ids"])
+        return pathfinder._nodes_info([request["node_id"]]).get(request["node_id"])
+
+    def stats(self) -> Dict[str, Any]:
+        pathfinder = self.pathfinder
+        return {
+            "version": self.version,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "cache_entries": len(self.cache.entries),
+            **self.cache.stats,
+            "snapshot": pathfinder.snapshot.summary_line() if pathfinder.snapshot is not None else None,
+            "landmarks": pathfinder.landmarks.summary_line() if pathfinder.landmarks is not None else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Protocols
+    # ------------------------------------------------------------------
+
+    async def serve_stdin(self):
+        """Answer JSON request lines from stdin until EOF."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        await self.check_version()
+        watcher = asyncio.create_task(self.watch_version())
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    fields = json.loads(line)
+                    if not isinstance(fields, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid JSON: {e}", "status": 400}
+                else:
+                    response = await self.handle(fields.get("op", ""), fields)
+                    if "id" in fields:
+                        response["id"] = fields["id"]
+                response.pop("status", None)
+                sys.stdout.write(json.dumps(response) + "\n")
+                sys.stdout.flush()
+        finally:
+            watcher.cancel()
+
+    async def serve_http(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        """Minimal HTTP/1.1 JSON server (one request per connection)."""
+        await self.check_version()
+        watcher = asyncio.create_task(self.watch_version())
+        server = await asyncio.start_server(self._http_connection, host, port)
+        print(f"Pathfinder service listening on http://{host}:{port} (graph version {self.version})",
+              file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+    async def _http_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status, body = await self._http_request(reader)
+        except Exception as e:
+            status, body = 400, {"ok": False, "error": f"Bad request: {e}"}
+        payload = json.dumps(body).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_STATUS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode("ascii") + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _http_request(self, reader: asyncio.StreamReader) -> Tuple[int, Dict[str, Any]]:
+        method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while (line := (await reader.readline()).decode("latin-1").strip()):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        op = url.path.strip("/")
+        fields: Dict[str, Any] = dict(parse_qsl(url.query))
+        if method == "POST":
+            length = int(headers.get("content-length", 0))
+            if length:
+                fields.update(json.loads(await reader.readexactly(length)))
+        elif method != "GET":
+            return 400, {"ok": False, "error": f"Unsupported method {method}"}
+
+        if op == "health":
+            return 200, {"ok": True, "result": self.stats()}
+        op = op or fields.get("op", "")
+        if op not in OPERATIONS:
+            return 404, {"ok": False, "error": f"Unknown operation '{op}'"}
+        response = await self.handle(op, fields)
+        return response.pop("status", 200), response
@@ -16,24 +16,20 @@ Usage:
 import os
 import sys
 import json
-import time
 import argparse
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Set, Optional
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
-import requests
 
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
-SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
-SPARQL_HEADERS = {
-    "Accept": "application/sparql-results+json",
-    "User-Agent": "FictotumOrphanConnector/1.0 (https://fictotum.com)"
-}
-SPARQL_DELAY = 1.5
-BATCH_SIZE = 50
+sys.path.append(str(Path(__file__).parent.parent))
+
+from lib.sparql_executor import SparqlExecutor
+
+SPARQL_USER_AGENT = "FictotumOrphanConnector/1.0 (https://fictotum.com)"
 
 # Media types we care about (Wikidata instance-of Q-IDs → our types)
 MEDIA_TYPE_MAP = {
@@ -54,32 +50,6 @@ MEDIA_TYPE_MAP = {
 }
 
 
-def sparql_query(query: str, retries: int = 3) -> list:
-    for attempt in range(retries):
-        try:
-            resp = requests.get(
-                SPARQL_ENDPOINT,
-                params={"query": query},
-                headers=SPARQL_HEADERS,
-                timeout=60
-            )
-            if resp.status_code == 429:
-                wait = int(resp.headers.get("Retry-After", 30))
-                print(f"  Rate limited, waiting {wait}s...")
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            return resp.json()["results"]["bindings"]
-        except requests.exceptions.RequestException as e:
-            if attempt < retries - 1:
-                print(f"  SPARQL error (attempt {attempt+1}): {e}")
-                time.sleep(5 * (attempt + 1))
-            else:
-                print(f"  SPARQL failed after {retries} attempts: {e}")
-                return []
-    return []
-
-
 def qid(uri: str) -> str:
     return uri.split("/")[-1]
 
@@ -109,41 +79,41 @@ def get_existing_work_qids(driver) -> Set[str]:
         return {r["wid"] for r in result}
 
 
-def query_figure_media_appearances(figure_qids: List[str]) -> List[dict]:
-    """Query Wikidata for media works featuring these figures.
-    Uses P1441 (present in work) and reverse P161 (cast member)."""
-    values = " ".join(f"wd:{q}" for q in figure_qids)
-    query = f"""
-    SELECT DISTINCT ?person ?work ?workLabel ?workTypeLabel ?year ?directorLabel WHERE {{
-      VALUES ?person {{ {values} }}
-      {{
+FIGURE_MEDIA_APPEARANCES_QUERY = """
+    SELECT DISTINCT ?person ?work ?workLabel ?workTypeLabel ?year ?directorLabel WHERE {
+      VALUES ?person { {values} }
+      {
         # Figure appears in work (P1441)
         ?person wdt:P1441 ?work .
-      }} UNION {{
+      } UNION {
         # Work has this figure as main subject (P921)
         ?work wdt:P921 ?person .
-      }} UNION {{
+      } UNION {
         # Work is about this figure (P180 - depicts)
         ?work wdt:P180 ?person .
-      }}
+      }
       # Get work type
-      OPTIONAL {{ ?work wdt:P31 ?workType . }}
+      OPTIONAL { ?work wdt:P31 ?workType . }
       # Get year
-      OPTIONAL {{ ?work wdt:P577 ?pubDate . BIND(YEAR(?pubDate) AS ?year) }}
-      OPTIONAL {{ ?work wdt:P57 ?director . }}
+      OPTIONAL { ?work wdt:P577 ?pubDate . BIND(YEAR(?pubDate) AS ?year) }
+      OPTIONAL { ?work wdt:P57 ?director . }
       # Filter to creative works (films, books, TV, etc.)
-      FILTER EXISTS {{ ?work wdt:P31 ?type .
-        VALUES ?type {{ wd:Q11424 wd:Q5398426 wd:Q7725634 wd:Q571 wd:Q8261
+      FILTER EXISTS { ?work wdt:P31 ?type .
+        VALUES ?type { wd:Q11424 wd:Q5398426 wd:Q7725634 wd:Q571 wd:Q8261
                         wd:Q25379 wd:Q7889 wd:Q24856 wd:Q20937557 wd:Q506240
-                        wd:Q21198342 wd:Q1004 wd:Q581714 }} }}
+                        wd:Q21198342 wd:Q1004 wd:Q581714 } }
       # Only modern media works (post-1800) — skip ancient manuscripts
       FILTER(!BOUND(?year) || ?year >= 1800)
-      SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
-    }}
+      SERVICE wikibase:label { bd:serviceParam wikibase:language "en". }
+    }
     """
-    results = sparql_query(query)
+
+
+def query_figure_media_appearances(executor: SparqlExecutor, figure_qids: List[str]) -> List[dict]:
+    """Query Wikidata for media works featuring these figures.
+    Uses P1441 (present in work) and reverse P161 (cast member)."""
     out = []
-    for r in results:
+    for r in executor.run(FIGURE_MEDIA_APPEARANCES_QUERY, figure_qids):
         out.append({
             "person_qid": qid(r["person"]["value"]),
             "work_qid": qid(r["work"]["value"]),
@@ -262,18 +232,12 @@ def main():
 
     # Step 3: Query Wikidata for appearances
     print("\nStep 3: Querying Wikidata for media appearances...")
-    all_appearances = []
     figure_qids = [o["wid"] for o in orphans]
-
-    for i in range(0, len(figure_qids), BATCH_SIZE):
-        batch = figure_qids[i:i + BATCH_SIZE]
-        print(f"  Batch {i // BATCH_SIZE + 1}: querying {len(batch)} figures...")
-        results = query_figure_media_appearances(batch)
-        all_appearances.extend(results)
-        if i + BATCH_SIZE < len(figure_qids):
-            time.sleep(SPARQL_DELAY)
+    executor = SparqlExecutor(user_agent=SPARQL_USER_AGENT)
+    all_appearances = query_figure_media_appearances(executor, figure_qids)
 
     print(f"  Total appearances found: {len(all_appearances)}")
+    print(f"  {executor.summary_line()}")
 
     # Deduplicate and filter out works with no proper title (just Q-IDs)
     seen = set()
@@ -11,6 +11,7 @@ Target: Create 500+ new PART_OF relationships
 Usage:
     python3 scripts/qa/link_series_relationships.py --dry-run
     python3 scripts/qa/link_series_relationships.py --execute
+    python3 scripts/qa/link_series_relationships.py --dry-run --refresh   # re-fetch cached entities
 """
 
 import os
@@ -25,6 +26,8 @@ from typing import Optional, List, Dict, Tuple
 sys.path.append(str(Path(__file__).parent.parent))
 
 from neo4j import GraphDatabase
+from lib.wikidata_cache import get_cache, configure_from_argv
+from lib.rate_limiter import get_limiter
 
 # Neo4j connection
 NEO4J_URI = os.getenv("NEO4J_URI")
@@ -45,10 +48,14 @@ def get_wikidata_entity(qid: str) -> dict:
         "User-Agent": "Fictotum/1.0 (CHR-79 Series Linking)"
     }
 
-    try:
+    def load() -> dict:
+        get_limiter().acquire("api")
         response = requests.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        return response.json()
+
+    try:
+        data = get_cache().fetch("entity", {"url": url, **params}, load)
 
         if "entities" in data and qid in data["entities"]:
             entity = data["entities"][qid]
@@ -587,10 +594,11 @@ def generate_report(driver, initial_stats, total_links_created):
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 scripts/qa/link_series_relationships.py [--dry-run|--execute]")
+        print("Usage: python3 scripts/qa/link_series_relationships.py [--dry-run|--execute] [--no-cache|--refresh]")
         sys.exit(1)
 
     dry_run = "--dry-run" in sys.argv
+    cache = configure_from_argv(sys.argv)
 
     if not all([NEO4J_URI, NEO4J_PASSWORD]):
         print("❌ Missing Neo4j credentials. Set NEO4J_URI and NEO4J_PASSWORD environment variables.")
@@ -639,6 +647,8 @@ def main():
             print("=" * 80)
 
     finally:
+        print(cache.summary_line())
+        print(get_limiter().summary_line())
         driver.close()
 
 
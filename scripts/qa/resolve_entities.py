@@ -14,6 +14,10 @@ from neo4j import GraphDatabase
 from SPARQLWrapper import SPARQLWrapper, JSON
 from thefuzz import fuzz
 
+sys.path.append(str(Path(__file__).parent.parent))
+from lib.wikidata_cache import get_cache, configure_from_argv
+from lib.rate_limiter import get_limiter
+
 # SPARQL endpoint for Wikidata
 WIKIDATA_SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
 
@@ -102,6 +106,12 @@ class EntityResolver:
         sparql.setReturnFormat(JSON)
 
         figures_with_qids = [fig for fig in self.figures.values() if fig.has_real_wikidata_id()]
+        cache = get_cache()
+        limiter = get_limiter()
+
+        def run_query():
+            limiter.acquire("sparql")
+            return sparql.query().convert()
 
         for idx, fig in enumerate(figures_with_qids, 1):
             if idx % 10 == 0:
@@ -110,7 +120,7 @@ class EntityResolver:
             try:
                 query = self._build_alias_query(fig.wikidata_id)
                 sparql.setQuery(query)
-                results = sparql.query().convert()
+                results = cache.fetch("sparql", query, run_query)
 
                 aliases = []
                 for result in results["results"]["bindings"]:
@@ -122,7 +132,8 @@ class EntityResolver:
             except Exception as e:
                 print(f"⚠️  Warning: Could not fetch aliases for {fig.canonical_id} ({fig.wikidata_id}): {e}")
 
-        print(f"✅ Alias enrichment complete.")
+        print(f"✅ Alias enrichment complete. {cache.summary_line()}")
+        print(f"   {limiter.summary_line()}")
 
     def _build_alias_query(self, wikidata_id: str) -> str:
         """Build SPARQL query to fetch aliases for a Wikidata entity."""
@@ -295,6 +306,7 @@ class EntityResolver:
 def main():
     """Main entry point for the duplicate entity resolver."""
     load_dotenv()
+    configure_from_argv(sys.argv)
 
     # Check Neo4j credentials
     uri = os.getenv("NEO4J_URI")
@@ -21,7 +21,10 @@ from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 from SPARQLWrapper import SPARQLWrapper, JSON
-import time
+
+sys.path.append(str(Path(__file__).parent.parent))
+from lib.wikidata_cache import get_cache, configure_from_argv
+from lib.rate_limiter import get_limiter
 
 
 class QIDResolver:
@@ -77,6 +80,11 @@ class QIDResolver:
 
             return figures
 
+    def _run_sparql(self) -> Dict:
+        """Run the prepared SPARQL query (cache miss path), paced by the shared SPARQL rate limiter."""
+        get_limiter().acquire("sparql")
+        return self.sparql.query().convert()
+
     def resolve_qid_for_figure(self, figure: Dict) -> Optional[str]:
         """
         Query Wikidata for Q-ID using name and lifespan.
@@ -128,10 +136,7 @@ class QIDResolver:
 
         try:
             self.sparql.setQuery(query)
-            results = self.sparql.query().convert()
-
-            # Rate limiting - be nice to Wikidata
-            time.sleep(0.5)
+            results = get_cache().fetch("sparql", query, self._run_sparql)
 
             bindings = results["results"]["bindings"]
 
@@ -302,6 +307,8 @@ class QIDResolver:
         print(f"Auto-resolved: {self.stats['auto_resolved']} ({100.0 * self.stats['auto_resolved'] / max(self.stats['total_figures'], 1):.1f}%)")
         print(f"Manual review: {len(self.manual_review_queue)}")
         print(f"Errors: {self.stats['errors']}")
+        print(get_cache().summary_line())
+        print(get_limiter().summary_line())
         print()
 
         if self.dry_run:
@@ -322,6 +329,7 @@ def main():
 
     # Parse command line arguments
     dry_run = "--execute" not in sys.argv
+    configure_from_argv(sys.argv)  # --no-cache / --refresh
 
     if dry_run:
         print("\n" + "⚠️ " * 20)
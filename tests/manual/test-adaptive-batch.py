@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for adaptive import batch sizing
+Checks the grow/shrink rules, the ceiling set by resource errors and the
+error classification of AdaptiveBatchSizer. Needs no database.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "lib"))
+
+from adaptive_batch import AdaptiveBatchSizer, is_resource_error
+
+
+class FakeNeo4jError(Exception):
+    """Stands in for neo4j.exceptions.Neo4jError, which carries a `code`"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+def test_is_resource_error():
+    assert is_resource_error(FakeNeo4jError("", code="Neo.TransientError.General.MemoryPoolOutOfMemoryError"))
+    assert is_resource_error(FakeNeo4jError("The transaction has been terminated",
+                                            code="Neo.ClientError.Transaction.TransactionTimedOut"))
+    assert is_resource_error(TimeoutError("read timed out"))
+    assert is_resource_error(RuntimeError("Transaction memory limit exceeded"))
+    assert not is_resource_error(FakeNeo4jError("Node already exists",
+                                                code="Neo.ClientError.Schema.ConstraintValidationFailed"))
+    assert not is_resource_error(ValueError("bad record"))
+
+
+def test_initial_size_is_clamped():
+    assert AdaptiveBatchSizer(10_000, max_size=5000).size("figures") == 5000
+    assert AdaptiveBatchSizer(0, min_size=5).size("figures") == 5
+
+
+def test_grow_and_shrink():
+    sizer = AdaptiveBatchSizer(100, max_size=300, target_latency=2.0)
+    sizer.record_success("figures", 100, 0.5)
+    assert sizer.size("figures") == 150
+    sizer.record_success("figures", 150, 0.5)
+    assert sizer.size("figures") == 225
+    sizer.record_success("figures", 225, 0.5)
+    assert sizer.size("figures") == 300  # max_size
+    sizer.record_success("figures", 300, 0.5)
+    assert sizer.size("figures") == 300
+
+    # A short tail chunk says nothing about capacity
+    sizer.record_success("figures", 40, 0.1)
+    assert sizer.size("figures") == 300
+
+    # Slow commits halve the size, down to min_size
+    sizer.record_success("figures", 300, 5.0)
+    assert sizer.size("figures") == 150
+    small = AdaptiveBatchSizer(3, min_size=2)
+    small.record_success("media", 3, 9.0)
+    assert small.size("media") == 2
+    small.record_success("media", 2, 9.0)
+    assert small.size("media") == 2
+
+    # Growth is at least one row, and entity types are independent
+    tiny = AdaptiveBatchSizer(1)
+    tiny.record_success("portrayals", 1, 0.1)
+    assert tiny.size("portrayals") == 2
+    assert tiny.size("figures") == 1
+
+
+def test_resource_errors_set_a_ceiling():
+    sizer = AdaptiveBatchSizer(200, max_size=5000)
+    assert sizer.record_failure("figures", 200, TimeoutError("timed out")) is True
+    assert sizer.size("figures") == 100
+
+    # Growth never returns to the size that failed
+    for _ in range(10):
+        sizer.record_success("figures", sizer.size("figures"), 0.1)
+    assert sizer.size("figures") == 199
+
+    # A later failure lowers the ceiling further
+    assert sizer.record_failure("figures", 199, RuntimeError("OutOfMemory")) is True
+    for _ in range(10):
+        sizer.record_success("figures", sizer.size("figures"), 0.1)
+    assert sizer.size("figures") == 198
+
+    # Other errors are not retried and leave the size alone
+    assert sizer.record_failure("figures", 198, ValueError("constraint")) is False
+    assert sizer.size("figures") == 198
+    assert sizer.size("media") == 200
+
+
+def test_resource_error_at_min_size_is_not_retried():
+    sizer = AdaptiveBatchSizer(1, min_size=1)
+    assert sizer.record_failure("figures", 1, TimeoutError("timed out")) is False
+    assert sizer.size("figures") == 1
+    assert sizer.summary()["figures"]["resource_errors"] == 1
+
+
+def test_summary():
+    sizer = AdaptiveBatchSizer(100)
+    sizer.record_success("figures", 100, 1.0)
+    sizer.record_success("figures", 150, 3.0)
+    sizer.record_failure("figures", 75, TimeoutError("timed out"))
+    summary = sizer.summary()["figures"]
+    assert summary["size_history"] == [100, 150, 75, 37]
+    assert summary["final_size"] == 37
+    assert (summary["chunks"], summary["rows"], summary["resource_errors"]) == (2, 250, 1)
+    assert summary["mean_latency_s"] == 2.0 and summary["max_latency_s"] == 3.0
+    assert summary["rows_per_second"] == 62.5
+
+
+if __name__ == "__main__":
+    for test in [test_is_resource_error, test_initial_size_is_clamped, test_grow_and_shrink,
+                 test_resource_errors_set_a_ceiling, test_resource_error_at_min_size_is_not_retried,
+                 test_summary]:
+        test()
+        print(f"✓ {test.__name__}")
+    print("All adaptive batch tests passed")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory graph snapshot
+Checks the CSR build and the local searches (BFS, multi-target BFS, hub cap,
+degree-penalised Dijkstra, Yen's k-shortest paths) on small hand-built
+graphs. Needs no database.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "lib"))
+
+import numpy as np
+
+from graph_snapshot import GraphSnapshot
+
+# Five figures around one large MediaWork hub, plus a separate component:
+#
+#   brutus - caesar - cleopatra - antony = augustus     (= two relationships)
+#        \      |         |                 /
+#         +-------------- rome ------------+            rome also has 20 characters
+#
+#   x1 - x2
+FIGURES = ["caesar", "cleopatra", "antony", "brutus", "augustus", "x1", "x2"]
+CHARACTERS = [f"FC_{i}" for i in range(20)]
+NODES = FIGURES + ["rome"] + CHARACTERS
+RELATIONSHIPS = [
+    ("caesar", "cleopatra", "INTERACTED_WITH"),
+    ("cleopatra", "antony", "INTERACTED_WITH"),
+    ("antony", "augustus", "INTERACTED_WITH"),
+    ("augustus", "antony", "INTERACTED_WITH"),  # parallel, opposite direction
+    ("caesar", "brutus", "INTERACTED_WITH"),
+    ("x1", "x2", "INTERACTED_WITH"),
+] + [(name, "rome", "APPEARS_IN") for name in ["caesar", "cleopatra", "brutus", "augustus"] + CHARACTERS]
+
+
+def label(name):
+    if name == "rome":
+        return "MediaWork"
+    return "FictionalCharacter" if name.startswith("FC_") else "HistoricalFigure"
+
+
+def snapshot(nodes=NODES, relationships=RELATIONSHIPS, version=None):
+    index = {name: i for i, name in enumerate(nodes)}
+    return GraphSnapshot(
+        element_ids=[f"4:db:{i}" for i in range(len(nodes))],
+        node_ids=list(nodes),
+        labels=[label(name) for name in nodes],
+        edge_sources=[index[a] for a, _, _ in relationships],
+        edge_targets=[index[b] for _, b, _ in relationships],
+        edge_types=[rel_type for _, _, rel_type in relationships],
+        edge_contexts=[None] * len(relationships),
+        version=version,
+    )
+
+
+def names(snap, found):
+    """Node names along a (nodes, relationships) path"""
+    return [snap.node_ids[i] for i in found[0]]
+
+
+def assert_valid_path(snap, found, start, end):
+    """Consecutive nodes are joined by the listed relationships"""
+    nodes, edges = found
+    assert nodes[0] == start and nodes[-1] == end and len(edges) == len(nodes) - 1
+    for i, edge in enumerate(edges):
+        ends = {int(snap.edge_sources[edge]), int(snap.edge_targets[edge])}
+        assert ends == {nodes[i], nodes[i + 1]}, (found, i)
+
+
+def test_csr_build():
+    snap = snapshot()
+    n = snap.figure_index
+    assert snap.node_count == len(NODES) and snap.edge_count == len(RELATIONSHIPS)
+    assert set(snap.figure_index) == set(FIGURES)
+    degrees = snap.degrees()
+    assert degrees[n["caesar"]] == 3 and degrees[n["antony"]] == 3 and degrees[n["x1"]] == 1
+    assert degrees[NODES.index("rome")] == 24
+    assert degrees.sum() == 2 * len(RELATIONSHIPS)
+
+    # Every relationship appears once in each endpoint's row
+    _, neighbours, edges = snap.expand(np.array([n["antony"]], dtype=np.int32))
+    assert sorted(zip(neighbours.tolist(), edges.tolist())) == [(n["cleopatra"], 1), (n["augustus"], 2), (n["augustus"], 3)]
+
+
+def test_distances():
+    snap = snapshot()
+    n = snap.figure_index
+    dist = snap.distances_from(n["caesar"])
+    expected = {"caesar": 0, "cleopatra": 1, "brutus": 1, "augustus": 2, "antony": 2, "x1": -1, "x2": -1}
+    assert {name: int(dist[n[name]]) for name in expected} == expected
+    assert int(dist[NODES.index("rome")]) == 1 and int(dist[NODES.index("FC_7")]) == 2
+    assert int(snap.distances_from(n["caesar"], max_depth=1)[n["augustus"]]) == -1
+
+
+def test_shortest_path():
+    snap = snapshot()
+    n = snap.figure_index
+    rome = NODES.index("rome")
+
+    found = snap.shortest_path(n["brutus"], n["augustus"])
+    assert names(snap, found) == ["brutus", "rome", "augustus"]
+    assert_valid_path(snap, found, n["brutus"], n["augustus"])
+    assert snap.shortest_path(n["caesar"], n["caesar"]) == ([n["caesar"]], [])
+    assert snap.shortest_path(n["caesar"], n["x1"]) is None
+
+    # Excluded nodes and relationships force longer routes, within max_depth
+    found = snap.shortest_path(n["brutus"], n["augustus"], excluded_nodes=[rome])
+    assert names(snap, found) == ["brutus", "caesar", "cleopatra", "antony", "augustus"]
+    assert_valid_path(snap, found, n["brutus"], n["augustus"])
+    assert snap.shortest_path(n["brutus"], n["augustus"], max_depth=3, excluded_nodes=[rome]) is None
+    assert snap.shortest_path(n["brutus"], n["augustus"], max_depth=1) is None
+    found = snap.shortest_path(n["antony"], n["augustus"], excluded_edges={2})
+    assert found[1] == [3]  # the parallel relationship
+    assert snap.shortest_path(n["antony"], n["augustus"], excluded_edges={2, 3}, excluded_nodes=[rome]) is None
+
+
+def test_paths_from():
+    snap = snapshot()
+    n = snap.figure_index
+    paths = snap.paths_from(n["caesar"], [n["augustus"], n["brutus"], n["x1"], n["caesar"]])
+    assert {snap.node_ids[t]: (len(p[1]) if p else None) for t, p in paths.items()} == {
+        "augustus": 2, "brutus": 1, "x1": None, "caesar": 0
+    }
+    for target, found in paths.items():
+        if found:
+            assert_valid_path(snap, found, n["caesar"], target)
+    assert snap.paths_from(n["caesar"], [n["antony"]], max_depth=1)[n["antony"]] is None
+
+
+def test_hub_cap_and_weighted_path():
+    snap = snapshot()
+    n = snap.figure_index
+    rome = NODES.index("rome")
+    assert snap.hubs(5).tolist() == [rome]
+    assert snap.hubs(5, keep=[rome]).tolist() == []
+
+    found = snap.shortest_path(n["caesar"], n["augustus"], excluded_nodes=snap.hubs(5, keep=(n["caesar"], n["augustus"])))
+    assert names(snap, found) == ["caesar", "cleopatra", "antony", "augustus"]
+
+    # Through rome costs 2 + p*ln(24); around it 3 + 2p*ln(3): rome wins below p ~ 1.02
+    assert names(snap, snap.weighted_path(n["caesar"], n["augustus"], hub_penalty=0.5)) == ["caesar", "rome", "augustus"]
+    found = snap.weighted_path(n["caesar"], n["augustus"], hub_penalty=2.0)
+    assert names(snap, found) == ["caesar", "cleopatra", "antony", "augustus"]
+    assert_valid_path(snap, found, n["caesar"], n["augustus"])
+    assert len(snap.weighted_path(n["brutus"], n["augustus"], hub_penalty=0.0)[1]) == 2
+    assert names(snap, snap.weighted_path(n["brutus"], n["augustus"], hub_penalty=0.0, max_hub_degree=5)) == [
+        "brutus", "caesar", "cleopatra", "antony", "augustus"
+    ]
+    assert snap.weighted_path(n["caesar"], n["x2"]) is None
+    # An endpoint may be a hub
+    assert len(snap.weighted_path(n["caesar"], rome, max_hub_degree=5)[1]) == 1
+
+
+def test_k_shortest_paths():
+    snap = snapshot()
+    n = snap.figure_index
+    paths = snap.k_shortest_paths(n["caesar"], n["augustus"], 4)
+    assert [len(edges) for _, edges in paths] == [2, 3, 3, 3]
+    assert len({tuple(edges) for _, edges in paths}) == 4
+    for found in paths:
+        assert_valid_path(snap, found, n["caesar"], n["augustus"])
+        assert len(set(found[0])) == len(found[0])  # loopless
+
+    disjoint = snap.k_shortest_paths(n["caesar"], n["augustus"], 4, node_disjoint=True)
+    assert [names(snap, found) for found in disjoint] == [
+        ["caesar", "rome", "augustus"], ["caesar", "cleopatra", "antony", "augustus"]
+    ]
+    assert snap.k_shortest_paths(n["caesar"], n["x1"], 3) == []
+
+
+def test_k_shortest_paths_parallel_relationships():
+    """Three s-a and two a-t relationships give six distinct two-hop paths"""
+    nodes = ["s", "a", "t"]
+    relationships = [("s", "a", "INTERACTED_WITH"), ("s", "a", "INTERACTED_WITH"), ("a", "s", "INTERACTED_WITH"),
+                     ("t", "a", "INTERACTED_WITH"), ("a", "t", "INTERACTED_WITH")]
+    snap = snapshot(nodes, relationships)
+    paths = snap.k_shortest_paths(0, 2, 10)
+    assert sorted(tuple(edges) for _, edges in paths) == [(s, t) for s in (0, 1, 2) for t in (3, 4)]
+
+
+def test_save_and_load():
+    snap = snapshot(version="batch_7:3:120")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "snapshot.npz"
+        snap.save(path)
+        loaded = GraphSnapshot.load_file(path)
+    assert loaded.version == "batch_7:3:120"
+    assert (loaded.offsets == snap.offsets).all() and (loaded.targets == snap.targets).all()
+    assert (loaded.edges == snap.edges).all() and loaded.figure_index == snap.figure_index
+    assert loaded.edge_types == snap.edge_types
+
+
+if __name__ == "__main__":
+    for test in [test_csr_build, test_distances, test_shortest_path, test_paths_from,
+                 test_hub_cap_and_weighted_path, test_k_shortest_paths,
+                 test_k_shortest_paths_parallel_relationships, test_save_and_load]:
+        test()
+        print(f"✓ {test.__name__}")
+    print("All graph snapshot tests passed")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch import run journal
+Checks the resume bookkeeping (committed indices, phase payloads and the
+input-file sha256 check) against a temporary SQLite file. Needs no database.
+"""
+
+import hashlib
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "lib"))
+
+from import_journal import ImportJournal, ImportJournalError, file_sha256
+
+
+def write_batch(directory, content='{"metadata": {}, "figures": []}'):
+    path = Path(directory) / "batch.json"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def run_status(journal):
+    return journal._conn.execute(
+        "SELECT status FROM runs WHERE batch_id = ?", (journal.batch_id,)
+    ).fetchone()[0]
+
+
+def test_file_sha256():
+    with tempfile.TemporaryDirectory() as tmp:
+        content = "x" * (3 << 20)  # spans several 1 MB blocks
+        path = write_batch(tmp, content)
+        assert file_sha256(path) == hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def test_phases():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = ImportJournal(Path(tmp) / "journal.sqlite", "batch_1")
+        try:
+            journal.start_run(write_batch(tmp))
+            assert journal.load_phase("validation") is None
+            payload = {"Q1048": {"valid": True, "similarity": 1.0}, "Q7243": {"valid": False}}
+            journal.record_phase("validation", payload)
+            assert journal.load_phase("validation") == payload
+            journal.record_phase("validation", {"replaced": True})
+            assert journal.load_phase("validation") == {"replaced": True}
+            other = ImportJournal(Path(tmp) / "journal.sqlite", "batch_2")
+            assert other.load_phase("validation") is None
+            other.close()
+        finally:
+            journal.close()
+
+
+def test_committed_indices_survive_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.sqlite"
+        journal = ImportJournal(path, "batch_1")
+        journal.start_run(write_batch(tmp))
+        journal.record_chunk("figures", [0, 1, 2], 3)
+        assert journal.committed_indices("figures") == {0, 1, 2}
+        # Later chunks update the cached set; callers get a copy
+        journal.record_chunk("figures", range(5, 8), 3)
+        committed = journal.committed_indices("figures")
+        committed.add(99)
+        assert journal.committed_indices("figures") == {0, 1, 2, 5, 6, 7}
+        journal.record_chunk("media", [0], 1)
+        other = ImportJournal(path, "batch_other")
+        other.record_chunk("figures", [3, 4], 2)
+        other.close()
+        journal.set_status("failed")
+        journal.close()
+
+        resumed = ImportJournal(path, "batch_1")
+        try:
+            assert resumed.committed_indices("figures") == {0, 1, 2, 5, 6, 7}
+            assert resumed.committed_indices("media") == {0}
+            assert resumed.committed_indices("portrayals") == set()
+        finally:
+            resumed.close()
+
+
+def test_resume_checks_input():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.sqlite"
+        batch = write_batch(tmp)
+        journal = ImportJournal(path, "batch_1")
+        try:
+            try:
+                journal.resume_run(batch)
+                raise AssertionError("resume_run accepted an unknown batch")
+            except ImportJournalError:
+                pass
+
+            journal.start_run(batch)
+            journal.set_status("failed")
+            journal.resume_run(batch)
+            assert run_status(journal) == "running"
+
+            write_batch(tmp, '{"metadata": {}, "figures": [{"name": "Changed"}]}')
+            try:
+                journal.resume_run(batch)
+                raise AssertionError("resume_run accepted a changed input file")
+            except ImportJournalError as e:
+                assert "changed" in str(e)
+        finally:
+            journal.close()
+
+
+if __name__ == "__main__":
+    for test in [test_file_sha256, test_phases, test_committed_indices_survive_reopen,
+                 test_resume_checks_input]:
+        test()
+        print(f"✓ {test.__name__}")
+    print("All import journal tests passed")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the landmark distance index
+Builds an index from a small hand-built GraphSnapshot and checks the
+separation bounds against exact BFS distances. Needs no database.
+"""
+
+import sys
+import tempfile
+from itertools import permutations
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "lib"))
+
+from graph_snapshot import GraphSnapshot
+from landmark_index import UNREACHABLE, LandmarkIndex
+
+INF = float("inf")
+
+# A path of figures a - b - c - d - e with a shortcut b - work - e, a pendant
+# f on c, and a separate two-figure component x - y:
+#
+#   a - b - c - d - e        x - y
+#        \  |      /
+#         \ f     /
+#          work --
+NODES = ["a", "b", "c", "d", "e", "f", "x", "y", "work"]
+RELATIONSHIPS = [("a", "b"), ("b", "c"), ("c", "d"), ("d", "e"), ("c", "f"),
+                 ("b", "work"), ("e", "work"), ("x", "y")]
+
+
+def snapshot(version="batch_1:1:9"):
+    index = {name: i for i, name in enumerate(NODES)}
+    return GraphSnapshot(
+        element_ids=[f"4:db:{i}" for i in range(len(NODES))],
+        node_ids=NODES,
+        labels=["MediaWork" if name == "work" else "HistoricalFigure" for name in NODES],
+        edge_sources=[index[a] for a, _ in RELATIONSHIPS],
+        edge_targets=[index[b] for _, b in RELATIONSHIPS],
+        edge_types=["APPEARS_IN" if "work" in pair else "INTERACTED_WITH" for pair in RELATIONSHIPS],
+        edge_contexts=[None] * len(RELATIONSHIPS),
+        version=version,
+    )
+
+
+def exact_distance(snap, a, b):
+    dist = int(snap.distances_from(snap.figure_index[a])[snap.figure_index[b]])
+    return INF if dist == -1 else dist
+
+
+def test_build():
+    snap = snapshot()
+    index = LandmarkIndex.build(snap, landmarks=2)
+    # Highest degree first, ties in node order; the work is never a landmark
+    assert index.landmark_ids == ["b", "c"]
+    assert sorted(index.figure_ids) == sorted(name for name in NODES if name != "work")
+    assert index.distances.dtype.name == "uint8"
+    assert index.distances[index.rows["e"]].tolist() == [2, 2]
+    assert index.distances[index.rows["x"]].tolist() == [UNREACHABLE, UNREACHABLE]
+    assert index.version == "batch_1:1:9"
+
+
+def test_bounds_hold():
+    snap = snapshot()
+    for landmarks in (1, 2, 3, 8):
+        index = LandmarkIndex.build(snap, landmarks)
+        for a, b in permutations(index.figure_ids, 2):
+            lower, upper = index.bounds(a, b)
+            distance = exact_distance(snap, a, b)
+            if distance == INF:
+                assert lower in (0, INF) and upper == INF, (landmarks, a, b, lower, upper)
+            else:
+                assert lower <= distance <= upper, (landmarks, a, b, lower, distance, upper)
+
+
+def test_bounds_cases():
+    index = LandmarkIndex.build(snapshot(), landmarks=2)
+    assert index.bounds("c", "c") == (0, 0)
+    assert index.bounds("a", "missing") is None
+    # b is a landmark: its own row pins the distance to every figure it reaches
+    assert index.bounds("b", "e") == (2, 2)
+    assert index.bounds("a", "f") == (1, 3)  # exact distance 3
+    # A landmark reaches one side only: different components
+    assert index.bounds("a", "x") == (INF, INF)
+    assert index.bounds("y", "d") == (INF, INF)
+    # No landmark reaches either figure: nothing is known
+    assert index.bounds("x", "y") == (0, INF)
+
+
+def test_bounds_batch_matches_single():
+    index = LandmarkIndex.build(snapshot(), landmarks=2)
+    pairs = list(permutations(index.figure_ids, 2)) + [("d", "d"), ("a", "missing"), ("missing", "x")]
+    assert index.bounds_batch(pairs) == [index.bounds(a, b) for a, b in pairs]
+    assert index.bounds_batch([("missing", "a")]) == [None]
+    assert index.bounds_batch([]) == []
+
+
+def test_save_and_load():
+    index = LandmarkIndex.build(snapshot(), landmarks=3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "landmarks.npz"
+        index.save(path)
+        loaded = LandmarkIndex.load(path)
+    assert loaded.figure_ids == index.figure_ids and loaded.landmark_ids == index.landmark_ids
+    assert (loaded.distances == index.distances).all()
+    assert loaded.version == index.version and loaded.built_at == index.built_at
+    assert loaded.bounds("a", "e") == index.bounds("a", "e")
+
+
+if __name__ == "__main__":
+    for test in [test_build, test_bounds_hold, test_bounds_cases, test_bounds_batch_matches_single,
+                 test_save_and_load]:
+        test()
+        print(f"✓ {test.__name__}")
+    print("All landmark index tests passed")
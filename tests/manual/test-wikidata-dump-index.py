@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline Wikidata label index
+Builds an index from a small fixture dump and checks lookups, search and the
+validate_qid / search_wikidata_for_work backend. Needs no network access.
+"""
+
+import bz2
+import gzip
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "lib"))
+
+import wikidata_search
+from wikidata_dump_index import WikidataDumpIndex, build_index, extract_record
+
+
+def claim(prop, value):
+    """Minimal statement in dump format (item id or time value)"""
+    if value.startswith("Q"):
+        datavalue = {"value": {"entity-type": "item", "id": value}, "type": "wikibase-entityid"}
+    else:
+        datavalue = {"value": {"time": value, "precision": 9}, "type": "time"}
+    return {"mainsnak": {"snaktype": "value", "property": prop, "datavalue": datavalue}}
+
+
+def entity(qid, label, instance_of, description=None, aliases=(), **times):
+    claims = {"P31": [claim("P31", cls) for cls in instance_of]}
+    for prop, value in times.items():
+        claims[prop] = [claim(prop, value)]
+    return {
+        "type": "item",
+        "id": qid,
+        "labels": {"en": {"language": "en", "value": label}},
+        "descriptions": {"en": {"language": "en", "value": description}} if description else {},
+        "aliases": {"en": [{"language": "en", "value": alias} for alias in aliases]},
+        "claims": claims,
+    }
+
+
+FIXTURE = [
+    entity("Q161531", "War and Peace", ["Q7725634"], "novel by Leo Tolstoy",
+           aliases=["Voina i mir"], P577="+1869-01-01T00:00:00Z"),
+    entity("Q845176", "War and Peace", ["Q11424"], "1966-1967 film by Sergei Bondarchuk",
+           P577="+1966-03-14T00:00:00Z"),
+    entity("Q7243", "Leo Tolstoy", ["Q5"], "Russian writer (1828–1910)",
+           P569="+1828-09-09T00:00:00Z", P570="+1910-11-20T00:00:00Z"),
+    entity("Q1048", "Julius Caesar", ["Q5"], "Roman general and statesman",
+           P569="-0100-07-12T00:00:00Z", P570="-0044-03-15T00:00:00Z"),
+    entity("Q6256", "country", ["Q1048835"], "distinct territorial body"),  # not kept
+    {"type": "property", "id": "P31", "labels": {}, "claims": {}},             # not kept
+]
+
+
+def write_dumps(directory):
+    """The fixture as a JSON-array dump (plain, bz2, gz) and as JSON lines"""
+    array = "[\n" + ",\n".join(json.dumps(e) for e in FIXTURE) + "\n]\n"
+    lines = "".join(json.dumps(e) + "\n" for e in FIXTURE)
+    paths = {
+        "plain": directory / "dump.json",
+        "bz2": directory / "dump.json.bz2",
+        "gz": directory / "dump.json.gz",
+        "jsonl": directory / "subset.jsonl",
+    }
+    paths["plain"].write_text(array, encoding="utf-8")
+    paths["jsonl"].write_text(lines, encoding="utf-8")
+    with bz2.open(paths["bz2"], "wt", encoding="utf-8") as f:
+        f.write(array)
+    with gzip.open(paths["gz"], "wt", encoding="utf-8") as f:
+        f.write(array)
+    return paths
+
+
+def test_extract_record():
+    record = extract_record(FIXTURE[3])
+    assert record["kind"] == "HUMAN"
+    assert (record["birth_year"], record["death_year"]) == (-100, -44)
+    assert extract_record(FIXTURE[4]) is None
+    assert extract_record(FIXTURE[5]) is None
+
+
+def test_build_and_lookup():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name, dump in write_dumps(tmp).items():
+            stats = build_index(dump, tmp / f"{name}.sqlite")
+            assert (stats["scanned"], stats["kept"]) == (6, 4), (name, stats)
+
+        index = WikidataDumpIndex(tmp / "bz2.sqlite")
+        try:
+            record = index.get("Q161531")
+            assert record["label"] == "War and Peace"
+            assert record["aliases"] == ["Voina i mir"]
+            assert record["publication_year"] == 1869
+            assert record["instance_of"] == ["Q7725634"]
+            assert index.get("Q6256") is None
+            assert index.get("not-a-qid") is None
+
+            entities = index.get_entities(["Q7243", "Q999"])
+            assert list(entities) == ["Q7243"]
+            assert entities["Q7243"]["labels"]["en"]["value"] == "Leo Tolstoy"
+        finally:
+            index.close()
+
+
+def test_search():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        build_index(write_dumps(tmp)["gz"], tmp / "index.sqlite")
+        index = WikidataDumpIndex(tmp / "index.sqlite")
+        try:
+            # Year and kind decide between the novel and the film
+            assert index.search("War and Peace", year=1869)[0]["qid"] == "Q161531"
+            assert index.search("war and peace", year=1966)[0]["qid"] == "Q845176"
+            assert index.search("War and Peace", kind="FILM")[0]["qid"] == "Q845176"
+            # Aliases are searchable; humans only when asked for
+            assert index.search("Voina i mir")[0]["qid"] == "Q161531"
+            assert index.search("Leo Tolstoy") == []
+            assert index.search("Leo Tolstoy", kind="HUMAN")[0]["qid"] == "Q7243"
+            assert index.search("!!!") == []
+        finally:
+            index.close()
+
+
+def test_search_backend():
+    """validate_qid and search_wikidata_for_work answer from the index without HTTP"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        build_index(write_dumps(tmp)["plain"], tmp / "index.sqlite")
+        wikidata_search.use_offline_index(tmp / "index.sqlite", fallback=False)
+        calls = wikidata_search.request_counts["http_calls"]
+        try:
+            result = wikidata_search.validate_qid("Q161531", "War and Peace")
+            assert result["valid"] and result["similarity"] == 1.0
+            assert not wikidata_search.validate_qid("Q999", "Anything")["valid"]
+
+            results = wikidata_search.validate_qids([("Q161531", "War and Peace"), ("Q7243", "Anna Karenina")])
+            assert [r["valid"] for r in results] == [True, False]
+
+            match = wikidata_search.search_wikidata_for_work("War and Peace", "Leo Tolstoy", 1869, "BOOK")
+            assert match["qid"] == "Q161531" and match["confidence"] == "high"
+
+            matches = wikidata_search.search_wikidata_for_works([
+                {"title": "War and Peace", "year": 1966, "media_type": "FILM"},
+                {"title": "Unknown Work"},
+            ])
+            assert matches[0]["qid"] == "Q845176" and matches[1] is None
+
+            assert wikidata_search.request_counts["http_calls"] == calls
+        finally:
+            wikidata_search.use_offline_index(None)
+
+
+if __name__ == "__main__":
+    for test in [test_extract_record, test_build_and_lookup, test_search, test_search_backend]:
+        test()
+        print(f"✓ {test.__name__}")
+    print("All offline index tests passed")